@@ -0,0 +1 @@
+"""Scripts de mesure de performance, à lancer depuis la racine avec `python -m`."""
@@ -0,0 +1,63 @@
+"""Compare la lecture du CSV de l'INA et celle du cache colonnaire Parquet.
+
+Usage : python -m benchmarks.bench_loader [chemin_csv] [--repeat N]
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from ina import loader, store
+
+
+def timed(func, repeat):
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("csv", nargs="?", default=loader.DATA_PATH)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if not store.enabled():
+        raise SystemExit(
+            "pyarrow n'est pas installé : pas de cache colonnaire à mesurer"
+        )
+
+    sha1 = loader.file_sha1(args.csv)
+    with tempfile.TemporaryDirectory() as tmp:
+        # Le cache est écrit dans un répertoire temporaire pour ne pas toucher Data/
+        csv_copy = os.path.join(tmp, os.path.basename(args.csv))
+        os.symlink(os.path.abspath(args.csv), csv_copy)
+
+        results = {
+            "sha1 du CSV": timed(lambda: loader.file_sha1(args.csv), args.repeat),
+            "read_csv + to_datetime": timed(
+                lambda: loader.read_ina_csv(args.csv), args.repeat
+            ),
+        }
+        frame = loader.read_ina_csv(args.csv)
+        results["écriture du cache Parquet"] = timed(
+            lambda: store.write_cache(csv_copy, sha1, frame), args.repeat
+        )
+        results["lecture du cache Parquet"] = timed(
+            lambda: store.read_cache(csv_copy, sha1), args.repeat
+        )
+
+    print(f"{len(frame)} lignes, médiane sur {args.repeat} essais")
+    for label, seconds in results.items():
+        print(f"  {label:<28} {seconds * 1000:8.1f} ms")
+    speedup = results["read_csv + to_datetime"] / results["lecture du cache Parquet"]
+    print(f"  gain lecture cache / CSV : x{speedup:.1f}")
+
+
+if __name__ == "__main__":
+    main()
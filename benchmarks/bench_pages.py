@@ -0,0 +1,300 @@
+"""Mesure le chargement et chaque page du dashboard sur des données synthétiques.
+
+Pour chaque échelle (1, 10, 100 × le volume du fichier de l'INA), le CSV est
+généré une fois dans --workdir (voir `benchmarks.synthetic`), puis on mesure :
+
+- le chargement, étape par étape : lecture brute du CSV, typage des colonnes,
+  lecture typée, construction et lecture du cache Parquet, colonnes dérivées,
+  cube, index temporel, détection des pics (`ina.spikes`) ;
+- chaque requête de `ina.queries`, avec le cube pandas puis le moteur NumPy
+  (`ina.tensor`) ;
+- chaque graphique de chaque page (agrégats + construction de la figure), puis
+  sa sérialisation JSON, comme le fait `st.plotly_chart`, et sa taille avant et
+  après allègement (`ina.figure_payload`) ;
+- le rendu headless de chaque page par `AppTest`, cache de figures vide puis
+  plein.
+
+Les durées sont en millisecondes (médiane sur --repeat) et écrites en JSON.
+`--compare avant.json après.json` affiche les rapports entre deux exécutions et
+sort en erreur si une mesure dépasse --threshold.
+
+Usage :
+    python -m benchmarks.bench_pages [--scales 1 10 100] [--repeat 3] [--out FICHIER]
+    python -m benchmarks.bench_pages --compare avant.json après.json
+"""
+
+import argparse
+import importlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import replace
+
+import pandas as pd
+
+from benchmarks import synthetic
+from ina import loader, queries, spikes, store
+from ina.cube import Cube
+from ina.figure_cache import figure_cache
+from ina.figure_payload import payload_size, slim
+from ina.schema import CSV_OPTIONS, SCHEMA
+from ina.tensor import TensorCube
+from ina.timeindex import TimeIndex
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Paramètres des requêtes de `ina.queries` mesurées
+QUERY_PARAMS = {
+    "par_annee": {"theme": "Sciences et techniques"},
+    "par_chaine": {"theme": "Economie"},
+    "par_theme": {"chaine": "TF1"},
+    "par_chaine_et_annee": {"theme": "Economie"},
+    "par_annee_et_theme": {"themes": ["Sport", "Santé"]},
+    "par_theme_et_chaine": {"themes": ["Sport", "Santé"]},
+    "evenement_periodes": {"date": "2008-09-15", "chaine": "TF1", "jours_pendant": 3},
+    "evenement_par_chaine": {"date": "2008-09-15", "theme": "Economie"},
+    "evenement_par_theme": {"date": "2008-09-15"},
+    "serie": {"granularite": "jour", "points": 600},
+    "pics": {"theme": "Economie"},
+    "evenements_detectes": {},
+}
+
+
+def timed(func, repeat, setup=None):
+    """Médiane en millisecondes de `func()` ; `setup()` est appelé avant chaque essai."""
+    durations = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return round(statistics.median(durations) * 1000, 3)
+
+
+def prepare(workdir, scale):
+    """Répertoire de l'échelle, avec le CSV synthétique sous le nom attendu par le loader."""
+    directory = os.path.join(workdir, f"x{scale:g}")
+    path = os.path.join(directory, loader.DATA_PATH)
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        print(f"Génération de {path} (échelle {scale:g})...", file=sys.stderr)
+        synthetic.generate(path + ".tmp", scale)
+        os.replace(path + ".tmp", path)
+    return directory, path
+
+
+def bench_loading(path, repeat):
+    raw_dtypes = {name: str for name in CSV_OPTIONS["usecols"]}
+    raw = pd.read_csv(path, dtype=raw_dtypes, **CSV_OPTIONS)
+
+    def typing():
+        df = raw.copy()
+        df["date"] = pd.to_datetime(df["date"], dayfirst=True)
+        return df.astype(SCHEMA)
+
+    sha1 = loader.file_sha1(path)
+    frame = loader.read_ina_csv(path)
+    results = {
+        "sha1": timed(lambda: loader.file_sha1(path), repeat),
+        "lecture_brute": timed(
+            lambda: pd.read_csv(path, dtype=raw_dtypes, **CSV_OPTIONS), repeat
+        ),
+        "typage": timed(typing, repeat),
+        "lecture_typee": timed(lambda: loader.read_ina_csv(path), repeat),
+    }
+    if store.enabled():
+        results["cache_construction"] = timed(
+            lambda: loader.read_typed(path, sha1),
+            repeat,
+            setup=lambda: store.remove_stale(path, keep=[]),
+        )
+        results["cache_lecture"] = timed(lambda: loader.read_typed(path, sha1), repeat)
+    results["colonnes_derivees"] = timed(
+        lambda: loader.add_derived_columns(frame.copy()), repeat
+    )
+    frame = loader.add_derived_columns(frame)
+    results["cube"] = timed(lambda: Cube.from_frame(frame), repeat)
+    results["cube_numpy"] = timed(lambda: TensorCube.from_frame(frame), repeat)
+    results["index_temporel"] = timed(lambda: TimeIndex(frame), repeat)
+    time_index = TimeIndex(frame)
+    results["pics"] = timed(lambda: spikes.detect(time_index), repeat)
+    return results
+
+
+def bench_queries(dataset, repeat):
+    results = {}
+    for name, (func, _) in queries.QUERIES.items():
+        params = QUERY_PARAMS.get(name)
+        if params is None:
+            print(f"Requête {name} sans paramètres de mesure, ignorée", file=sys.stderr)
+            continue
+        results[name] = timed(lambda: func(dataset, **params), repeat)
+    return results
+
+
+def bench_charts(dataset, module, repeat):
+    results = {}
+    for chart_id, build, _, params in module.charts(dataset):
+        label = chart_id
+        while label in results:
+            label += "+"
+        fig = build(dataset, **params)
+        light = slim(fig)
+        results[label] = {
+            "construction": timed(lambda: build(dataset, **params), repeat),
+            "json": timed(lambda: fig.to_json(), repeat),
+            "octets": payload_size(fig),
+            "allegement": timed(lambda: slim(fig), repeat),
+            "json_allege": timed(lambda: light.to_json(), repeat),
+            "octets_alleges": payload_size(light),
+        }
+    return results
+
+
+def bench_render(page, repeat):
+    from streamlit.testing.v1 import AppTest
+
+    def render():
+        at = AppTest.from_file(
+            os.path.join(RACINE, "dashboard.py"), default_timeout=600
+        )
+        at.run()
+        start = time.perf_counter()
+        at.sidebar.radio[0].set_value(page).run()
+        elapsed = time.perf_counter() - start
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+        return elapsed
+
+    def median_ms(clear):
+        durations = []
+        for _ in range(repeat):
+            if clear:
+                figure_cache.clear()
+            durations.append(render())
+        return round(statistics.median(durations) * 1000, 3)
+
+    return {"cache_vide": median_ms(True), "cache_plein": median_ms(False)}
+
+
+def run_scale(workdir, scale, repeat, render):
+    import vues
+
+    directory, path = prepare(workdir, scale)
+    # Le dashboard lit `Data/...` relativement au répertoire courant
+    os.chdir(directory)
+    result = {"lignes": None, "chargement": bench_loading(path, repeat)}
+    dataset = loader.load_dataset(path)
+    result["lignes"] = len(dataset.frame)
+    result["requetes"] = bench_queries(dataset, repeat)
+    tensor = replace(dataset, cube=TensorCube.from_frame(dataset.frame))
+    result["requetes_numpy"] = bench_queries(tensor, repeat)
+
+    result["pages"] = {}
+    for page, module_name in vues.PAGES.items():
+        module = importlib.import_module(module_name)
+        if not hasattr(module, "charts"):
+            continue
+        result["pages"][page] = {"graphiques": bench_charts(dataset, module, repeat)}
+        if render:
+            result["pages"][page]["rendu"] = bench_render(page, repeat)
+    return result
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=RACINE,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def flatten(tree, prefix=""):
+    """Mesures feuilles d'un résultat, sous forme {"a/b/c": valeur}."""
+    leaves = {}
+    for key, value in tree.items():
+        path = f"{prefix}/{key}" if prefix else key
+        if isinstance(value, dict):
+            leaves.update(flatten(value, path))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            leaves[path] = value
+    return leaves
+
+
+def compare(before_path, after_path, threshold):
+    with open(before_path, encoding="utf-8") as f:
+        before = flatten(json.load(f)["echelles"])
+    with open(after_path, encoding="utf-8") as f:
+        after = flatten(json.load(f)["echelles"])
+
+    regressions = 0
+    for path in sorted(before.keys() & after.keys()):
+        if not before[path] or path.endswith("/lignes"):
+            continue
+        ratio = after[path] / before[path]
+        flag = ""
+        if ratio > threshold:
+            flag = "  <-- régression"
+            regressions += 1
+        print(
+            f"{path:<70} {before[path]:>12.1f} {after[path]:>12.1f}  x{ratio:.2f}{flag}"
+        )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=float, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--workdir", default=os.path.join(tempfile.gettempdir(), "ina-bench")
+    )
+    parser.add_argument("--out", default="bench_pages.json")
+    parser.add_argument(
+        "--no-render", action="store_true", help="sans rendu des pages par AppTest"
+    )
+    parser.add_argument("--compare", nargs=2, metavar=("AVANT", "APRES"))
+    parser.add_argument("--threshold", type=float, default=1.2)
+    args = parser.parse_args()
+
+    if args.compare:
+        regressions = compare(*args.compare, args.threshold)
+        raise SystemExit(1 if regressions else 0)
+
+    out = os.path.abspath(args.out)
+    workdir = os.path.abspath(args.workdir)
+    results = {
+        "commit": git_commit(),
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "repeat": args.repeat,
+        "echelles": {},
+    }
+    cwd = os.getcwd()
+    try:
+        for scale in args.scales:
+            results["echelles"][f"{scale:g}"] = run_scale(
+                workdir, scale, args.repeat, not args.no_render
+            )
+    finally:
+        os.chdir(cwd)
+
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"Résultats écrits dans {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Mémoire par worker, avec et sans jeu de données partagé (`ina.shared`).
+
+Lance N processus qui chargent le jeu de données, exécutent toutes les requêtes
+et parcourent toutes les colonnes, puis relèvent ensemble leur mémoire dans
+/proc/self/smaps_rollup :
+
+- RSS : pages résidentes, pages partagées comprises ;
+- PSS : pages partagées divisées par le nombre de processus qui les utilisent ;
+- USS : pages privées, ce que libérerait l'arrêt du worker.
+
+D'abord en mode privé (chaque worker lit le cache Parquet), puis en mode partagé
+(un éditeur publie le jeu de données dans --dir, les workers le projettent).
+
+Usage : python -m benchmarks.bench_shared [--scale 1] [--workers 4] [--out FICHIER]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.bench_pages import QUERY_PARAMS, prepare
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def memory():
+    """RSS, PSS et USS du processus courant, en Mo."""
+    fields = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1]) / 1024
+    return {
+        "rss_mo": round(fields["Rss"], 1),
+        "pss_mo": round(fields["Pss"], 1),
+        "uss_mo": round(fields["Private_Clean"] + fields["Private_Dirty"], 1),
+    }
+
+
+def worker():
+    from ina import loader, queries
+
+    dataset = loader.load_dataset()
+    for name, (func, _) in queries.QUERIES.items():
+        if name in QUERY_PARAMS:
+            func(dataset, **QUERY_PARAMS[name])
+    # Toutes les pages des colonnes sont lues, comme au fil des sessions
+    for frame in (dataset.frame, dataset.time_index.by_pair):
+        for name, column in frame.items():
+            if column.dtype.kind in "iu":
+                column.sum()
+            elif name == "chaine":
+                column.cat.codes.sum()
+    print("pret", flush=True)
+    sys.stdin.readline()
+    print(json.dumps(memory()), flush=True)
+
+
+def run_workers(directory, n, env):
+    procs = [
+        subprocess.Popen(
+            [sys.executable, "-m", "benchmarks.bench_shared", "--worker"],
+            cwd=directory,
+            env=env,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        )
+        for _ in range(n)
+    ]
+    # Mesure une fois tous les workers chargés : les pages partagées le sont par N
+    for proc in procs:
+        if proc.stdout.readline().strip() != "pret":
+            raise RuntimeError("un worker n'a pas pu charger le jeu de données")
+    results = []
+    for proc in procs:
+        out, _ = proc.communicate("\n")
+        results.append(json.loads(out))
+    summary = {
+        key: round(statistics.median(r[key] for r in results), 1) for key in results[0]
+    }
+    summary["total_pss_mo"] = round(sum(r["pss_mo"] for r in results), 1)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=float, default=1)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument(
+        "--workdir", default=os.path.join(tempfile.gettempdir(), "ina-bench")
+    )
+    parser.add_argument("--dir", default="/dev/shm", help="répertoire de publication")
+    parser.add_argument("--out", default=None)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        return worker()
+
+    directory, path = prepare(os.path.abspath(args.workdir), args.scale)
+    env = dict(os.environ, PYTHONPATH=RACINE)
+    env.pop("INA_SHARED_DIR", None)
+    # Cache Parquet construit avant la mesure
+    subprocess.run(
+        [sys.executable, "-c", "from ina import load_dataset; load_dataset()"],
+        cwd=directory,
+        env=env,
+        check=True,
+        stderr=subprocess.DEVNULL,
+    )
+    results = {"echelle": args.scale, "workers": args.workers}
+    results["prive"] = run_workers(directory, args.workers, env)
+
+    subprocess.run(
+        [sys.executable, "-m", "ina.shared", "--dir", args.dir],
+        cwd=directory,
+        env=env,
+        check=True,
+        stderr=subprocess.DEVNULL,
+    )
+    results["partage"] = run_workers(
+        directory, args.workers, dict(env, INA_SHARED_DIR=args.dir)
+    )
+
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Mesure le temps jusqu'au premier rendu du dashboard (page « Présentation du Projet »).
+
+Chaque essai démarre un interpréteur neuf, comme un redémarrage de pod : le
+script est exécuté une fois par `streamlit.testing.v1.AppTest`, sur la page
+par défaut. Le temps d'import de Streamlit lui-même est mesuré à part.
+
+Usage : python -m benchmarks.bench_startup [script] [--repeat N] [--cwd DIR]
+
+`--cwd` permet de pointer vers un répertoire contenant Data/ pour les versions
+du dashboard qui chargent le jeu de données dès le démarrage.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules dont la présence après le premier rendu est signalée
+MODULES_SUIVIS = ["pandas", "plotly", "matplotlib", "seaborn", "ina.loader"]
+
+ESSAI = """
+import json, sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+imported = time.perf_counter()
+at = AppTest.from_file(sys.argv[1], default_timeout=300)
+at.run()
+rendered = time.perf_counter()
+if at.exception:
+    raise SystemExit(at.exception[0].message)
+print(json.dumps({
+    "import_streamlit": imported - start,
+    "premier_rendu": rendered - imported,
+    "modules": [m for m in json.loads(sys.argv[2]) if m in sys.modules],
+}))
+"""
+
+
+def essai(script, cwd):
+    env = dict(os.environ, PYTHONPATH=RACINE)
+    sortie = subprocess.run(
+        [sys.executable, "-c", ESSAI, script, json.dumps(MODULES_SUIVIS)],
+        cwd=cwd,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(sortie.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "script", nargs="?", default=os.path.join(RACINE, "dashboard.py")
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--cwd", default=RACINE)
+    args = parser.parse_args()
+
+    script = os.path.abspath(args.script)
+    essais = [essai(script, args.cwd) for _ in range(args.repeat)]
+
+    print(f"{script}, médiane sur {args.repeat} démarrages")
+    for label in ("import_streamlit", "premier_rendu"):
+        seconds = statistics.median(e[label] for e in essais)
+        print(f"  {label:<18} {seconds * 1000:8.1f} ms")
+    print(f"  modules chargés    {', '.join(essais[-1]['modules']) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
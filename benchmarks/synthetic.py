@@ -0,0 +1,92 @@
+"""Génère un CSV au format du baromètre INA (`date;chaine;b;theme;nombre_sujets;duree`).
+
+À l'échelle 1, on a 6 chaînes × 14 thèmes sur 2000-2020, chaque couple
+(chaîne, thème) étant présent environ un jour sur deux, soit environ 354 000
+lignes. L'échelle multiplie le nombre de chaînes (« Chaîne 7 », « Chaîne 8 »...) :
+les pages gardent leurs chaînes et thèmes habituels, seul le volume change.
+Le fichier est écrit année par année, trié par date comme celui de l'INA.
+
+Usage : python -m benchmarks.synthetic sortie.csv [--scale N] [--seed S]
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+CHAINES = ["TF1", "France 2", "France 3", "Canal +", "Arte", "M6"]
+THEMES = [
+    "Société",
+    "International",
+    "Economie",
+    "Sciences et techniques",
+    "Environnement",
+    "Santé",
+    "Politique France",
+    "Justice",
+    "Culture-loisirs",
+    "Sport",
+    "Education",
+    "Faits divers",
+    "Catastrophes",
+    "Histoire-hommages",
+]
+FIRST_YEAR, LAST_YEAR = 2000, 2020
+# Part des couples (jour, chaîne, thème) présents dans le fichier
+DENSITY = 0.55
+
+
+def chaines(scale):
+    n = max(1, round(len(CHAINES) * scale))
+    return CHAINES[:n] + [f"Chaîne {i}" for i in range(len(CHAINES) + 1, n + 1)]
+
+
+def year_rows(year, names, rng):
+    days = pd.date_range(f"{year}-01-01", f"{year}-12-31")
+    d, c, t = np.meshgrid(
+        np.arange(len(days)),
+        np.arange(len(names)),
+        np.arange(len(THEMES)),
+        indexing="ij",
+    )
+    keep = rng.random(d.size) < DENSITY
+    d, c, t = d.ravel()[keep], c.ravel()[keep], t.ravel()[keep]
+    sujets = rng.poisson(2, d.size) + 1
+    duree = sujets * rng.integers(60, 150, d.size)
+    return pd.DataFrame(
+        {
+            "date": days.strftime("%d/%m/%Y")[d],
+            "chaine": np.array(names)[c],
+            "b": "",
+            "theme": np.array(THEMES)[t],
+            "nombre_sujets": sujets,
+            "duree": duree,
+        }
+    )
+
+
+def generate(path, scale=1, seed=0):
+    """Écrit le CSV synthétique dans `path` et renvoie son nombre de lignes."""
+    rng = np.random.default_rng(seed)
+    names = chaines(scale)
+    rows = 0
+    with open(path, "w", encoding="ISO-8859-1", newline="") as f:
+        for year in range(FIRST_YEAR, LAST_YEAR + 1):
+            block = year_rows(year, names, rng)
+            block.to_csv(f, sep=";", header=False, index=False)
+            rows += len(block)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("output")
+    parser.add_argument("--scale", type=float, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    rows = generate(args.output, args.scale, args.seed)
+    print(f"{rows} lignes -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
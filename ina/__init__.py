@@ -0,0 +1,14 @@
+"""Couche données du dashboard : chargement et agrégats du baromètre JT de l'INA."""
+
+from ina.cube import Cube
+from ina.loader import DATA_PATH, Dataset, load_dataset, loader_stats
+from ina.timeindex import TimeIndex
+
+__all__ = [
+    "Cube",
+    "DATA_PATH",
+    "Dataset",
+    "load_dataset",
+    "loader_stats",
+    "TimeIndex",
+]
@@ -0,0 +1,100 @@
+"""Cube d'agrégats année × mois × chaîne × thème, calculé une fois au chargement.
+
+Chaque cellule contient la somme des durées (secondes), le nombre de lignes
+quotidiennes et la somme des sujets. Les graphiques des pages interrogent ce
+cube (quelques dizaines de milliers de cellules) au lieu de regrouper à chaque
+interaction les lignes quotidiennes.
+"""
+
+import numpy as np
+import pandas as pd
+
+from ina.dimensions import mask
+
+DIMENSIONS = ["Année", "Mois", "chaine", "theme"]
+MEASURES = ["duree", "nb_lignes", "nombre_sujets"]
+
+
+def aggregate(df):
+    """Cellules du cube pour les lignes quotidiennes `df` (colonnes date, Année, chaine, theme...)."""
+    cells = (
+        df.groupby(
+            [df["Année"], df["date"].dt.month.rename("Mois"), "chaine", "theme"],
+            observed=True,
+        )
+        .agg(
+            duree=("duree", "sum"),
+            nb_lignes=("duree", "size"),
+            nombre_sujets=("nombre_sujets", "sum"),
+        )
+        .reset_index()
+    )
+    cells["Mois"] = cells["Mois"].astype("int8")
+    return cells
+
+
+def merge_cells(parts):
+    """Somme des cellules de plusieurs morceaux, comme si `aggregate` avait vu toutes les lignes.
+
+    Les catégories de chaine/theme sont réunies et triées, comme celles lues par
+    `read_csv(dtype="category")`.
+    """
+    parts = [part for part in parts if part is not None]
+    cells = pd.concat(parts, ignore_index=True)
+    for dim in ("chaine", "theme"):
+        categories = sorted(set().union(*(part[dim].unique() for part in parts)))
+        cells[dim] = pd.Categorical(cells[dim].astype(object), categories=categories)
+    cells = cells.groupby(DIMENSIONS, observed=True)[MEASURES].sum().reset_index()
+    return cells
+
+
+class Cube:
+    def __init__(self, frame, values):
+        self.frame = frame
+        self._values = values
+
+    @classmethod
+    def from_frame(cls, df):
+        # Ordre d'apparition dans le fichier, utilisé pour les valeurs par défaut des sélecteurs
+        values = {dim: list(df[dim].unique()) for dim in ("chaine", "theme")}
+        return cls(aggregate(df), values)
+
+    def appended(self, df):
+        """Cube augmenté des lignes `df`, sans réagréger les lignes déjà comptées."""
+        values = {}
+        for dim, known in self._values.items():
+            seen = set(known)
+            values[dim] = known + [v for v in df[dim].unique() if v not in seen]
+        return Cube(merge_cells([self.frame, aggregate(df)]), values)
+
+    def values(self, dim):
+        """Valeurs distinctes d'une dimension (ordre d'apparition pour chaine/theme)."""
+        if dim in self._values:
+            return list(self._values[dim])
+        return sorted(self.frame[dim].unique())
+
+    def query(self, by, **where):
+        """Mesures sommées par `by`, après filtrage `dimension=valeur` ou `dimension=[valeurs]`.
+
+        En plus des sommes, renvoie `duree_heures` et `duree_moyenne` (secondes par
+        ligne quotidienne, équivalent de `groupby(...)["duree"].mean()`).
+        """
+        cells = self.frame
+        if where:
+            kept = np.ones(len(cells), dtype=bool)
+            for dim, value in where.items():
+                column = cells[dim]
+                if isinstance(column.dtype, pd.CategoricalDtype):
+                    # Codes retenus, puis lecture des codes des cellules
+                    codes = column.array
+                    kept &= mask(codes.categories, value)[codes.codes]
+                elif isinstance(value, (list, tuple, set)):
+                    kept &= column.isin(list(value)).to_numpy()
+                else:
+                    kept &= (column == value).to_numpy()
+            cells = cells[kept]
+
+        result = cells.groupby(by, observed=True)[MEASURES].sum().reset_index()
+        result["duree_heures"] = result["duree"] / 3600
+        result["duree_moyenne"] = result["duree"] / result["nb_lignes"]
+        return result
@@ -0,0 +1,96 @@
+"""Dictionnaire des dimensions `chaine` et `theme`, construit une fois au chargement.
+
+Chaque dimension est une table triée de ses valeurs : le code d'une valeur est
+sa position, le même que celui des catégories du jeu de données, que
+`ina.loader.read_typed` trie (`sort_categories`) quelle que soit la source et
+que `_extend` garde triées. Les filtres se font ensuite sur ces codes : `mask`
+renvoie un tableau de booléens indexé par code, appliqué aux codes des colonnes
+catégorielles au lieu de comparer des chaînes.
+
+La recherche (`Dimension.search`) passe par un index de préfixes : les mots de
+chaque valeur, sans accents ni majuscules, triés avec le code de leur valeur.
+Une recherche « sci tech » trouve « Sciences et techniques » : chaque mot
+cherché doit commencer un mot de la valeur, trouvé par dichotomie dans l'index.
+"""
+
+import bisect
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+DIMENSIONS = ("chaine", "theme")
+
+
+def normalize(text):
+    """`text` sans accents ni majuscules."""
+    decomposed = unicodedata.normalize("NFKD", str(text))
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def words(text):
+    return re.findall(r"\w+", normalize(text))
+
+
+def mask(labels, values):
+    """Booléens indexés par code de `labels` : vrai pour les codes de `values`."""
+    if isinstance(values, (str, int, np.integer)):
+        values = [values]
+    # Tables de quelques dizaines de valeurs : un dict coûte moins qu'un `get_indexer`
+    positions = {label: code for code, label in enumerate(labels)}
+    allowed = np.zeros(len(labels), dtype=bool)
+    allowed[[positions[value] for value in values if value in positions]] = True
+    return allowed
+
+
+class Dimension:
+    def __init__(self, name, labels):
+        self.name = name
+        self.labels = pd.Index(sorted(labels))
+        entries = sorted(
+            (word, code)
+            for code, label in enumerate(self.labels)
+            for word in words(label)
+        )
+        self._words = [word for word, _ in entries]
+        self._codes = np.array([code for _, code in entries], dtype=np.int64)
+
+    def __len__(self):
+        return len(self.labels)
+
+    def codes(self, values):
+        """Codes des valeurs connues de `values`, dans l'ordre de la table."""
+        return np.flatnonzero(mask(self.labels, values))
+
+    def decode(self, codes):
+        return list(self.labels[np.asarray(codes, dtype=np.int64)])
+
+    def _prefixed(self, prefix):
+        lo = bisect.bisect_left(self._words, prefix)
+        hi = bisect.bisect_left(self._words, prefix + "\U0010ffff")
+        return self._codes[lo:hi]
+
+    def search(self, text):
+        """Codes des valeurs dont un mot commence par chaque mot de `text` (toutes si vide)."""
+        found = np.ones(len(self), dtype=bool)
+        for prefix in words(text):
+            matched = np.zeros(len(self), dtype=bool)
+            matched[self._prefixed(prefix)] = True
+            found &= matched
+        return np.flatnonzero(found)
+
+
+class Dimensions:
+    """Tables de `chaine` et `theme` (voir le module)."""
+
+    def __init__(self, chaine, theme):
+        self.chaine = chaine
+        self.theme = theme
+
+    @classmethod
+    def from_frame(cls, df):
+        return cls(*(Dimension(dim, df[dim].cat.categories) for dim in DIMENSIONS))
+
+    def __getitem__(self, dim):
+        return getattr(self, dim)
@@ -0,0 +1,216 @@
+"""Cache LRU des figures Plotly, partagé entre les sessions du processus.
+
+Une figure est identifiée par (page, identifiant du graphique, valeurs des
+widgets dont elle dépend, version du jeu de données). Tant que ces entrées ne
+changent pas, un rerun Streamlit réutilise l'objet figure déjà construit : il ne
+reste que sa sérialisation par `st.plotly_chart`.
+
+La taille d'une entrée est celle de son JSON Plotly, sérialisé une seule fois
+par figure construite : le même texte est écrit sur disque, et sa taille sert
+de volume brut envoyé au navigateur (`json_size`). Les entrées les moins
+récemment utilisées sont évincées au-delà de `max_bytes` ou de `max_entries`.
+Avec `sizeof=len`, le même cache sert aux réponses déjà encodées du serveur
+HTTP (`ina.server`).
+
+Avec `INA_FIGURE_DIR`, un second niveau (`FigureStore`) garde le JSON des
+figures sur disque, commun à tous les processus : une figure absente de la
+mémoire y est relue (3 à 7 fois moins coûteux que la reconstruire), et chaque
+figure construite y est écrite. Le préchauffage (`python -m vues.prechauffage`)
+le remplit avant l'arrivée des visiteurs. Le nom de chaque fichier porte les
+versions du jeu de données de sa clé : `FigureStore.prune` supprime celles des
+versions remplacées.
+"""
+
+import glob
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+# Clé absente du disque (une figure peut valoir None)
+MISSING = object()
+
+
+def key_digest(key):
+    """Empreinte hexadécimale d'une clé de `FigureCache`, stable entre processus."""
+    # Les clés ne contiennent que des str, int et tuples : repr stable entre processus
+    return hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+
+
+def figure_json(fig):
+    """JSON de `fig` tel que `st.plotly_chart` le sérialise ("null" pour None)."""
+    import plotly.io as pio
+
+    return "null" if fig is None else pio.to_json(fig, validate=False)
+
+
+def key_versions(key):
+    """Versions distinctes du jeu de données dans la clé `key` (voir `years_version`)."""
+    return sorted({version for version in str(key[-1]).split("-") if version})
+
+
+class FigureStore:
+    """Figures Plotly en JSON dans `directory`, un fichier par clé de `FigureCache`.
+
+    Fichier `<versions>_<empreinte de la clé>.json`, pour reconnaître sans les
+    lire les figures des versions remplacées (`prune`).
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, key):
+        versions = "-".join(key_versions(key))
+        return os.path.join(self.directory, f"{versions}_{key_digest(key)}.json")
+
+    def load(self, key):
+        """JSON enregistré pour `key` (voir `figure_json`), ou MISSING."""
+        try:
+            with open(self.path(key), encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return MISSING
+
+    def save(self, key, text):
+        """Écrit `text`, le JSON de la figure de `key` (`figure_json`)."""
+        path = self.path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+        except OSError:
+            # Le disque n'est qu'un second niveau de cache
+            logger.warning("Impossible d'écrire la figure %s", path, exc_info=True)
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def prune(self, versions):
+        """Supprime les figures d'une version absente de `versions` ; renvoie leur nombre."""
+        versions = set(versions)
+        removed = 0
+        for path in glob.glob(os.path.join(self.directory, "*.json")):
+            tag, _, _ = os.path.basename(path).rpartition("_")
+            if tag and set(tag.split("-")) <= versions:
+                continue
+            try:
+                os.remove(path)
+                removed += 1
+            except FileNotFoundError:
+                # Déjà supprimée par un autre processus
+                pass
+        return removed
+
+
+class FigureCache:
+    def __init__(self, max_bytes=64 * 2**20, max_entries=512, sizeof=None, store=None):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.store = store
+        self._sizeof = sizeof
+        self._entries = OrderedDict()
+        # id(figure en cache) -> clé, pour `json_size`
+        self._keys = {}
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._loads = 0
+
+    @staticmethod
+    def make_key(page, chart_id, params, version):
+        # Les listes (sélections multiples) deviennent des tuples, hachables
+        params = {
+            key: tuple(value) if isinstance(value, list) else value
+            for key, value in params.items()
+        }
+        return (page, chart_id, tuple(sorted(params.items())), version)
+
+    def get_or_build(self, key, build):
+        """Renvoie la figure en cache pour `key`, ou l'obtient via `build()` et la stocke."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return self._entries[key][0]
+            self._misses += 1
+
+        # Construction hors verrou : deux sessions peuvent construire la même
+        # figure en parallèle, la seconde écrase simplement la première.
+        text = MISSING if self.store is None else self.store.load(key)
+        if text is MISSING:
+            fig = build()
+            if self._sizeof is None or self.store is not None:
+                # Une seule sérialisation : taille, disque et volume envoyé
+                text = figure_json(fig)
+            if self.store is not None:
+                self.store.save(key, text)
+        else:
+            import plotly.io as pio
+
+            fig = None if text == "null" else pio.from_json(text)
+            with self._lock:
+                self._loads += 1
+        if self._sizeof is None:
+            size = len(text.encode("utf-8")) if fig is not None else 0
+        else:
+            size = self._sizeof(fig)
+        with self._lock:
+            if key in self._entries:
+                self._forget(key)
+            self._entries[key] = (fig, size)
+            self._keys[id(fig)] = key
+            self._bytes += size
+            while self._entries and (
+                self._bytes > self.max_bytes or len(self._entries) > self.max_entries
+            ):
+                self._forget(next(iter(self._entries)))
+                self._evictions += 1
+        return fig
+
+    def _forget(self, key):
+        fig, size = self._entries.pop(key)
+        if self._keys.get(id(fig)) == key:
+            del self._keys[id(fig)]
+        self._bytes -= size
+
+    def json_size(self, fig):
+        """Octets du JSON de `fig` mesurés à sa mise en cache, ou None si elle n'y est plus."""
+        with self._lock:
+            key = self._keys.get(id(fig))
+            if key is None or self._entries[key][0] is not fig:
+                return None
+            return self._entries[key][1]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "disk_loads": self._loads,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+
+figure_cache = FigureCache(
+    max_bytes=int(float(os.environ.get("INA_FIGURE_CACHE_MB", "64")) * 2**20),
+    max_entries=int(os.environ.get("INA_FIGURE_CACHE_ENTRIES", "512")),
+    store=(
+        FigureStore(os.environ["INA_FIGURE_DIR"])
+        if os.environ.get("INA_FIGURE_DIR")
+        else None
+    ),
+)
@@ -0,0 +1,138 @@
+"""Allègement du JSON Plotly envoyé au navigateur.
+
+Une figure Plotly Express embarque tout son modèle (`layout.template`) :
+les styles par défaut d'une quarantaine de types de traces et de sous-graphes
+(cartes, 3D, polaires...), soit 50 à 80 % du JSON des graphiques du dashboard.
+`slim` renvoie une copie au rendu identique :
+
+- le modèle ne garde que les types de traces de la figure, et les sous-graphes,
+  échelles de couleurs, annotations et formes qu'elle utilise ;
+- les dates à minuit sont envoyées au jour (« 2020-03-11 » au lieu de
+  « 2020-03-11T00:00:00 »).
+
+La mise en page propre à la figure n'est pas touchée : le thème Streamlit est
+fusionné côté navigateur dans `layout.template.layout`, et y déplacer des
+propriétés de la figure changerait le rendu. Les tableaux numériques sont déjà
+encodés en binaire (base64, type le plus petit sans perte) par Plotly.
+
+`split_template` sépare le modèle du reste de la figure, pour ne l'écrire
+qu'une fois quand plusieurs figures le partagent (export statique).
+"""
+
+import json
+
+import numpy as np
+
+# Sous-graphes du modèle -> types de traces qui les utilisent
+SUBPLOTS = {
+    "geo": ("scattergeo", "choropleth"),
+    "polar": ("scatterpolar", "scatterpolargl", "barpolar"),
+    "ternary": ("scatterternary",),
+    "scene": (
+        "scatter3d",
+        "surface",
+        "mesh3d",
+        "cone",
+        "streamtube",
+        "isosurface",
+        "volume",
+    ),
+    "mapbox": ("scattermapbox", "choroplethmapbox", "densitymapbox"),
+    "map": ("scattermap", "choroplethmap", "densitymap"),
+}
+# Types de traces colorés par une échelle continue
+COLORSCALE_TRACES = {
+    "heatmap",
+    "contour",
+    "histogram2d",
+    "histogram2dcontour",
+    "choropleth",
+    "surface",
+    "densitymapbox",
+    "densitymap",
+}
+DATE_ATTRIBUTES = ("x", "y", "base")
+
+
+def _uses_colorscale(spec):
+    layout = spec["layout"]
+    if any(key.startswith("coloraxis") for key in layout if key != "template"):
+        return True
+    for trace in spec["data"]:
+        if trace.get("type", "scatter") in COLORSCALE_TRACES:
+            return True
+        marker = trace.get("marker", {})
+        if "colorscale" in trace or "colorscale" in marker or "coloraxis" in marker:
+            return True
+        color = marker.get("color")
+        if isinstance(color, (list, tuple, np.ndarray)) and len(color):
+            if np.asarray(color).dtype.kind in "iuf":
+                return True
+    return False
+
+
+def _slim_template(spec):
+    template = spec["layout"].get("template")
+    if not template:
+        return
+    types = {trace.get("type", "scatter") for trace in spec["data"]}
+    template["data"] = {
+        kind: defaults
+        for kind, defaults in template.get("data", {}).items()
+        if kind in types
+    }
+    defaults = template.get("layout", {})
+    for subplot, kinds in SUBPLOTS.items():
+        if types.isdisjoint(kinds):
+            defaults.pop(subplot, None)
+    if not _uses_colorscale(spec):
+        defaults.pop("colorscale", None)
+        defaults.pop("coloraxis", None)
+    if "annotations" not in spec["layout"]:
+        defaults.pop("annotationdefaults", None)
+    if "shapes" not in spec["layout"]:
+        defaults.pop("shapedefaults", None)
+
+
+def _days(values):
+    """Dates à minuit au format jour, ou None si `values` n'en est pas."""
+    if not isinstance(values, np.ndarray) or values.dtype.kind != "M":
+        return None
+    days = values.astype("datetime64[D]")
+    if not (days == values).all():
+        return None
+    return np.datetime_as_string(days, unit="D").astype(object)
+
+
+def slim(fig):
+    """Copie allégée de `fig` (voir le module), au rendu identique."""
+    import plotly.graph_objects as go
+
+    spec = fig.to_plotly_json()
+    spec.setdefault("layout", {})
+    _slim_template(spec)
+    for trace in spec["data"]:
+        for attribute in DATE_ATTRIBUTES:
+            days = _days(trace.get(attribute))
+            if days is not None:
+                trace[attribute] = days
+    return go.Figure(spec, skip_invalid=False)
+
+
+def payload_size(fig):
+    """Octets du JSON de `fig`, tel que `st.plotly_chart` le sérialise."""
+    import plotly.io as pio
+
+    return len(pio.to_json(fig, validate=False).encode("utf-8"))
+
+
+def split_template(text):
+    """(JSON de la figure sans son modèle, JSON du modèle ou None) depuis le JSON `text`."""
+    spec = json.loads(text)
+    if spec is None or "template" not in spec.get("layout", {}):
+        return text, None
+    template = spec["layout"].pop("template")
+    return (
+        json.dumps(spec, separators=(",", ":")),
+        json.dumps(template, separators=(",", ":")),
+    )
@@ -0,0 +1,170 @@
+"""Ingestion par morceaux d'un ou plusieurs CSV de l'INA.
+
+Le chargement complet (`loader.read_ina_csv`) garde en mémoire, en même temps,
+les colonnes texte brutes et les colonnes typées de tout le fichier. Ici, chaque
+CSV est lu par `read_csv(chunksize=...)` : un morceau est typé, ajouté aux
+agrégats du cube et transmis au stockage colonnaire (un row group Parquet), puis
+libéré avant le suivant. La mémoire de pointe dépend de la taille des morceaux,
+pas de celle des fichiers.
+
+Usage : python -m ina.ingest sortie.parquet fichier.csv [fichier.csv ...] [--chunksize N]
+"""
+
+import argparse
+import logging
+import time
+from dataclasses import dataclass
+
+import pandas as pd
+
+from ina import store
+from ina.cube import Cube, aggregate, merge_cells
+from ina.schema import CSV_OPTIONS, DERIVED_SCHEMA, SCHEMA
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNKSIZE = 500_000
+
+# Le parseur C construit des catégories propres à chaque morceau ; elles sont
+# ensuite ramenées aux catégories cumulées (les codes restent comparables)
+_CHUNK_DTYPES = {k: v for k, v in SCHEMA.items() if k != "date"}
+
+
+@dataclass(frozen=True)
+class IngestResult:
+    """Résumé d'une ingestion : nombre de lignes, cube des agrégats et dates extrêmes.
+
+    `output` est la valeur renvoyée par `sink` (chemin écrit, ou None en cas d'échec).
+    """
+
+    rows: int
+    chunks: int
+    cube: Cube
+    first_date: pd.Timestamp
+    last_date: pd.Timestamp
+    output: object = None
+
+
+class _Categories:
+    """Valeurs d'une colonne catégorielle, dans l'ordre de première apparition."""
+
+    def __init__(self):
+        self.values = []
+        self._seen = set()
+
+    def update(self, column):
+        for value in column.unique():
+            if value not in self._seen:
+                self._seen.add(value)
+                self.values.append(value)
+        return column.cat.set_categories(self.values)
+
+
+def type_chunk(chunk, categories):
+    """Applique SCHEMA à un morceau ; `categories` est partagé entre les morceaux."""
+    chunk["date"] = pd.to_datetime(chunk["date"], dayfirst=True)
+    for dim, seen in categories.items():
+        chunk[dim] = seen.update(chunk[dim])
+    return chunk.astype(SCHEMA)
+
+
+def iter_chunks(paths, chunksize=DEFAULT_CHUNKSIZE):
+    """Morceaux typés des CSV `paths`, lus l'un après l'autre."""
+    categories = {"chaine": _Categories(), "theme": _Categories()}
+    for path in paths:
+        with pd.read_csv(
+            path, dtype=_CHUNK_DTYPES, chunksize=chunksize, **CSV_OPTIONS
+        ) as reader:
+            for chunk in reader:
+                yield type_chunk(chunk, categories)
+
+
+def ingest(paths, sink=None, chunksize=DEFAULT_CHUNKSIZE):
+    """Lit `paths` par morceaux, en cumulant les agrégats du cube.
+
+    `sink`, s'il est donné, reçoit l'itérable des morceaux typés et doit le
+    consommer (par exemple `lambda chunks: store.write_chunks(path, chunks)`).
+    S'il s'arrête avant la fin, le résultat ne couvre que les morceaux consommés.
+    """
+    state = {
+        "rows": 0,
+        "chunks": 0,
+        "cells": None,
+        "values": {},
+        "first": None,
+        "last": None,
+    }
+
+    def observed(chunks):
+        for chunk in chunks:
+            dates = chunk["date"]
+            first, last = dates.min(), dates.max()
+            state["first"] = (
+                first if state["first"] is None else min(state["first"], first)
+            )
+            state["last"] = last if state["last"] is None else max(state["last"], last)
+            # Le cube a besoin de l'année, qui n'est pas stockée dans le Parquet
+            cells = aggregate(
+                chunk.assign(**{"Année": dates.dt.year.astype(DERIVED_SCHEMA["Année"])})
+            )
+            state["cells"] = merge_cells([state["cells"], cells])
+            # Catégories cumulées par iter_chunks, dans l'ordre d'apparition
+            state["values"] = {
+                dim: list(chunk[dim].cat.categories) for dim in ("chaine", "theme")
+            }
+            state["rows"] += len(chunk)
+            state["chunks"] += 1
+            yield chunk
+
+    start = time.perf_counter()
+    stream = observed(iter_chunks(paths, chunksize))
+    output = None
+    if sink is None:
+        for _ in stream:
+            pass
+    else:
+        output = sink(stream)
+
+    logger.info(
+        "Ingestion de %d ligne(s) en %d morceau(x) en %.2fs",
+        state["rows"],
+        state["chunks"],
+        time.perf_counter() - start,
+    )
+    return IngestResult(
+        rows=state["rows"],
+        chunks=state["chunks"],
+        cube=Cube(state["cells"], state["values"]),
+        first_date=state["first"],
+        last_date=state["last"],
+        output=output,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("output", help="fichier Parquet à écrire")
+    parser.add_argument("csv", nargs="+")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    args = parser.parse_args()
+
+    if not store.enabled():
+        raise SystemExit("pyarrow n'est pas installé : pas de sortie Parquet possible")
+
+    logging.basicConfig(level=logging.INFO)
+    result = ingest(
+        args.csv,
+        sink=lambda chunks: store.write_chunks(args.output, chunks),
+        chunksize=args.chunksize,
+    )
+    if result.output is None:
+        raise SystemExit(f"Échec de l'écriture de {args.output}")
+    print(
+        f"{result.rows} lignes du {result.first_date:%d/%m/%Y} au "
+        f"{result.last_date:%d/%m/%Y}, {len(result.cube.frame)} cellules de cube "
+        f"-> {args.output}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,392 @@
+"""Chargement du CSV de l'INA, une seule fois par processus.
+
+Streamlit ré-exécute le script à chaque interaction : le jeu de données est donc
+gardé en mémoire au niveau du module et partagé entre toutes les sessions, en
+lecture seule (`ina.readonly`). Il n'est relu que si la date de modification du
+fichier change *et* que son contenu (SHA-1) a réellement changé.
+
+Si le fichier a seulement été prolongé (nouvelle publication mensuelle ajoutée à
+la fin), seules les lignes ajoutées sont lues : le cube, l'index temporel, les
+séries par période et le cache colonnaire sont complétés, et seules les années concernées changent de
+version (`Dataset.years_version`).
+
+Avec `INA_SHARED_DIR`, les colonnes et l'index temporel sont projetés depuis la
+mémoire partagée quand un éditeur (`python -m ina.shared`) a publié cette
+version du fichier.
+"""
+
+import hashlib
+import io
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field, replace
+
+import pandas as pd
+
+from ina import shared, store
+from ina.cube import Cube
+from ina.dimensions import Dimensions
+from ina.profiling import profiled
+from ina.readonly import freeze
+from ina.schema import CSV_OPTIONS, DERIVED_SCHEMA, SCHEMA
+from ina.series import PeriodSeries
+from ina.timeindex import TimeIndex
+
+logger = logging.getLogger(__name__)
+
+DATA_PATH = os.path.join(
+    "Data",
+    "ina-barometre-jt-tv-donnees-quotidiennes-2000-2020-nbre-sujets-durees-202410.csv",
+)
+
+# Moteur des agrégats : "pandas" (`ina.cube.Cube`) ou "numpy" (`ina.tensor.TensorCube`)
+ENGINE = os.environ.get("INA_ENGINE", "pandas")
+
+
+@dataclass(frozen=True)
+class Dataset:
+    """Jeu de données chargé, partagé entre les sessions.
+
+    Ses DataFrames (`frame`, les deux ordres de l'index temporel, les cellules
+    du cube) sont en lecture seule (`ina.readonly`) : les écrire lève TypeError.
+    Ils sont figés une fois, au chargement ou à l'ajout (`freeze_shared`).
+
+    `filters` restreint les requêtes de `ina.queries` à certaines chaînes et
+    certains thèmes (voir `filtered`) ; les données elles-mêmes ne changent pas.
+    """
+
+    frame: pd.DataFrame
+    cube: Cube
+    time_index: TimeIndex
+    path: str
+    mtime_ns: int
+    sha1: str
+    load_seconds: float
+    size: int = 0
+    # Version de chaque année : un ajout de lignes ne change que celles des années touchées
+    year_versions: dict = field(default_factory=dict)
+    # Séries par thème au jour, à la semaine, au mois et à l'année
+    series: PeriodSeries = None
+    # Tables triées des chaînes et des thèmes, avec leurs codes (construites au chargement)
+    dimensions: Dimensions = None
+    # Dimension -> valeurs retenues (tuple trié), pour les dimensions filtrées
+    filters: dict = field(default_factory=dict)
+
+    @property
+    def version(self):
+        return self.sha1[:12]
+
+    def filtered(self, chaines=(), themes=()):
+        """Le même jeu, ses requêtes restreintes à `chaines` × `themes` (vide : tout).
+
+        Les valeurs inconnues sont ignorées. Une requête qui fixe elle-même une
+        chaîne ou un thème (la page TF1, la page Sciences...) garde sa valeur.
+        """
+        filters = {}
+        for dim, values in (("chaine", chaines), ("theme", themes)):
+            codes = self.dimensions[dim].codes(values)
+            if len(codes):
+                filters[dim] = tuple(self.dimensions[dim].decode(codes))
+        return replace(self, filters=filters)
+
+    def values(self, dim):
+        """Valeurs de `dim` comme `cube.values`, restreintes aux filtres du jeu."""
+        values = self.cube.values(dim)
+        if dim in self.filters:
+            kept = set(self.filters[dim])
+            values = [value for value in values if value in kept]
+        return values
+
+    def labels(self, dim):
+        """Valeurs triées de `dim` (table de `dimensions`), restreintes aux filtres du jeu."""
+        return list(self.filters.get(dim, self.dimensions[dim].labels))
+
+    def years_version(self, years):
+        """Version des seules années `years`, pour les caches qui n'en dépendent pas d'autres."""
+        return "-".join(self.year_versions.get(int(y), "") for y in sorted(set(years)))
+
+
+_lock = threading.Lock()
+_datasets = {}
+_stats = {"loads": 0, "appends": 0, "hits": 0, "last_load_seconds": None}
+
+
+def file_sha1(path, chunk_size=1 << 20):
+    return file_digests(path, chunk_size=chunk_size)[0]
+
+
+def file_digests(path, prefix_size=0, chunk_size=1 << 20):
+    """(SHA-1, SHA-1 des `prefix_size` premiers octets ou None, taille lue), en une lecture."""
+    digest = hashlib.sha1()
+    prefix = None
+    size = 0
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            if size < prefix_size <= size + len(chunk):
+                cut = prefix_size - size
+                digest.update(chunk[:cut])
+                prefix = digest.hexdigest()
+                chunk = chunk[cut:]
+                size += cut
+            digest.update(chunk)
+            size += len(chunk)
+    return digest.hexdigest(), prefix, size
+
+
+def read_ina_csv(path):
+    """Lecture du CSV (séparateur `;`, latin-1, dates jour/mois/année) en colonnes typées."""
+    df = pd.read_csv(
+        path, dtype={k: v for k, v in SCHEMA.items() if k != "date"}, **CSV_OPTIONS
+    )
+    df["date"] = pd.to_datetime(df["date"], dayfirst=True)
+    return df.astype(SCHEMA)
+
+
+def sort_categories(df):
+    """Catégories chaine/theme triées, comme celles produites par `read_csv`.
+
+    Un Parquet écrit par morceaux les relit dans l'ordre d'apparition ; l'ordre
+    des catégories fixe celui des barres et des légendes des graphiques.
+    """
+    for dim in ("chaine", "theme"):
+        categories = df[dim].cat.categories
+        if not categories.is_monotonic_increasing:
+            df[dim] = df[dim].cat.reorder_categories(sorted(categories))
+    return df
+
+
+def read_typed(path, sha1):
+    """Colonnes typées depuis le cache colonnaire s'il est à jour, sinon depuis le CSV.
+
+    Renvoie `(frame, cube)` ; `cube` n'est pas None quand le cache vient d'être
+    construit par `ina.ingest`, qui a cumulé les agrégats en lisant le CSV.
+    """
+    if path.endswith(".parquet"):
+        # Sortie de `python -m ina.ingest` (plusieurs CSV réunis)
+        return sort_categories(pd.read_parquet(path)), None
+
+    df = store.read_cache(path, sha1)
+    if df is not None:
+        logger.info("Cache colonnaire utilisé pour %s", os.path.basename(path))
+        return sort_categories(df), None
+
+    if store.enabled():
+        # Import local : `python -m ina.ingest` ne doit pas trouver le module
+        # déjà importé par le paquet
+        from ina import ingest
+
+        # Lecture par morceaux : pas de copie texte de tout le fichier en mémoire
+        result = ingest.ingest(
+            [path], sink=lambda chunks: store.write_cache_chunks(path, sha1, chunks)
+        )
+        if result.output is not None:
+            df = store.read_cache(path, sha1)
+            if df is not None:
+                return sort_categories(df), result.cube
+
+    # Sans pyarrow, ou cache impossible à écrire
+    df = sort_categories(read_ina_csv(path))
+    store.write_cache(path, sha1, df)
+    return df, None
+
+
+def build_cube(frame, cube=None):
+    """Cube du moteur `ENGINE` ; `cube` est celui déjà cumulé par `ina.ingest`, s'il existe."""
+    if ENGINE == "numpy":
+        # Importé ici : `python -m ina.tensor` ne doit pas trouver le module déjà chargé
+        from ina.tensor import TensorCube
+
+        if cube is not None:
+            return TensorCube.from_cube(cube)
+        return TensorCube.from_frame(frame)
+    if cube is not None:
+        return cube
+    return Cube.from_frame(frame)
+
+
+def add_derived_columns(df):
+    # Les requêtes par fenêtre de dates (TimeIndex) s'appuient sur cet ordre
+    if not df["date"].is_monotonic_increasing:
+        df = df.sort_values("date", kind="stable", ignore_index=True)
+    df["Année"] = df["date"].dt.year.astype(DERIVED_SCHEMA["Année"])
+    return df
+
+
+def freeze_shared(frame, cube, time_index):
+    """Fige `frame`, l'index temporel et le cube avant leur partage ; renvoie `frame` figé."""
+    frozen = freeze(frame)
+    # L'index reprend `frame` quand le fichier est déjà trié par date
+    if time_index.by_date is frame:
+        time_index.by_date = frozen
+    else:
+        time_index.by_date = freeze(time_index.by_date)
+    time_index.by_pair = freeze(time_index.by_pair)
+    if isinstance(cube, Cube):
+        cube.frame = freeze(cube.frame)
+    return frozen
+
+
+def _extend(cached, path, mtime_ns, size, sha1):
+    """Version `sha1` de `path`, dont les `cached.size` premiers octets n'ont pas changé.
+
+    Seules les lignes ajoutées en fin de fichier sont lues et typées ; le cube et
+    l'index temporel sont prolongés au lieu d'être recalculés. Renvoie None si
+    l'ancienne fin de fichier ne tombait pas en fin de ligne.
+    """
+    start = time.perf_counter()
+    with open(path, "rb") as f:
+        f.seek(cached.size - 1)
+        if f.read(1) != b"\n":
+            return None
+        tail = f.read(size - cached.size)
+    try:
+        delta = read_ina_csv(io.BytesIO(tail))
+    except pd.errors.EmptyDataError:
+        return None
+
+    # Catégories communes ; l'historique n'est recodé que si une valeur nouvelle apparaît
+    old = cached.frame
+    for dim in ("chaine", "theme"):
+        categories = old[dim].cat.categories
+        if not delta[dim].cat.categories.isin(categories).all():
+            categories = categories.union(delta[dim].cat.categories).sort_values()
+            old = old.assign(**{dim: old[dim].cat.set_categories(categories)})
+        delta[dim] = delta[dim].cat.set_categories(categories)
+
+    store.append_cache(
+        path,
+        cached.sha1,
+        sha1,
+        delta,
+        lambda: pd.concat([old, delta], ignore_index=True)[list(SCHEMA)],
+    )
+
+    delta = add_derived_columns(delta)
+    frame = pd.concat([old, delta], ignore_index=True)
+    if frame["date"].is_monotonic_increasing:
+        cube = cached.cube.appended(delta)
+        time_index = cached.time_index.extended(frame)
+        series = cached.series.appended(delta)
+    else:
+        # Lignes ajoutées antérieures à la dernière date connue : tout est retrié
+        frame = add_derived_columns(frame)
+        cube = build_cube(frame)
+        time_index = TimeIndex(frame)
+        series = PeriodSeries.from_frame(frame)
+    elapsed = time.perf_counter() - start
+
+    version = sha1[:12]
+    year_versions = dict(cached.year_versions)
+    year_versions.update((int(y), version) for y in delta["Année"].unique())
+    frame = freeze_shared(frame, cube, time_index)
+    logger.info(
+        "%d ligne(s) ajoutée(s) en %.2fs (années %s, version %s)",
+        len(delta),
+        elapsed,
+        ", ".join(str(y) for y in sorted(delta["Année"].unique())),
+        version,
+    )
+    return Dataset(
+        frame,
+        cube,
+        time_index,
+        path,
+        mtime_ns,
+        sha1,
+        elapsed,
+        size,
+        year_versions,
+        series,
+        Dimensions.from_frame(frame),
+    )
+
+
+@profiled("chargement")
+def load_dataset(path=DATA_PATH):
+    """Renvoie le jeu de données partagé, en le (re)chargeant seulement si le fichier a changé."""
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    mtime_ns = stat.st_mtime_ns
+
+    with _lock:
+        cached = _datasets.get(path)
+        if cached is not None and cached.mtime_ns == mtime_ns:
+            _stats["hits"] += 1
+            logger.debug("Cache jeu de données : hit (%d)", _stats["hits"])
+            return cached
+
+        prefix_size = 0
+        if cached is not None and not path.endswith(".parquet"):
+            if 0 < cached.size < stat.st_size:
+                prefix_size = cached.size
+        sha1, prefix_sha1, size = file_digests(path, prefix_size)
+        if cached is not None and cached.sha1 == sha1:
+            # Fichier touché mais contenu identique : on garde la version en mémoire
+            cached = replace(cached, mtime_ns=mtime_ns)
+            _datasets[path] = cached
+            _stats["hits"] += 1
+            logger.info("Fichier %s modifié sans changement de contenu", path)
+            return cached
+
+        start = time.perf_counter()
+        # Mode partagé (INA_SHARED_DIR) : colonnes et index publiés par `ina.shared`
+        attached = shared.attach(sha1)
+
+        if attached is None and prefix_sha1 is not None and prefix_sha1 == cached.sha1:
+            dataset = _extend(cached, path, mtime_ns, size, sha1)
+            if dataset is not None:
+                _datasets[path] = dataset
+                _stats["appends"] += 1
+                _stats["last_load_seconds"] = dataset.load_seconds
+                return dataset
+
+        if attached is not None:
+            frame, time_index = attached
+            cube = build_cube(frame)
+        else:
+            frame, cube = read_typed(path, sha1)
+            if not frame["date"].is_monotonic_increasing:
+                # L'ordre d'apparition des chaînes et thèmes retenu par l'ingestion
+                # serait celui du fichier, pas celui des lignes triées par date
+                cube = None
+            frame = add_derived_columns(frame)
+            cube = build_cube(frame, cube)
+            time_index = TimeIndex(frame)
+        series = PeriodSeries.from_frame(frame)
+        elapsed = time.perf_counter() - start
+
+        version = sha1[:12]
+        year_versions = {int(y): version for y in cube.values("Année")}
+        frame = freeze_shared(frame, cube, time_index)
+        dataset = Dataset(
+            frame,
+            cube,
+            time_index,
+            path,
+            mtime_ns,
+            sha1,
+            elapsed,
+            size,
+            year_versions,
+            series,
+            Dimensions.from_frame(frame),
+        )
+        _datasets[path] = dataset
+        _stats["loads"] += 1
+        _stats["last_load_seconds"] = elapsed
+        logger.info(
+            "Jeu de données chargé en %.2fs (%d lignes, %.1f Mo, version %s)",
+            elapsed,
+            len(frame),
+            frame.memory_usage(deep=True).sum() / 1e6,
+            dataset.version,
+        )
+        return dataset
+
+
+def loader_stats():
+    """Compteurs du cache : chargements complets, ajouts incrémentaux, hits et durée du dernier."""
+    with _lock:
+        return dict(_stats)
@@ -0,0 +1,166 @@
+"""Profilage optionnel d'une exécution du script Streamlit, section par section.
+
+Une exécution profilée (`start` ... `finish`) enregistre, pour chaque section
+(`with section(nom)` ou fonction décorée par `profiled`), le nombre d'appels, la
+durée et la variation de mémoire allouée mesurée par `tracemalloc`. Les
+sections imbriquées sont nommées par leur chemin (« figure … › requete … »).
+Hors exécution profilée, une section ne coûte qu'une lecture de `ContextVar`.
+
+Le chemin courant est lui aussi dans une `ContextVar` : une tâche lancée dans un
+autre thread avec une copie du contexte (`contextvars.copy_context`, comme le
+fait `vues.commun.Graphiques`) enregistre ses sections dans le même relevé, sous
+le chemin où elle a été soumise.
+
+`finish` ajoute le relevé en une ligne JSON à `INA_PROFILE_LOG` (par défaut
+`profil.jsonl`). `tracemalloc` ralentit les allocations et mesure tout le
+processus : il n'est actif que pendant les exécutions profilées (arrêté par la
+dernière qui se termine, s'il a été démarré ici), et son pic n'est remis à zéro
+que par une exécution qui démarre seule. Un relevé dont l'exécution en a croisé
+une autre est marqué `concurrent` : ses chiffres de mémoire incluent l'autre.
+"""
+
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+LOG_PATH = os.environ.get("INA_PROFILE_LOG", "profil.jsonl")
+SEPARATOR = " › "
+
+_current = contextvars.ContextVar("ina_profile", default=None)
+_path = contextvars.ContextVar("ina_profile_path", default=())
+_log_lock = threading.Lock()
+# Exécutions profilées en cours, et si `tracemalloc` a été démarré par l'une d'elles
+_running = set()
+_running_lock = threading.Lock()
+_tracing_started = False
+
+
+class Profile:
+    """Relevé d'une exécution : sections agrégées par chemin, dans l'ordre d'apparition."""
+
+    def __init__(self, **context):
+        self.context = context
+        self.sections = {}
+        self.start = time.perf_counter()
+        self._lock = threading.Lock()
+        # Une autre exécution profilée a tourné en même temps
+        self.concurrent = False
+
+    def enter(self, name):
+        path = _path.get() + (name,)
+        token = _path.set(path)
+        key = SEPARATOR.join(path)
+        with self._lock:
+            # Enregistrée à l'entrée : une section précède ses sous-sections
+            self.sections.setdefault(key, {"appels": 0, "ms": 0.0, "memoire_ko": 0.0})
+        return key, token
+
+    def leave(self, key, token, seconds, memory):
+        _path.reset(token)
+        with self._lock:
+            stats = self.sections[key]
+            stats["appels"] += 1
+            stats["ms"] += seconds * 1000
+            stats["memoire_ko"] += memory / 1024
+
+
+def enabled():
+    """Vrai pendant une exécution profilée."""
+    return _current.get() is not None
+
+
+def running():
+    """Nombre d'exécutions profilées en cours dans le processus (tout thread)."""
+    with _running_lock:
+        return len(_running)
+
+
+@contextmanager
+def section(name):
+    profile = _current.get()
+    if profile is None:
+        yield
+        return
+    key, token = profile.enter(name)
+    memory = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.leave(
+            key,
+            token,
+            time.perf_counter() - start,
+            tracemalloc.get_traced_memory()[0] - memory,
+        )
+
+
+def profiled(name):
+    """Décorateur : chaque appel de la fonction est une section `name`."""
+
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with section(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def start(**context):
+    """Démarre le profilage de l'exécution courante ; `context` est recopié dans le relevé."""
+    global _tracing_started
+    profile = Profile(**context)
+    with _running_lock:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracing_started = True
+        if _running:
+            # Le pic en cours est celui des autres exécutions : pas de remise à zéro
+            profile.concurrent = True
+            for other in _running:
+                other.concurrent = True
+        else:
+            tracemalloc.reset_peak()
+        _running.add(profile)
+    _current.set(profile)
+    return profile
+
+
+def finish(profile):
+    """Termine le profilage, écrit le relevé dans le journal et le renvoie."""
+    global _tracing_started
+    _current.set(None)
+    with _running_lock:
+        peak = tracemalloc.get_traced_memory()[1]
+        _running.discard(profile)
+        if not _running and _tracing_started:
+            tracemalloc.stop()
+            _tracing_started = False
+    record = {
+        "horodatage": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        **profile.context,
+        "total_ms": round((time.perf_counter() - profile.start) * 1000, 3),
+        "pic_memoire_mo": round(peak / 2**20, 3),
+        "concurrent": profile.concurrent,
+        "sections": [
+            {
+                "section": key,
+                "appels": stats["appels"],
+                "ms": round(stats["ms"], 3),
+                "memoire_ko": round(stats["memoire_ko"], 1),
+            }
+            for key, stats in profile.sections.items()
+        ],
+    }
+    line = json.dumps(record, ensure_ascii=False)
+    with _log_lock, open(LOG_PATH, "a", encoding="utf-8") as f:
+        f.write(line + "\n")
+    return record
@@ -0,0 +1,189 @@
+"""Requêtes d'agrégats derrière les graphiques, sans dépendance à Streamlit.
+
+Chaque requête prend le jeu de données (`ina.loader.Dataset`) et des paramètres
+simples, et renvoie un DataFrame avec les colonnes de `Cube.query` : `duree`
+(secondes), `nb_lignes`, `nombre_sujets`, `duree_heures`, `duree_moyenne`.
+Les pages du dashboard ne font ensuite que renommer, trier et tracer ; le
+serveur HTTP (`ina.server`) expose les mêmes requêtes aux autres clients.
+
+`serie` renvoie une colonne `periode` (début de chaque jour, semaine, mois ou
+année) à la place des dimensions du cube ; `pics` et `evenements_detectes` les
+pics de couverture détectés sur l'historique quotidien (`ina.spikes`).
+
+Les dimensions que la requête ne fixe pas sont restreintes aux filtres globaux
+du jeu (`Dataset.filters`, plusieurs chaînes × plusieurs thèmes).
+
+`QUERIES` associe le nom de chaque requête à la fonction et au type de ses
+paramètres (`str`, `int`, `natural_int`, `positive_int`, `list_str`,
+`list_int`), pour les lire depuis une URL : une valeur hors de son domaine lève
+ValueError.
+"""
+
+from ina import spikes
+from ina.dimensions import mask
+from ina.profiling import profiled
+from ina.series import PERIODES, PeriodSeries
+from ina.timeindex import event_periods
+
+QUERIES = {}
+
+
+def list_str(value):
+    return [item for item in value.split(",") if item]
+
+
+def list_int(value):
+    return [int(item) for item in list_str(value)]
+
+
+def natural_int(value):
+    """Entier positif ou nul."""
+    value = int(value)
+    if value < 0:
+        raise ValueError(f"entier positif ou nul attendu : {value}")
+    return value
+
+
+def positive_int(value):
+    """Entier strictement positif."""
+    value = int(value)
+    if value <= 0:
+        raise ValueError(f"entier strictement positif attendu : {value}")
+    return value
+
+
+def query(**params):
+    """Enregistre une requête dans `QUERIES` avec le type de ses paramètres.
+
+    Chaque appel est une section du profilage (`ina.profiling`).
+    """
+
+    def register(func):
+        func = profiled(f"requete {func.__name__}")(func)
+        QUERIES[func.__name__] = (func, params)
+        return func
+
+    return register
+
+
+def _filters(data, **where):
+    """Filtres `dimension=valeur` donnés, complétés des filtres globaux du jeu.
+
+    Une dimension fixée par la requête garde sa valeur ; les autres sont
+    restreintes aux valeurs de `data.filters` (voir `Dataset.filtered`).
+    """
+    for dim, values in data.filters.items():
+        if where.get(dim) is None:
+            where[dim] = list(values)
+    return {dim: value for dim, value in where.items() if value is not None}
+
+
+@query(theme=str, chaine=str)
+def par_annee(data, theme=None, chaine=None):
+    """Totaux par année, pour un thème et/ou une chaîne."""
+    return data.cube.query(["Année"], **_filters(data, theme=theme, chaine=chaine))
+
+
+@query(theme=str, annees=list_int)
+def par_chaine(data, theme=None, annees=None):
+    """Totaux par chaîne, pour un thème et éventuellement certaines années."""
+    return data.cube.query(["chaine"], **_filters(data, theme=theme, Année=annees))
+
+
+@query(chaine=str, annee=int)
+def par_theme(data, chaine=None, annee=None):
+    """Totaux par thème, pour une chaîne et/ou une année."""
+    return data.cube.query(["theme"], **_filters(data, chaine=chaine, Année=annee))
+
+
+@query(theme=str, annees=list_int)
+def par_chaine_et_annee(data, theme=None, annees=None):
+    """Totaux par chaîne et par année, pour un thème."""
+    where = _filters(data, theme=theme, Année=annees)
+    return data.cube.query(["chaine", "Année"], **where)
+
+
+@query(chaine=str, themes=list_str)
+def par_annee_et_theme(data, chaine=None, themes=None):
+    """Totaux par année et par thème, pour une chaîne et/ou une liste de thèmes."""
+    where = _filters(data, chaine=chaine, theme=themes)
+    return data.cube.query(["Année", "theme"], **where)
+
+
+@query(themes=list_str, annees=list_int)
+def par_theme_et_chaine(data, themes=None, annees=None):
+    """Totaux par thème et par chaîne, pour une liste de thèmes et éventuellement d'années."""
+    where = _filters(data, theme=themes, Année=annees)
+    return data.cube.query(["theme", "chaine"], **where)
+
+
+@query(
+    date=str,
+    chaine=str,
+    mois_avant=natural_int,
+    mois_apres=natural_int,
+    jours_pendant=natural_int,
+)
+def evenement_periodes(data, date, chaine, mois_avant=6, mois_apres=6, jours_pendant=0):
+    """Totaux par période (Avant / [Pendant] / Après) et par thème pour une chaîne."""
+    bornes, periodes = event_periods(date, mois_avant, mois_apres, jours_pendant)
+    where = _filters(data, chaine=chaine)
+    return data.time_index.compare_periods(bornes, periodes, by="theme", **where)
+
+
+@query(date=str, theme=str, mois_avant=natural_int, mois_apres=natural_int)
+def evenement_par_chaine(data, date, theme, mois_avant=6, mois_apres=6):
+    """Totaux par chaîne pour un thème, sur la fenêtre autour de l'événement."""
+    bornes, _ = event_periods(date, mois_avant, mois_apres)
+    where = _filters(data, theme=theme)
+    return data.time_index.window_sums(bornes[0], bornes[-1], by="chaine", **where)
+
+
+@query(date=str, mois_avant=natural_int, mois_apres=natural_int)
+def evenement_par_theme(data, date, mois_avant=6, mois_apres=6):
+    """Totaux par thème (toutes chaînes) sur la fenêtre autour de l'événement."""
+    bornes, _ = event_periods(date, mois_avant, mois_apres)
+    return data.time_index.window_sums(
+        bornes[0], bornes[-1], by="theme", **_filters(data)
+    )
+
+
+@query(granularite=str, theme=str, points=positive_int)
+def serie(data, granularite="annee", theme=None, points=None):
+    """Série temporelle d'un thème (ou de tous) par jour, semaine, mois ou année.
+
+    `points` borne le nombre de points renvoyés (réduction LTTB).
+    """
+    if granularite not in PERIODES:
+        raise ValueError(f"granularité inconnue : {granularite}")
+    if points is not None:
+        points = positive_int(points)
+    where = _filters(data, theme=theme)
+    if "chaine" not in where:
+        return data.series.query(granularite, theme=where.get("theme"), points=points)
+    # Les séries pré-agrégées sont toutes chaînes : recalculées sur les lignes retenues
+    days = data.series.days
+    rows = data.time_index.window(days[0], days[-1], **where)
+    if not len(rows):
+        return data.series.query(granularite, theme=[], points=points)
+    return PeriodSeries.from_frame(rows).query(granularite, points=points)
+
+
+@query(chaine=str, theme=str)
+def pics(data, chaine=None, theme=None):
+    """Pics de couverture par chaîne et par thème (`ina.spikes.detect`), du plus récent au plus ancien."""
+    found = spikes.spikes(data)
+    for dim, value in _filters(data, chaine=chaine, theme=theme).items():
+        codes = found[dim].array
+        found = found[mask(codes.categories, value)[codes.codes]]
+    return found.iloc[::-1].reset_index(drop=True)
+
+
+@query(nombre=positive_int)
+def evenements_detectes(data, nombre=12):
+    """Pics d'un même thème communs à plusieurs chaînes, les plus marqués d'abord.
+
+    Détectés sur toutes les chaînes et tous les thèmes, quels que soient les
+    filtres du jeu : ce sont les dates des événements, pas des mesures.
+    """
+    return spikes.dataset_events(data, limit=nombre)
@@ -0,0 +1,100 @@
+"""DataFrames partagés en lecture seule.
+
+Le jeu de données (`ina.loader.Dataset`) est commun à toutes les sessions : une
+page qui ajoute une colonne (`df["annee"] = ...`) ou modifie des valeurs d'un
+de ses DataFrames le ferait pour tout le processus. `freeze` renvoie une vue
+`FrozenFrame`, sans copie, qui lève `TypeError` (comme un `pd.Index`) pour :
+
+- l'ajout, le remplacement ou la suppression de colonnes ;
+- les écritures par `loc`, `iloc`, `at` et `iat` ;
+- les opérations `inplace=True` et le changement des axes.
+
+Tout ce qui en dérive (filtre, tri, `groupby`, `assign`, requêtes...) est un
+DataFrame ordinaire. Avec le copy-on-write de pandas (toujours actif à partir de
+pandas 3, activé ici pour les versions antérieures), une sélection partage les
+données du jeu partagé et n'est copiée qu'à sa première modification : les
+pages n'appellent jamais `.copy()`, elles écrivent seulement sur leurs propres
+résultats.
+"""
+
+import pandas as pd
+
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
+MESSAGE = "le jeu de données est partagé entre les sessions : {} interdit"
+
+
+def _refuse(operation):
+    raise TypeError(MESSAGE.format(operation))
+
+
+class _Indexer:
+    """`loc`, `iloc`, `at` ou `iat` d'un `FrozenFrame` : lecture seule."""
+
+    def __init__(self, name, indexer):
+        self._name = name
+        self._indexer = indexer
+
+    def __getitem__(self, key):
+        return self._indexer[key]
+
+    def __setitem__(self, key, value):
+        _refuse(f"{self._name}[...] = ...")
+
+    def __getattr__(self, name):
+        return getattr(self._indexer, name)
+
+
+class FrozenFrame(pd.DataFrame):
+    """DataFrame en lecture seule (voir le module) ; ses dérivés sont des DataFrames."""
+
+    @property
+    def _constructor(self):
+        return pd.DataFrame
+
+    def __setitem__(self, key, value):
+        _refuse(f"df[{key!r}] = ...")
+
+    def __delitem__(self, key):
+        _refuse(f"del df[{key!r}]")
+
+    def __setattr__(self, name, value):
+        if name in ("columns", "index"):
+            _refuse(f"df.{name} = ...")
+        super().__setattr__(name, value)
+
+    def insert(self, loc, column, value, allow_duplicates=False):
+        _refuse(f"insert({column!r})")
+
+    def isetitem(self, loc, value):
+        _refuse("isetitem")
+
+    def pop(self, item):
+        _refuse(f"pop({item!r})")
+
+    def _update_inplace(self, result, **kwargs):
+        _refuse("inplace=True")
+
+    @property
+    def loc(self):
+        return _Indexer("loc", super().loc)
+
+    @property
+    def iloc(self):
+        return _Indexer("iloc", super().iloc)
+
+    @property
+    def at(self):
+        return _Indexer("at", super().at)
+
+    @property
+    def iat(self):
+        return _Indexer("iat", super().iat)
+
+
+def freeze(df):
+    """Vue en lecture seule de `df`, sans copie de ses colonnes."""
+    if df is None or isinstance(df, FrozenFrame):
+        return df
+    return FrozenFrame(df, copy=False)
@@ -0,0 +1,24 @@
+"""Format du CSV de l'INA et schéma des colonnes typées, partagés par le chargement
+complet (`ina.loader`) et l'ingestion par morceaux (`ina.ingest`)."""
+
+COL_NAMES = ["date", "chaine", "b", "theme", "nombre_sujets", "duree"]
+
+# Options communes de `pd.read_csv` (séparateur `;`, latin-1, pas d'en-tête)
+CSV_OPTIONS = {
+    "delimiter": ";",
+    "encoding": "ISO-8859-1",
+    "header": None,
+    "names": COL_NAMES,
+    "usecols": ["date", "chaine", "theme", "nombre_sujets", "duree"],
+}
+
+# Schéma du DataFrame partagé. Les durées restent en secondes (entiers) : les
+# heures et minutes sont calculées au moment de l'agrégation, pas ligne à ligne.
+SCHEMA = {
+    "date": "datetime64[ns]",
+    "chaine": "category",
+    "theme": "category",
+    "nombre_sujets": "int16",
+    "duree": "int32",
+}
+DERIVED_SCHEMA = {"Année": "int16"}
@@ -0,0 +1,136 @@
+"""Séries temporelles par thème au jour, à la semaine, au mois et à l'année.
+
+Les mesures du cube (`duree`, `nb_lignes`, `nombre_sujets`) sont cumulées au
+chargement dans un tableau dense jour × mesure × thème (toutes chaînes), puis
+agrégées une fois pour toutes à chaque granularité. Une requête ne fait plus que
+choisir une granularité et une colonne de thème (ou la somme des thèmes).
+
+Les séries longues (plus de 7 000 jours) sont réduites à un budget de points
+par LTTB (Largest-Triangle-Three-Buckets, Steinarsson 2013) : les points gardés
+sont des points réels, choisis pour préserver la forme de la courbe, et le
+navigateur ne reçoit que ce qu'il peut afficher.
+"""
+
+import numpy as np
+import pandas as pd
+
+from ina.cube import MEASURES
+from ina.dimensions import mask
+
+# Granularité -> début de la période de chaque jour
+PERIODES = {
+    "jour": lambda days: days,
+    "semaine": lambda days: days - pd.to_timedelta(days.dayofweek, unit="D"),
+    "mois": lambda days: days.to_period("M").to_timestamp(),
+    "annee": lambda days: days.to_period("Y").to_timestamp(),
+}
+
+
+def lttb(x, y, points):
+    """Indices des `points` points gardés par LTTB (premier et dernier compris)."""
+    n = len(x)
+    if points >= n or points < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    # Seaux de taille égale entre le premier et le dernier point
+    edges = np.linspace(1, n - 1, points - 1).astype(np.int64)
+    kept = np.empty(points, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    previous = 0
+    for i in range(points - 2):
+        start, end = edges[i], edges[i + 1]
+        # Sommet suivant : moyenne du seau d'après (le dernier point à la fin)
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        nx = x[end:next_end].mean()
+        ny = y[end:next_end].mean()
+        # Aire du triangle (précédent, candidat, moyenne suivante), au facteur 1/2 près
+        area = np.abs(
+            (x[previous] - nx) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (ny - y[previous])
+        )
+        previous = start + int(np.argmax(area))
+        kept[i + 1] = previous
+    return kept
+
+
+class PeriodSeries:
+    def __init__(self, days, themes, daily):
+        # daily : (jour, mesure, thème), jours consécutifs sans trou
+        self.days = days
+        self.themes = themes
+        self.daily = daily
+        self.rolled = {}
+        for granularity, period_of in PERIODES.items():
+            periods = period_of(days)
+            starts = np.flatnonzero(np.r_[True, periods[1:] != periods[:-1]])
+            self.rolled[granularity] = (
+                periods[starts],
+                np.add.reduceat(daily, starts, axis=0),
+            )
+
+    @classmethod
+    def from_frame(cls, df):
+        """Séries des lignes quotidiennes `df` (colonnes date, theme, duree, nombre_sujets)."""
+        dates = df["date"].to_numpy()
+        first = dates.min()
+        days = pd.date_range(first, dates.max(), freq="D")
+        day_codes = ((dates - first) // np.timedelta64(1, "D")).astype(np.int64)
+        themes = pd.Index(df["theme"].cat.categories)
+        flat = day_codes * len(themes) + df["theme"].cat.codes.to_numpy()
+        size = len(days) * len(themes)
+
+        daily = np.empty((len(days), len(MEASURES), len(themes)), dtype=np.int64)
+        for i, measure in enumerate(MEASURES):
+            if measure == "nb_lignes":
+                counts = np.bincount(flat, minlength=size)
+            else:
+                weights = df[measure].to_numpy()
+                counts = np.rint(np.bincount(flat, weights=weights, minlength=size))
+            daily[:, i, :] = counts.reshape(len(days), len(themes))
+        return cls(days, themes, daily)
+
+    def appended(self, df):
+        """Séries augmentées des lignes `df`, sans recompter les jours déjà vus."""
+        delta = PeriodSeries.from_frame(df)
+        days = pd.date_range(
+            min(self.days[0], delta.days[0]), max(self.days[-1], delta.days[-1])
+        )
+        themes = pd.Index(sorted(self.themes.union(delta.themes)))
+        daily = np.zeros((len(days), len(MEASURES), len(themes)), dtype=np.int64)
+        for part in (self, delta):
+            rows = days.get_indexer(part.days)
+            columns = themes.get_indexer(part.themes)
+            daily[np.ix_(rows, np.arange(len(MEASURES)), columns)] += part.daily
+        return PeriodSeries(days, themes, daily)
+
+    def query(self, granularity, theme=None, points=None):
+        """Mesures par période pour un thème, une liste ou tous, réduites à `points` points au plus.
+
+        Renvoie `periode` et les colonnes de `Cube.query` ; les périodes sans
+        ligne sont omises, comme les cellules vides du cube.
+        """
+        periods, values = self.rolled[granularity]
+        if theme is None:
+            values = values.sum(axis=2)
+        elif isinstance(theme, (list, tuple)):
+            values = values[:, :, mask(self.themes, theme)].sum(axis=2)
+        else:
+            position = self.themes.get_indexer([theme])[0]
+            if position < 0:
+                values = np.zeros((len(periods), len(MEASURES)), dtype=np.int64)
+            else:
+                values = values[:, :, position]
+
+        present = np.flatnonzero(values[:, MEASURES.index("nb_lignes")])
+        result = pd.DataFrame({"periode": periods[present]})
+        for i, measure in enumerate(MEASURES):
+            result[measure] = values[present, i]
+        result["duree_heures"] = result["duree"] / 3600
+        result["duree_moyenne"] = result["duree"] / result["nb_lignes"]
+
+        if points is not None and len(result) > points:
+            x = result["periode"].to_numpy().astype(np.int64)
+            kept = lttb(x, result["duree_heures"].to_numpy(), points)
+            result = result.iloc[kept].reset_index(drop=True)
+        return result
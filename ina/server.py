@@ -0,0 +1,195 @@
+"""Serveur HTTP local des requêtes d'agrégats (`ina.queries`), en JSON ou Arrow IPC.
+
+    GET /                                  liste des requêtes et de leurs paramètres
+    GET /<requête>?param=valeur&format=json|arrow
+
+Les clients obtiennent les mêmes chiffres que le dashboard sans ouvrir de
+session Streamlit. L'ETag d'une réponse est l'empreinte de sa clé de cache
+(requête, format, paramètres, version du jeu de données) : un client qui
+renvoie `If-None-Match` reçoit 304 tant que le CSV n'a pas changé. Les
+paramètres sont validés avant : une requête invalide reçoit toujours 400.
+Les réponses encodées sont gardées dans un cache LRU partagé par les threads.
+
+Usage : python -m ina.server [--host 127.0.0.1] [--port 8765] [--data CHEMIN]
+"""
+
+import argparse
+import json
+import logging
+import os
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+from ina import queries
+from ina.figure_cache import FigureCache, key_digest
+from ina.loader import DATA_PATH, load_dataset
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - dépendance optionnelle
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPES = {
+    "json": "application/json; charset=utf-8",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+
+def parse_params(name, items):
+    """Paramètres typés de la requête `name` à partir des couples (clé, valeur) de l'URL."""
+    _, types = queries.QUERIES[name]
+    params = {}
+    for key, value in items:
+        if key == "format":
+            continue
+        if key not in types:
+            raise ValueError(f"paramètre inconnu pour {name} : {key}")
+        params[key] = types[key](value)
+    return params
+
+
+def etag_matches(header, etag):
+    """Vrai si l'en-tête `If-None-Match` désigne `etag` (liste d'ETags, `*`, préfixe `W/`)."""
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        # Comparaison faible (RFC 9110, 13.1.2) : le préfixe W/ est ignoré
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+
+def encode(frame, fmt):
+    if fmt == "json":
+        return frame.to_json(
+            orient="records", date_format="iso", force_ascii=False
+        ).encode("utf-8")
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def describe():
+    """Catalogue des requêtes : description et type de chaque paramètre."""
+    return {
+        name: {
+            "description": (func.__doc__ or "").strip().splitlines()[0],
+            "parametres": {key: kind.__name__ for key, kind in types.items()},
+        }
+        for name, (func, types) in queries.QUERIES.items()
+    }
+
+
+class QueryHandler(BaseHTTPRequestHandler):
+    server_version = "ina-queries/1"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        name = url.path.strip("/")
+        items = parse_qsl(url.query)
+        fmt = dict(items).get("format", "json")
+
+        dataset = load_dataset(self.server.data_path)
+        if not name:
+            body = {"version": dataset.version, "requetes": describe()}
+            return self._send_json(HTTPStatus.OK, body)
+        if name not in queries.QUERIES:
+            return self._send_error(HTTPStatus.NOT_FOUND, f"requête inconnue : {name}")
+        if fmt not in CONTENT_TYPES:
+            return self._send_error(HTTPStatus.BAD_REQUEST, f"format inconnu : {fmt}")
+        if fmt == "arrow" and pa is None:
+            return self._send_error(
+                HTTPStatus.NOT_ACCEPTABLE, "pyarrow n'est pas installé"
+            )
+
+        func, _ = queries.QUERIES[name]
+        try:
+            params = parse_params(name, items)
+        except (TypeError, ValueError) as exc:
+            return self._send_error(HTTPStatus.BAD_REQUEST, str(exc))
+
+        key = FigureCache.make_key(name, fmt, params, dataset.version)
+        etag = f'"{key_digest(key)[:16]}"'
+        if etag_matches(self.headers.get("If-None-Match", ""), etag):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        try:
+            body = self.server.cache.get_or_build(
+                key, lambda: encode(func(dataset, **params), fmt)
+            )
+        except (TypeError, ValueError) as exc:
+            # Paramètre manquant, mal typé ou date illisible
+            return self._send_error(HTTPStatus.BAD_REQUEST, str(exc))
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", CONTENT_TYPES[fmt])
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status, body):
+        payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", CONTENT_TYPES["json"])
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _send_error(self, status, message):
+        self._send_json(status, {"erreur": message})
+
+    def log_message(self, format, *args):
+        logger.info("%s %s", self.address_string(), format % args)
+
+
+class QueryServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, data_path=DATA_PATH, cache=None):
+        super().__init__(address, QueryHandler)
+        self.data_path = data_path
+        if cache is None:
+            cache = FigureCache(
+                max_bytes=int(
+                    float(os.environ.get("INA_SERVER_CACHE_MB", "64")) * 2**20
+                ),
+                sizeof=len,
+            )
+        self.cache = cache
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--data", default=DATA_PATH)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    # Chargement avant d'accepter des connexions
+    load_dataset(args.data)
+    server = QueryServer((args.host, args.port), args.data)
+    logger.info("Requêtes servies sur http://%s:%d/", args.host, args.port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
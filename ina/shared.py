@@ -0,0 +1,211 @@
+"""Jeu de données publié en mémoire partagée pour plusieurs processus Streamlit.
+
+Un processus éditeur (`python -m ina.shared`) charge le jeu de données et écrit
+ses tableaux d'une ligne par sujet (colonnes typées, index temporel, sommes
+cumulées) dans un fichier de `INA_SHARED_DIR` (/dev/shm : en mémoire). Les
+workers lancés avec la même variable projettent ce fichier (mmap) en lecture
+seule au lieu de lire le CSV : les pages sont celles du cache du noyau,
+communes à tous les processus, et les DataFrame sont des vues dessus, sans copie.
+
+Les agrégats (cube, séries par période) sont petits : chaque worker les
+recalcule depuis les colonnes partagées.
+
+Un fichier par version du CSV (SHA-1), écrit puis renommé : un worker ne voit
+jamais de fichier incomplet. Le manifeste (types, décalages) est en JSON.
+`--watch` republie quand le CSV change et supprime la version précédente ; les
+workers qui l'ont projetée la gardent jusqu'à leur prochain rechargement.
+
+Usage : python -m ina.shared [--data CHEMIN] [--dir /dev/shm] [--watch SECONDES]
+"""
+
+import argparse
+import json
+import logging
+import mmap
+import os
+import struct
+import time
+
+import numpy as np
+import pandas as pd
+
+from ina.timeindex import SUM_COLUMNS, TimeIndex
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"INASHM01"
+HEADER = struct.Struct("<8sQ")
+ALIGN = 64
+
+
+def shared_dir():
+    """Répertoire de publication, ou None si le mode partagé est désactivé."""
+    return os.environ.get("INA_SHARED_DIR") or None
+
+
+def shared_path(directory, sha1):
+    return os.path.join(directory, f"ina-{sha1[:16]}.bin")
+
+
+class _Layout:
+    """Tableaux à écrire, avec leur décalage dans la zone de données."""
+
+    def __init__(self):
+        self.arrays = []
+        self.size = 0
+
+    def add(self, array):
+        array = np.ascontiguousarray(array)
+        offset = -(-self.size // ALIGN) * ALIGN
+        self.arrays.append((offset, array))
+        self.size = offset + array.nbytes
+        return {"offset": offset, "dtype": array.dtype.str, "count": len(array)}
+
+
+def _frame_spec(df, layout):
+    columns = {}
+    for name, column in df.items():
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            columns[name] = {
+                "codes": layout.add(column.cat.codes.to_numpy()),
+                "categories": list(column.cat.categories),
+            }
+        else:
+            columns[name] = {"values": layout.add(column.to_numpy())}
+    return columns
+
+
+def publish(dataset, directory):
+    """Écrit les tableaux de `dataset` dans `directory` ; renvoie le chemin du fichier."""
+    target = shared_path(directory, dataset.sha1)
+    if os.path.exists(target):
+        return target
+
+    index = dataset.time_index
+    layout = _Layout()
+    manifest = {
+        "sha1": dataset.sha1,
+        "frame": _frame_spec(dataset.frame, layout),
+        # Même objet que `frame` quand le CSV est trié par date (cas normal)
+        "by_date": (
+            None
+            if index.by_date is dataset.frame
+            else _frame_spec(index.by_date, layout)
+        ),
+        "by_pair": _frame_spec(index.by_pair, layout),
+        "keys": layout.add(index._keys),
+        "date_days": layout.add(index._date_days),
+        "cumsums": {col: layout.add(index._cumsums[col]) for col in SUM_COLUMNS},
+    }
+    payload = json.dumps(manifest, ensure_ascii=False).encode("utf-8")
+    data_start = -(-(HEADER.size + len(payload)) // ALIGN) * ALIGN
+
+    tmp = f"{target}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(HEADER.pack(MAGIC, len(payload)))
+            f.write(payload)
+            for offset, array in layout.arrays:
+                f.seek(data_start + offset)
+                f.write(array.view(np.uint8))
+            f.truncate(data_start + layout.size)
+        os.replace(tmp, target)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    logger.info(
+        "Jeu de données publié dans %s (%.1f Mo)",
+        target,
+        (data_start + layout.size) / 2**20,
+    )
+    return target
+
+
+def _frame(spec, array):
+    columns = {}
+    for name, column in spec.items():
+        if "codes" in column:
+            dtype = pd.CategoricalDtype(pd.Index(column["categories"]))
+            columns[name] = pd.Categorical.from_codes(
+                array(column["codes"]), dtype=dtype, validate=False
+            )
+        else:
+            columns[name] = array(column["values"])
+    # copy=False : les colonnes restent des vues sur le fichier projeté
+    return pd.DataFrame(columns, copy=False)
+
+
+def attach(sha1):
+    """`(frame, time_index)` projetés depuis la mémoire partagée, ou None si indisponibles."""
+    directory = shared_dir()
+    if directory is None:
+        return None
+    path = shared_path(directory, sha1)
+    try:
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (FileNotFoundError, ValueError):
+        return None
+
+    magic, length = HEADER.unpack_from(mapped)
+    if magic != MAGIC:
+        logger.warning("%s n'est pas un jeu de données publié, ignoré", path)
+        return None
+    manifest = json.loads(mapped[HEADER.size : HEADER.size + length])
+    if manifest["sha1"] != sha1:
+        return None
+    data_start = -(-(HEADER.size + length) // ALIGN) * ALIGN
+
+    def array(ref):
+        # Tableau en lecture seule : il garde une référence sur `mapped`
+        return np.frombuffer(
+            mapped,
+            dtype=np.dtype(ref["dtype"]),
+            count=ref["count"],
+            offset=data_start + ref["offset"],
+        )
+
+    frame = _frame(manifest["frame"], array)
+    by_date = frame
+    if manifest["by_date"] is not None:
+        by_date = _frame(manifest["by_date"], array)
+    time_index = TimeIndex.from_parts(
+        by_date,
+        _frame(manifest["by_pair"], array),
+        array(manifest["keys"]),
+        array(manifest["date_days"]),
+        {col: array(ref) for col, ref in manifest["cumsums"].items()},
+    )
+    logger.info("Jeu de données projeté depuis %s", path)
+    return frame, time_index
+
+
+def main():
+    from ina.loader import DATA_PATH, load_dataset
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data", default=DATA_PATH)
+    parser.add_argument("--dir", default=shared_dir() or "/dev/shm")
+    parser.add_argument(
+        "--watch",
+        type=float,
+        default=None,
+        help="republier toutes les N secondes si le CSV a changé",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    published = None
+    while True:
+        path = publish(load_dataset(args.data), args.dir)
+        if published is not None and published != path:
+            os.remove(published)
+        published = path
+        if args.watch is None:
+            break
+        time.sleep(args.watch)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""Détection des pics de couverture par chaîne et par thème, sur l'historique quotidien.
+
+Pour chaque couple (chaîne, thème) et chaque mesure (`duree`, `nombre_sujets`),
+la valeur du jour est comparée à la fenêtre glissante des `WINDOW` jours
+précédents (jour courant exclu) par un z-score :
+
+    z = (valeur - moyenne) / max(écart-type, 1)
+
+Un jour est un pic si z >= `Z_MIN`, si la valeur vaut au moins `RATIO_MIN` fois
+la moyenne de la fenêtre et dépasse un plancher par mesure (`MINIMUM`). Les
+jours de pic consécutifs d'un couple forment un seul pic, daté de son maximum.
+
+Le calcul part de l'index temporel (`ina.timeindex`) : les lignes de `by_pair`
+sont triées par (couple, jour) et leur clé code déjà couple et jour. Les couples
+sont traités par blocs en matrices denses couple × jour (un `bincount`, les jours
+sans ligne valent 0), et les moyennes et variances glissantes de tous les
+couples d'un bloc sortent de deux sommes cumulées entières : le coût ne dépend
+pas de la taille de la fenêtre.
+
+Les résultats sont gardés, en lecture seule, pour la version courante du jeu de
+données.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+from ina.readonly import freeze
+from ina.timeindex import DAY_BITS, SUM_COLUMNS
+
+# Fenêtre glissante (jours précédents) et nombre de jours avant la première détection
+WINDOW = 56
+MIN_PERIODS = 28
+Z_MIN = 4.0
+RATIO_MIN = 3.0
+# Valeur minimale d'un pic : 10 minutes d'antenne ou 5 sujets dans la journée
+MINIMUM = {"duree": 600, "nombre_sujets": 5}
+# Cases (couple × jour) par bloc : borne la mémoire des matrices intermédiaires
+CHUNK_CELLS = 1 << 21
+
+COLUMNS = ["chaine", "theme", "mesure", "debut", "pic", "fin", "valeur", "moyenne", "z"]
+
+_lock = threading.Lock()
+_cache = {}
+
+
+def _rolling_z(x, window, min_periods):
+    """z-scores et moyennes glissantes (jours précédents) de chaque ligne de `x`."""
+    n_days = x.shape[1]
+    # Sommes cumulées entières avec un zéro en tête : exactes, sans dérive
+    sums = np.zeros((x.shape[0], n_days + 1), dtype=np.int64)
+    squares = np.zeros_like(sums)
+    np.cumsum(x, axis=1, out=sums[:, 1:])
+    np.cumsum(x * x, axis=1, out=squares[:, 1:])
+
+    def trailing(cs):
+        # Somme des `window` jours avant t : cs[t] - cs[t - window]
+        total = cs[:, :-1].copy()
+        total[:, window:] -= cs[:, : n_days - window]
+        return total
+
+    count = np.minimum(np.arange(n_days), window).astype(np.float64)
+    count[0] = 1
+    mean = trailing(sums) / count
+    variance = trailing(squares) / count - mean * mean
+    std = np.sqrt(np.maximum(variance, 0))
+    z = (x - mean) / np.maximum(std, 1)
+    z[:, :min_periods] = 0
+    return z, mean
+
+
+def _runs(mask, z):
+    """(ligne, début, pic, fin) de chaque suite de jours consécutifs de `mask`."""
+    n_days = mask.shape[1]
+    cells = np.flatnonzero(mask)
+    if not len(cells):
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, empty, empty
+    row, day = cells // n_days, cells % n_days
+    new = np.r_[True, (row[1:] != row[:-1]) | (day[1:] - day[:-1] > 1)]
+    run = np.cumsum(new) - 1
+    starts = np.flatnonzero(new)
+    ends = np.r_[starts[1:], len(cells)] - 1
+    # Pic : jour de z maximal dans chaque suite
+    order = np.lexsort((-z.ravel()[cells], run))
+    peaks = order[starts]
+    return row[starts], day[starts], day[peaks], day[ends]
+
+
+def detect(
+    time_index,
+    window=WINDOW,
+    z_min=Z_MIN,
+    ratio_min=RATIO_MIN,
+    min_periods=MIN_PERIODS,
+):
+    """Pics de tous les couples (chaîne, thème) de `time_index`, pour chaque mesure.
+
+    Renvoie une ligne par pic : `chaine`, `theme`, `mesure`, `debut`, `pic` et
+    `fin` (dates), `valeur` (le jour du pic), `moyenne` (fenêtre précédente) et `z`.
+    """
+    keys = time_index._keys
+    n_themes = len(time_index.themes)
+    n_pairs = len(time_index.chaines) * n_themes
+    if not len(keys):
+        return pd.DataFrame(columns=COLUMNS)
+    first = int(time_index._date_days[0])
+    n_days = int(time_index._date_days[-1]) - first + 1
+    step = max(1, CHUNK_CELLS // n_days)
+    values = {col: time_index.by_pair[col].to_numpy() for col in SUM_COLUMNS}
+
+    found = []
+    for p0 in range(0, n_pairs, step):
+        p1 = min(p0 + step, n_pairs)
+        lo, hi = np.searchsorted(keys, [p0 << DAY_BITS, p1 << DAY_BITS])
+        if lo == hi:
+            continue
+        part = keys[lo:hi]
+        cells = ((part >> DAY_BITS) - p0) * n_days + (
+            (part & ((1 << DAY_BITS) - 1)) - first
+        )
+        for measure in SUM_COLUMNS:
+            x = np.bincount(
+                cells, weights=values[measure][lo:hi], minlength=(p1 - p0) * n_days
+            )
+            x = np.rint(x).astype(np.int64).reshape(p1 - p0, n_days)
+            z, mean = _rolling_z(x, window, min_periods)
+            mask = (z >= z_min) & (x >= ratio_min * mean) & (x >= MINIMUM[measure])
+            row, start, peak, end = _runs(mask, z)
+            found.append(
+                {
+                    "pair": row + p0,
+                    "mesure": np.full(len(row), measure),
+                    "debut": start,
+                    "pic": peak,
+                    "fin": end,
+                    "valeur": x[row, peak],
+                    "moyenne": mean[row, peak],
+                    "z": z[row, peak],
+                }
+            )
+
+    parts = {name: np.concatenate([f[name] for f in found]) for name in found[0]}
+    pair = parts.pop("pair")
+    result = pd.DataFrame(
+        {
+            "chaine": pd.Categorical.from_codes(pair // n_themes, time_index.chaines),
+            "theme": pd.Categorical.from_codes(pair % n_themes, time_index.themes),
+        }
+    )
+    for name, column in parts.items():
+        if name in ("debut", "pic", "fin"):
+            column = (column + first).astype("datetime64[D]").astype("datetime64[ns]")
+        result[name] = column
+    return result.sort_values(["pic", "chaine", "theme"], ignore_index=True)
+
+
+def _memo(dataset, name, compute, params):
+    key = (dataset.sha1, name, tuple(sorted(params.items())))
+    with _lock:
+        result = _cache.get(key)
+    if result is None:
+        # Partagé entre les sessions, comme le jeu de données
+        result = freeze(compute())
+        with _lock:
+            # Seule la version courante est gardée
+            for old in [k for k in _cache if k[0] != dataset.sha1]:
+                del _cache[old]
+            _cache[key] = result
+    return result
+
+
+def spikes(dataset, **params):
+    """Pics de `dataset` (voir `detect`), calculés une fois par version et paramètres."""
+    return _memo(
+        dataset, "spikes", lambda: detect(dataset.time_index, **params), params
+    )
+
+
+def dataset_events(dataset, **params):
+    """Événements de `dataset` (voir `events`), calculés une fois par version et paramètres."""
+    return _memo(dataset, "events", lambda: events(spikes(dataset), **params), params)
+
+
+def events(found, days=3, min_chaines=2, limit=12):
+    """Pics communs à plusieurs chaînes : un même thème, des pics à `days` jours près.
+
+    Regroupe les pics de `found` (sortie de `detect`) par thème et par dates
+    proches, garde les groupes vus par au moins `min_chaines` chaînes et renvoie
+    les `limit` plus marqués (nombre de chaînes, puis somme des z) : `theme`,
+    `date` (pic de z maximal), `chaines` et `z`.
+    """
+    columns = ["theme", "date", "chaines", "z"]
+    if found.empty:
+        return pd.DataFrame(columns=columns)
+    df = found.sort_values(["theme", "pic"], ignore_index=True)
+    theme = df["theme"].cat.codes.to_numpy()
+    peak = df["pic"].to_numpy()
+    gap = np.diff(peak) > np.timedelta64(days, "D")
+    df["groupe"] = np.cumsum(np.r_[True, (theme[1:] != theme[:-1]) | gap])
+
+    groups = df.groupby("groupe")
+    top = df.loc[groups["z"].idxmax(), ["groupe", "theme", "pic"]].set_index("groupe")
+    result = pd.DataFrame(
+        {
+            "theme": top["theme"].astype(str),
+            "date": top["pic"],
+            "chaines": groups["chaine"].nunique(),
+            "z": groups["z"].sum(),
+        }
+    )
+    result = result[result["chaines"] >= min_chaines]
+    result = result.sort_values(["chaines", "z"], ascending=False).head(limit)
+    return result.reset_index(drop=True)[columns]
@@ -0,0 +1,212 @@
+"""Cache colonnaire (Parquet) du CSV de l'INA, rangé à côté du fichier source.
+
+Le fichier de cache est nommé d'après le SHA-1 du CSV : si la source change, le
+nom change aussi et l'ancien cache est supprimé au prochain chargement.
+
+Quand le CSV n'a fait que s'allonger (nouvelles lignes en fin de fichier), seules
+les lignes ajoutées sont écrites, dans un fichier « delta » qui pointe vers le
+cache de la version précédente. Au-delà de `MAX_DELTAS` maillons, le cache est
+réécrit en entier. Les
+colonnes y sont déjà typées (dates, catégories, entiers), ce qui évite de refaire
+le décodage latin-1 et le parsing des dates à chaque démarrage.
+
+`pyarrow` est optionnel : sans lui, on retombe simplement sur la lecture du CSV.
+"""
+
+import glob
+import logging
+import os
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - dépendance optionnelle
+    pa = pq = None
+
+logger = logging.getLogger(__name__)
+
+# À incrémenter si le schéma des colonnes en cache change
+CACHE_FORMAT = 2
+
+# Longueur maximale d'une chaîne de deltas avant réécriture complète du cache
+MAX_DELTAS = 12
+
+if pa is not None:
+    ARROW_SCHEMA = pa.schema(
+        [
+            ("date", pa.timestamp("ns")),
+            ("chaine", pa.dictionary(pa.int32(), pa.string())),
+            ("theme", pa.dictionary(pa.int32(), pa.string())),
+            ("nombre_sujets", pa.int16()),
+            ("duree", pa.int32()),
+        ]
+    )
+
+
+def enabled():
+    return pq is not None and os.environ.get("INA_COLUMNAR_CACHE", "1") != "0"
+
+
+def cache_path(csv_path, sha1):
+    stem, _ = os.path.splitext(csv_path)
+    return f"{stem}.v{CACHE_FORMAT}.{sha1[:16]}.parquet"
+
+
+def delta_path(csv_path, sha1):
+    stem, _ = os.path.splitext(csv_path)
+    return f"{stem}.v{CACHE_FORMAT}.{sha1[:16]}.delta.parquet"
+
+
+def _delta_base(path):
+    """SHA-1 de la version dont un fichier delta prolonge le cache."""
+    return pq.read_schema(path).metadata[b"ina_base"].decode()
+
+
+def _chain(csv_path, sha1):
+    """Fichiers qui composent le cache de `sha1`, du plus récent à la base complète.
+
+    Renvoie None si un maillon manque.
+    """
+    paths = []
+    while True:
+        path = cache_path(csv_path, sha1)
+        if os.path.exists(path):
+            return paths + [path]
+        path = delta_path(csv_path, sha1)
+        if not os.path.exists(path):
+            return None
+        paths.append(path)
+        sha1 = _delta_base(path)
+
+
+def _concat(frames):
+    """Concatène des morceaux typés dont les catégories peuvent différer."""
+    if len(frames) == 1:
+        return frames[0]
+    frame = pd.concat(frames, ignore_index=True)
+    for dim in ("chaine", "theme"):
+        frame[dim] = union_categoricals([f[dim] for f in frames], sort_categories=True)
+    return frame
+
+
+def read_cache(csv_path, sha1):
+    """Renvoie le DataFrame en cache pour cette version du CSV, ou None."""
+    if not enabled():
+        return None
+    try:
+        paths = _chain(csv_path, sha1)
+        if paths is None:
+            return None
+        frames = [
+            pq.read_table(path, memory_map=True).to_pandas() for path in reversed(paths)
+        ]
+        return _concat(frames)
+    except Exception:
+        logger.exception(
+            "Cache colonnaire illisible, il sera reconstruit : %s",
+            cache_path(csv_path, sha1),
+        )
+        return None
+
+
+def write_atomic(path, write):
+    """Appelle `write(tmp_path)` puis renomme le fichier : jamais de Parquet à moitié écrit.
+
+    Renvoie `path`, ou None si l'écriture a échoué (le cache n'est qu'une optimisation).
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except OSError:
+        # Répertoire en lecture seule par exemple
+        logger.warning(
+            "Impossible d'écrire le cache colonnaire %s", path, exc_info=True
+        )
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return None
+    return path
+
+
+def write_chunks(path, chunks):
+    """Écrit un itérable de DataFrames typés dans un seul Parquet, un row group par morceau.
+
+    Les dictionnaires de chaine/theme peuvent différer d'un morceau à l'autre :
+    le schéma Arrow est fixé pour que leurs index restent du même type.
+    """
+
+    def write(tmp_path):
+        writer = None
+        try:
+            for chunk in chunks:
+                table = pa.Table.from_pandas(
+                    chunk, schema=ARROW_SCHEMA, preserve_index=False
+                )
+                if writer is None:
+                    writer = pq.ParquetWriter(tmp_path, ARROW_SCHEMA)
+                writer.write_table(table)
+            if writer is None:
+                raise ValueError("aucune ligne à écrire")
+        finally:
+            if writer is not None:
+                writer.close()
+
+    return write_atomic(path, write)
+
+
+def remove_stale(csv_path, keep):
+    stem, _ = os.path.splitext(csv_path)
+    for stale in glob.glob(f"{glob.escape(stem)}.v*.parquet"):
+        if stale not in keep:
+            os.remove(stale)
+
+
+def write_cache(csv_path, sha1, frame):
+    """Écrit le cache de façon atomique et supprime les caches des versions précédentes."""
+    if not enabled():
+        return None
+    path = write_atomic(
+        cache_path(csv_path, sha1),
+        lambda tmp_path: frame.to_parquet(tmp_path, engine="pyarrow", index=False),
+    )
+    if path is not None:
+        remove_stale(csv_path, [path])
+    return path
+
+
+def write_cache_chunks(csv_path, sha1, chunks):
+    """Comme `write_cache`, à partir des morceaux produits par `ina.ingest`."""
+    if not enabled():
+        return None
+    path = write_chunks(cache_path(csv_path, sha1), chunks)
+    if path is not None:
+        remove_stale(csv_path, [path])
+    return path
+
+
+def append_cache(csv_path, base_sha1, sha1, delta, frame):
+    """Cache de la version `sha1`, qui prolonge la version `base_sha1` des lignes `delta`.
+
+    Seul `delta` est écrit, avec un lien vers la base, tant que la chaîne reste
+    plus courte que `MAX_DELTAS` ; sinon `frame()` (toutes les lignes) est écrit.
+    """
+    if not enabled():
+        return None
+    base = _chain(csv_path, base_sha1)
+    if base is None or len(base) > MAX_DELTAS:
+        return write_cache(csv_path, sha1, frame())
+
+    table = pa.Table.from_pandas(delta, schema=ARROW_SCHEMA, preserve_index=False)
+    table = table.replace_schema_metadata(
+        {**table.schema.metadata, b"ina_base": base_sha1.encode()}
+    )
+    path = write_atomic(
+        delta_path(csv_path, sha1), lambda tmp_path: pq.write_table(table, tmp_path)
+    )
+    if path is not None:
+        remove_stale(csv_path, [path] + base)
+    return path
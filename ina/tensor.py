@@ -0,0 +1,219 @@
+"""Moteur NumPy du cube : tenseurs denses année × mois × chaîne × thème.
+
+Même interface que `ina.cube.Cube` (`query`, `values`, `appended`) ; choisi par
+`INA_ENGINE=numpy` (voir `ina.loader`). Chaque dimension est codée en entiers,
+les mesures (`duree`, `nb_lignes`, `nombre_sujets`) sont cumulées par
+`np.bincount` dans un tableau dense, et une requête n'est plus qu'une sélection
+d'indices suivie de sommes sur les axes non demandés : pas de `groupby`.
+
+À l'échelle du fichier de l'INA, le tenseur fait 21 × 12 × 6 × 14 cellules par
+mesure (moins de 200 Ko en int64).
+
+Vérification contre le moteur pandas : python -m ina.tensor [--data CHEMIN]
+"""
+
+import argparse
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from ina.cube import DIMENSIONS, MEASURES, Cube
+
+
+def _labels(column):
+    """Valeurs d'un axe : catégories (dans leur ordre) ou entiers triés."""
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        return pd.Index(column.cat.categories)
+    return pd.Index(np.unique(column.to_numpy()))
+
+
+def _codes(column, labels):
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        column = column.cat.set_categories(labels)
+        return column.cat.codes.to_numpy().astype(np.int64)
+    return labels.get_indexer(column.to_numpy()).astype(np.int64)
+
+
+class TensorCube:
+    def __init__(self, axes, tensor, values, dtypes):
+        # axes : dimension -> pd.Index des valeurs ; tensor : (mesure, *axes)
+        self.axes = axes
+        self.tensor = tensor
+        self._values = values
+        self._dtypes = dtypes
+
+    @classmethod
+    def _accumulate(cls, columns, weights, values):
+        """Tenseur des sommes de `weights` (mesure -> tableau ou None pour compter)."""
+        axes = {dim: _labels(columns[dim]) for dim in DIMENSIONS}
+        shape = tuple(len(axes[dim]) for dim in DIMENSIONS)
+        flat = np.ravel_multi_index(
+            [_codes(columns[dim], axes[dim]) for dim in DIMENSIONS], shape
+        )
+        size = int(np.prod(shape))
+        tensor = np.empty((len(MEASURES), size), dtype=np.int64)
+        for i, measure in enumerate(MEASURES):
+            w = weights[measure]
+            if w is None:
+                tensor[i] = np.bincount(flat, minlength=size)
+            else:
+                # Sommes exactes en float64 tant qu'elles restent sous 2**53
+                tensor[i] = np.rint(np.bincount(flat, weights=w, minlength=size))
+        dtypes = {dim: columns[dim].dtype for dim in DIMENSIONS}
+        return cls(axes, tensor.reshape((len(MEASURES),) + shape), values, dtypes)
+
+    @classmethod
+    def from_frame(cls, df):
+        """Tenseur des lignes quotidiennes `df` (colonnes date, Année, chaine, theme...)."""
+        columns = {
+            "Année": df["Année"],
+            "Mois": df["date"].dt.month.astype("int8").rename("Mois"),
+            "chaine": df["chaine"],
+            "theme": df["theme"],
+        }
+        weights = {
+            "duree": df["duree"].to_numpy(),
+            "nb_lignes": None,
+            "nombre_sujets": df["nombre_sujets"].to_numpy(),
+        }
+        values = {dim: list(df[dim].unique()) for dim in ("chaine", "theme")}
+        return cls._accumulate(columns, weights, values)
+
+    @classmethod
+    def from_cube(cls, cube):
+        """Tenseur des cellules d'un `Cube` (par exemple celui cumulé par `ina.ingest`)."""
+        cells = cube.frame
+        weights = {measure: cells[measure].to_numpy() for measure in MEASURES}
+        values = {dim: cube.values(dim) for dim in ("chaine", "theme")}
+        return cls._accumulate(cells, weights, values)
+
+    def _reindexed(self, axes):
+        """Tenseur placé sur des axes plus grands (valeurs absentes à zéro)."""
+        shape = (len(MEASURES),) + tuple(len(axes[dim]) for dim in DIMENSIONS)
+        tensor = np.zeros(shape, dtype=np.int64)
+        positions = [np.arange(len(MEASURES))] + [
+            axes[dim].get_indexer(self.axes[dim]) for dim in DIMENSIONS
+        ]
+        tensor[np.ix_(*positions)] = self.tensor
+        return tensor
+
+    def appended(self, df):
+        """Tenseur augmenté des lignes `df`, sans recompter les lignes déjà vues."""
+        delta = TensorCube.from_frame(df)
+        axes, dtypes = {}, {}
+        for dim in DIMENSIONS:
+            merged = self.axes[dim].union(delta.axes[dim])
+            if isinstance(self._dtypes[dim], pd.CategoricalDtype):
+                # Catégories réunies et triées, comme `ina.cube.merge_cells`
+                dtypes[dim] = pd.CategoricalDtype(sorted(merged))
+                merged = pd.Index(dtypes[dim].categories)
+            else:
+                dtypes[dim] = self._dtypes[dim]
+            axes[dim] = merged
+        values = {}
+        for dim, known in self._values.items():
+            seen = set(known)
+            values[dim] = known + [v for v in delta._values[dim] if v not in seen]
+        tensor = self._reindexed(axes) + delta._reindexed(axes)
+        return TensorCube(axes, tensor, values, dtypes)
+
+    def values(self, dim):
+        """Valeurs distinctes d'une dimension (ordre d'apparition pour chaine/theme)."""
+        if dim in self._values:
+            return list(self._values[dim])
+        counts = self.tensor[MEASURES.index("nb_lignes")]
+        axis = DIMENSIONS.index(dim)
+        present = counts.sum(axis=tuple(a for a in range(counts.ndim) if a != axis))
+        labels = self.axes[dim].to_numpy()[present > 0]
+        return list(labels.astype(self._dtypes[dim]))
+
+    def _positions(self, dim, value):
+        if not isinstance(value, (list, tuple, set)):
+            value = [value]
+        positions = self.axes[dim].get_indexer(list(value))
+        return np.unique(positions[positions >= 0])
+
+    def query(self, by, **where):
+        """Mêmes résultats que `Cube.query` : lignes triées par `by`, cellules vides exclues."""
+        tensor = self.tensor
+        positions = {}
+        for dim, value in where.items():
+            positions[dim] = self._positions(dim, value)
+            tensor = tensor.take(positions[dim], axis=1 + DIMENSIONS.index(dim))
+        summed = tuple(1 + i for i, dim in enumerate(DIMENSIONS) if dim not in by)
+        tensor = tensor.sum(axis=summed)
+        # Axes restants dans l'ordre de DIMENSIONS, remis dans l'ordre de `by`
+        kept = [dim for dim in DIMENSIONS if dim in by]
+        tensor = tensor.transpose([0] + [1 + kept.index(dim) for dim in by])
+
+        flat = tensor.reshape(len(MEASURES), -1)
+        present = np.flatnonzero(flat[MEASURES.index("nb_lignes")])
+        codes = np.unravel_index(present, tensor.shape[1:])
+        result = {}
+        for dim, code in zip(by, codes):
+            if dim in positions:
+                code = positions[dim][code]
+            dtype = self._dtypes[dim]
+            if isinstance(dtype, pd.CategoricalDtype):
+                # Les positions sur l'axe sont les codes des catégories
+                result[dim] = pd.Categorical.from_codes(code, dtype=dtype)
+            else:
+                result[dim] = self.axes[dim].to_numpy()[code].astype(dtype)
+        for i, measure in enumerate(MEASURES):
+            result[measure] = flat[i, present]
+        result = pd.DataFrame(result)
+        result["duree_heures"] = result["duree"] / 3600
+        result["duree_moyenne"] = result["duree"] / result["nb_lignes"]
+        return result
+
+
+def check(cube, tensor):
+    """Compare `tensor` à `cube` sur les marges et coupes usuelles ; renvoie les écarts."""
+    years = cube.values("Année")
+    filters = [{}, {"Année": [years[0], years[-1]]}, {"Année": years[len(years) // 2]}]
+    for dim in ("chaine", "theme"):
+        for value in cube.values(dim):
+            filters.append({dim: value})
+    filters.append(
+        {"theme": cube.values("theme")[:3], "chaine": cube.values("chaine")[0]}
+    )
+
+    groupings = [[dim] for dim in DIMENSIONS] + [
+        list(pair) for pair in itertools.permutations(DIMENSIONS, 2)
+    ]
+    errors = []
+    for by in groupings:
+        for where in filters:
+            expected = cube.query(by, **where)
+            actual = tensor.query(by, **where)
+            try:
+                pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+            except AssertionError as exc:
+                errors.append((by, where, str(exc)))
+    for dim in DIMENSIONS:
+        if list(tensor.values(dim)) != list(cube.values(dim)):
+            errors.append(("values", dim, "valeurs différentes"))
+    return errors
+
+
+def main():
+    from ina.loader import DATA_PATH, load_dataset
+
+    parser = argparse.ArgumentParser(
+        description="Vérifie le moteur NumPy contre le cube pandas."
+    )
+    parser.add_argument("--data", default=DATA_PATH)
+    args = parser.parse_args()
+
+    dataset = load_dataset(args.data)
+    frame = dataset.frame
+    errors = check(Cube.from_frame(frame), TensorCube.from_frame(frame))
+    for error in errors[:20]:
+        print(*error, sep="\n  ")
+    print(f"{len(errors)} écart(s)")
+    raise SystemExit(1 if errors else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+"""Index temporel des lignes quotidiennes pour les requêtes par fenêtre de dates.
+
+Deux ordres sont conservés :
+
+- `by_date` : toutes les lignes triées par date ;
+- `by_pair` : les lignes triées par (chaine, theme, date), avec pour chaque
+  couple (chaine, theme) l'offset de son bloc.
+
+Une fenêtre se résout par `searchsorted` sur une clé triée au lieu d'un masque
+booléen sur tout le jeu de données, et les tranches renvoyées sont des vues.
+Les sommes de fenêtre passent par des sommes cumulées : une requête coûte
+quelques recherches dichotomiques, quelle que soit la taille de la fenêtre.
+"""
+
+import numpy as np
+import pandas as pd
+
+from ina.dimensions import mask
+
+# La clé triée de `by_pair` est (couple << DAY_BITS) | jour depuis 1970
+DAY_BITS = 20
+SUM_COLUMNS = ["duree", "nombre_sujets"]
+
+
+def _days(value):
+    return np.datetime64(pd.Timestamp(value).normalize(), "D").astype(np.int64)
+
+
+def _pair_keys(df, n_themes):
+    pair = df["chaine"].cat.codes.to_numpy().astype(np.int64) * n_themes
+    pair += df["theme"].cat.codes.to_numpy()
+    days = df["date"].to_numpy().astype("datetime64[D]").astype(np.int64)
+    return (pair << DAY_BITS) | days
+
+
+def _insert(column, positions, values):
+    """`column` avec `values` insérées aux `positions` (mêmes catégories le cas échéant)."""
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        codes = np.insert(column.cat.codes.to_numpy(), positions, values.cat.codes)
+        return pd.Categorical.from_codes(codes, dtype=column.dtype)
+    return np.insert(column.to_numpy(), positions, values.to_numpy())
+
+
+class TimeIndex:
+    def __init__(self, df):
+        if df["date"].is_monotonic_increasing:
+            self.by_date = df
+        else:
+            self.by_date = df.sort_values("date", kind="stable", ignore_index=True)
+        self._date_days = (
+            self.by_date["date"].to_numpy().astype("datetime64[D]").astype(np.int64)
+        )
+
+        self.chaines = df["chaine"].cat.categories
+        self.themes = df["theme"].cat.categories
+
+        keys = _pair_keys(df, len(self.themes))
+        order = np.argsort(keys, kind="stable")
+        self.by_pair = df.take(order).reset_index(drop=True)
+        self._keys = keys[order]
+        self._cumulate()
+
+    @classmethod
+    def from_parts(cls, by_date, by_pair, keys, date_days, cumsums):
+        """Index déjà calculé, par exemple projeté depuis la mémoire partagée (`ina.shared`)."""
+        index = cls.__new__(cls)
+        index.by_date = by_date
+        index._date_days = date_days
+        index.chaines = by_date["chaine"].cat.categories
+        index.themes = by_date["theme"].cat.categories
+        index.by_pair = by_pair
+        index._keys = keys
+        index._cumsums = cumsums
+        return index
+
+    def _cumulate(self):
+        # Sommes cumulées (avec un zéro en tête) pour les sommes de fenêtre
+        self._cumsums = {
+            col: np.concatenate(([0], np.cumsum(self.by_pair[col].to_numpy(np.int64))))
+            for col in SUM_COLUMNS
+        }
+
+    def extended(self, df):
+        """Index de `df`, dont les premières lignes sont celles déjà indexées par `self`.
+
+        Les lignes ajoutées (en fin de `df`) sont insérées à leur place dans
+        `by_pair` au lieu de tout retrier. Si les catégories ont changé ou si `df`
+        n'est plus trié par date, l'index est reconstruit entièrement.
+        """
+        n_old = len(self.by_date)
+        if not (
+            df["chaine"].cat.categories.equals(self.chaines)
+            and df["theme"].cat.categories.equals(self.themes)
+            and df["date"].is_monotonic_increasing
+        ):
+            return TimeIndex(df)
+
+        delta = df.iloc[n_old:]
+        new_keys = _pair_keys(delta, len(self.themes))
+        new_order = np.argsort(new_keys, kind="stable")
+        new_keys = new_keys[new_order]
+        delta = delta.take(new_order)
+        # "right" : à clé égale, les lignes déjà indexées restent devant (tri stable)
+        positions = np.searchsorted(self._keys, new_keys, "right")
+
+        index = TimeIndex.__new__(TimeIndex)
+        index.by_date = df
+        index._date_days = np.concatenate(
+            (
+                self._date_days,
+                df["date"].to_numpy()[n_old:].astype("datetime64[D]").astype(np.int64),
+            )
+        )
+        index.chaines = self.chaines
+        index.themes = self.themes
+        index.by_pair = pd.DataFrame(
+            {
+                col: _insert(self.by_pair[col], positions, delta[col])
+                for col in self.by_pair.columns
+            }
+        )
+        index._keys = np.insert(self._keys, positions, new_keys)
+        index._cumulate()
+        return index
+
+    def _pairs(self, chaine=None, theme=None):
+        """Codes chaîne, thème et couple de chaque couple (chaine, theme) concerné.
+
+        `chaine` et `theme` sont une valeur ou une liste de valeurs.
+        """
+        chaines = np.arange(len(self.chaines))
+        themes = np.arange(len(self.themes))
+        # Une valeur absente des données donne simplement une fenêtre vide
+        if chaine is not None:
+            chaines = chaines[mask(self.chaines, chaine)]
+        if theme is not None:
+            themes = themes[mask(self.themes, theme)]
+        c, t = np.meshgrid(chaines, themes, indexing="ij")
+        c, t = c.ravel(), t.ravel()
+        return c, t, (c * len(self.themes) + t).astype(np.int64)
+
+    def _pair_bounds(self, pairs, start, end):
+        """Bornes [lo, hi) de chaque couple pour les dates start <= date <= end.
+
+        Une fenêtre inversée (`start` après `end`) est vide : hi vaut alors lo.
+        """
+        lo = np.searchsorted(self._keys, (pairs << DAY_BITS) | _days(start), "left")
+        hi = np.searchsorted(self._keys, (pairs << DAY_BITS) | _days(end), "right")
+        return lo, np.maximum(hi, lo)
+
+    def window(self, start, end, chaine=None, theme=None):
+        """Lignes quotidiennes entre `start` et `end` (inclus), filtrées par chaîne(s) et/ou thème(s).
+
+        Sans filtre, ou avec les deux filtres, le résultat est une tranche (vue) du
+        jeu trié. Avec un seul des deux filtres, les tranches de chaque couple
+        sont concaténées : seules les lignes de la fenêtre sont copiées.
+        """
+        if chaine is None and theme is None:
+            lo = np.searchsorted(self._date_days, _days(start), "left")
+            hi = np.searchsorted(self._date_days, _days(end), "right")
+            return self.by_date.iloc[lo:hi]
+
+        _, _, pairs = self._pairs(chaine, theme)
+        lo, hi = self._pair_bounds(pairs, start, end)
+        if len(pairs) == 1:
+            return self.by_pair.iloc[lo[0] : hi[0]]
+        slices = [self.by_pair.iloc[a:b] for a, b in zip(lo, hi) if b > a]
+        if len(slices) <= 1:
+            return slices[0] if slices else self.by_pair.iloc[0:0]
+        return pd.concat(slices).sort_values("date", kind="stable")
+
+    def window_sums(self, start, end, by, chaine=None, theme=None):
+        """Sommes de `duree`/`nombre_sujets` et nombre de lignes par `by` ("chaine" ou "theme").
+
+        Les colonnes renvoyées sont celles de `Cube.query` : `duree`, `nb_lignes`,
+        `nombre_sujets`, `duree_heures` et `duree_moyenne`.
+        """
+        c, t, pairs = self._pairs(chaine, theme)
+        lo, hi = self._pair_bounds(pairs, start, end)
+        codes, labels = (c, self.chaines) if by == "chaine" else (t, self.themes)
+
+        def per_label(weights):
+            totals = np.bincount(codes, weights=weights, minlength=len(labels))
+            return totals.astype(np.int64)
+
+        nb_lignes = per_label(hi - lo)
+        present = np.flatnonzero(nb_lignes)
+        nb_lignes = nb_lignes[present]
+        duree = per_label(self._cumsums["duree"][hi] - self._cumsums["duree"][lo])
+        duree = duree[present]
+        sujets = self._cumsums["nombre_sujets"][hi] - self._cumsums["nombre_sujets"][lo]
+        return pd.DataFrame(
+            {
+                by: pd.Categorical.from_codes(present, labels),
+                "duree": duree,
+                "nb_lignes": nb_lignes,
+                "nombre_sujets": per_label(sujets)[present],
+                "duree_heures": duree / 3600,
+                "duree_moyenne": duree / nb_lignes,
+            }
+        )
+
+    def compare_periods(self, boundaries, labels, by, chaine=None, theme=None):
+        """Sommes par période contiguë et par `by`, en une seule passe.
+
+        `boundaries` liste les dates de coupure b0 <= b1 <= ... <= bn et `labels`
+        le nom des n périodes : la période i couvre [b_i, b_(i+1)[, la dernière
+        inclut b_n ; une période de bornes égales est vide. Toutes les bornes de
+        tous les couples sont cherchées en un seul `searchsorted`, puis les
+        sommes cumulées donnent chaque période.
+        """
+        if len(labels) != len(boundaries) - 1:
+            raise ValueError("Il faut exactement une étiquette par période")
+        days = np.array([_days(b) for b in boundaries], dtype=np.int64)
+        if not np.all(np.diff(days) >= 0):
+            # Une période inversée donnerait des nombres de lignes négatifs
+            raise ValueError("Les bornes des périodes doivent être croissantes")
+
+        c, t, pairs = self._pairs(chaine, theme)
+        days[-1] += 1  # dernière période fermée à droite
+        bounds = np.searchsorted(
+            self._keys, (pairs[:, None] << DAY_BITS) | days[None, :], "left"
+        )
+        lo, hi = bounds[:, :-1], bounds[:, 1:]
+
+        codes, names = (c, self.chaines) if by == "chaine" else (t, self.themes)
+        n_labels, n_periods = len(names), len(labels)
+        # Une case par (période, valeur de `by`)
+        cells = (np.arange(n_periods)[None, :] * n_labels + codes[:, None]).ravel()
+
+        def per_cell(values):
+            totals = np.bincount(
+                cells, weights=values.ravel(), minlength=n_periods * n_labels
+            )
+            return totals.astype(np.int64)
+
+        nb_lignes = per_cell(hi - lo)
+        present = np.flatnonzero(nb_lignes)
+        nb_lignes = nb_lignes[present]
+        cs = self._cumsums
+        duree = per_cell(cs["duree"][hi] - cs["duree"][lo])[present]
+        sujets = per_cell(cs["nombre_sujets"][hi] - cs["nombre_sujets"][lo])[present]
+        return pd.DataFrame(
+            {
+                "periode": pd.Categorical.from_codes(
+                    present // n_labels, dtype=pd.CategoricalDtype(labels, ordered=True)
+                ),
+                by: pd.Categorical.from_codes(present % n_labels, names),
+                "duree": duree,
+                "nb_lignes": nb_lignes,
+                "nombre_sujets": sujets,
+                "duree_heures": duree / 3600,
+                "duree_moyenne": duree / nb_lignes,
+            }
+        )
+
+
+def event_periods(event_date, months_before=6, months_after=6, days_during=0):
+    """Bornes et étiquettes des périodes autour d'un événement.
+
+    Sans période « Pendant » (`days_during=0`), on retrouve le découpage
+    historique : [événement - 6 mois, événement[ puis [événement, + 6 mois].
+    Lève ValueError pour un nombre de mois ou de jours négatif, ou une période
+    « Pendant » qui déborde de la fenêtre.
+    """
+    if months_before < 0 or months_after < 0 or days_during < 0:
+        raise ValueError("Les mois et les jours autour de l'événement sont positifs")
+    event_date = pd.Timestamp(event_date)
+    start = event_date - pd.DateOffset(months=months_before)
+    end = event_date + pd.DateOffset(months=months_after)
+    if days_during == 0:
+        return [start, event_date, end], ["Avant", "Après"]
+    during = pd.Timedelta(days=days_during)
+    if event_date - during < start or event_date + during >= end:
+        raise ValueError(
+            f"La période « Pendant » ({days_during} jours) déborde de la fenêtre"
+        )
+    return (
+        [start, event_date - during, event_date + during + pd.Timedelta(days=1), end],
+        ["Avant", "Pendant", "Après"],
+    )
@@ -0,0 +1,53 @@
+"""Jeux de données synthétiques au format de l'INA (`benchmarks.synthetic`).
+
+Trois années (2007-2009) des 6 chaînes × 14 thèmes habituels, environ 50 000
+lignes : de quoi couvrir les fenêtres autour d'un événement en quelques secondes.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import CHAINES, year_rows
+from ina import loader
+
+YEARS = (2007, 2008, 2009)
+
+
+def write_csv(path, blocks, mode="w"):
+    """Écrit (ou ajoute, `mode="a"`) les lignes de `blocks` au format du CSV de l'INA."""
+    with open(path, mode, encoding="ISO-8859-1", newline="") as f:
+        for block in blocks:
+            block.to_csv(f, sep=";", header=False, index=False)
+
+
+@pytest.fixture(scope="session")
+def blocks():
+    """Lignes de chaque année de `YEARS`, dans l'ordre des dates."""
+    rng = np.random.default_rng(0)
+    return [year_rows(year, CHAINES, rng) for year in YEARS]
+
+
+@pytest.fixture(scope="session")
+def csv_path(tmp_path_factory, blocks):
+    path = tmp_path_factory.mktemp("data") / "ina.csv"
+    write_csv(path, blocks)
+    return str(path)
+
+
+@pytest.fixture(scope="session")
+def dataset(csv_path):
+    return loader.load_dataset(csv_path)
+
+
+def sums(df, by):
+    """Sommes de référence en pandas : `duree`, `nb_lignes`, `nombre_sujets` par `by`."""
+    grouped = df.groupby(by, observed=True)
+    expected = pd.DataFrame(
+        {
+            "duree": grouped["duree"].sum(),
+            "nb_lignes": grouped.size(),
+            "nombre_sujets": grouped["nombre_sujets"].sum(),
+        }
+    )
+    return expected.astype(np.int64).sort_index()
@@ -0,0 +1,31 @@
+"""Moteur NumPy (`ina.tensor`) et mémoire partagée (`ina.shared`) contre le jeu chargé."""
+
+import pandas as pd
+
+from ina import shared
+from ina.cube import Cube
+from ina.tensor import TensorCube, check
+
+
+def test_tensor_matches_cube(dataset):
+    frame = dataset.frame
+    assert check(Cube.from_frame(frame), TensorCube.from_frame(frame)) == []
+
+
+def test_tensor_append_matches_full_build(dataset):
+    frame = dataset.frame
+    cut = (frame["date"] >= "2009-07-01").to_numpy()
+    appended = TensorCube.from_frame(frame[~cut]).appended(frame[cut])
+    assert check(Cube.from_frame(frame), appended) == []
+
+
+def test_shared_attach_matches_dataset(dataset, tmp_path, monkeypatch):
+    shared.publish(dataset, str(tmp_path))
+    monkeypatch.setenv("INA_SHARED_DIR", str(tmp_path))
+    frame, time_index = shared.attach(dataset.sha1)
+    pd.testing.assert_frame_equal(frame, dataset.frame, check_frame_type=False)
+    pd.testing.assert_frame_equal(
+        time_index.window_sums("2008-01-01", "2008-12-31", by="chaine"),
+        dataset.time_index.window_sums("2008-01-01", "2008-12-31", by="chaine"),
+    )
+    assert shared.attach("0" * 40) is None
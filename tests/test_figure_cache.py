@@ -0,0 +1,64 @@
+import os
+
+import plotly.graph_objects as go
+
+from ina.figure_cache import FigureCache, FigureStore
+from ina.figure_payload import payload_size
+
+
+def _figure(y):
+    return go.Figure(go.Bar(x=["a", "b"], y=y))
+
+
+def test_builds_once_and_measures_json(tmp_path):
+    cache = FigureCache(store=FigureStore(str(tmp_path)))
+    key = FigureCache.make_key("page", "graphique", {"annees": [2008]}, "v1")
+    calls = []
+
+    def build():
+        calls.append(1)
+        return _figure([1, 2])
+
+    fig = cache.get_or_build(key, build)
+    assert cache.get_or_build(key, build) is fig
+    assert len(calls) == 1
+    assert cache.json_size(fig) == payload_size(fig)
+    assert cache.json_size(_figure([1, 2])) is None
+
+    # Un autre processus relit la figure sur disque sans la reconstruire
+    other = FigureCache(store=FigureStore(str(tmp_path)))
+    reloaded = other.get_or_build(key, build)
+    assert len(calls) == 1
+    assert other.stats()["disk_loads"] == 1
+    assert reloaded.to_plotly_json() == fig.to_plotly_json()
+
+
+def test_eviction_keeps_sizes_consistent():
+    cache = FigureCache(max_entries=2)
+    figures = [
+        cache.get_or_build(("page", str(i), (), "v1"), lambda i=i: _figure([i, 1]))
+        for i in range(3)
+    ]
+    stats = cache.stats()
+    assert stats["entries"] == 2 and stats["evictions"] == 1
+    assert cache.json_size(figures[0]) is None
+    assert stats["bytes"] == sum(cache.json_size(fig) for fig in figures[1:])
+
+
+def test_prune_removes_replaced_versions(tmp_path):
+    store = FigureStore(str(tmp_path))
+    keys = {
+        "courante": ("page", "a", (), "v2"),
+        "annees": ("page", "b", (), "v1-v2"),
+        "ancienne": ("page", "c", (), "v0"),
+        "melangee": ("page", "d", (), "v0-v2"),
+    }
+    for key in keys.values():
+        store.save(key, "null")
+    # Fichier d'avant le nommage par version
+    open(tmp_path / "0123abcd.json", "w").close()
+
+    assert store.prune({"v1", "v2"}) == 3
+    assert sorted(os.listdir(tmp_path)) == sorted(
+        os.path.basename(store.path(keys[name])) for name in ("courante", "annees")
+    )
@@ -0,0 +1,97 @@
+import glob
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+from conftest import write_csv
+from ina import loader, store
+from ina.schema import SCHEMA
+
+
+def _split(block, date):
+    """Lignes de `block` avant et à partir de `date` (jj/mm/aaaa)."""
+    day = pd.to_datetime(block["date"], dayfirst=True)
+    cut = day >= pd.to_datetime(date, dayfirst=True)
+    return block[~cut], block[cut]
+
+
+@pytest.fixture
+def appended(tmp_path, blocks):
+    """(jeu prolongé deux fois par ajout de lignes, jeu relu en entier, dossier)."""
+    head, middle = _split(blocks[2], "01/07/2009")
+    middle, tail = _split(middle, "01/10/2009")
+    path = str(tmp_path / "ina.csv")
+    write_csv(path, [*blocks[:2], head])
+    loader.load_dataset(path)
+    appends = loader.loader_stats()["appends"]
+    for rows in (middle, tail):
+        write_csv(path, [rows], mode="a")
+        # Date de modification distincte même sur un système de fichiers grossier
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        extended = loader.load_dataset(path)
+    # Les deux ajouts sont passés par `_extend`, pas par une relecture complète
+    assert loader.loader_stats()["appends"] == appends + 2
+
+    full_path = str(tmp_path / "complet.csv")
+    shutil.copy(path, full_path)
+    return extended, loader.load_dataset(full_path), tmp_path
+
+
+def test_append_matches_full_reload(appended):
+    extended, full, _ = appended
+    assert extended.sha1 == full.sha1
+    pd.testing.assert_frame_equal(extended.frame, full.frame, check_frame_type=False)
+    for by in (["Année"], ["chaine"], ["theme", "chaine"]):
+        pd.testing.assert_frame_equal(
+            extended.cube.query(by), full.cube.query(by), check_dtype=False
+        )
+    for granularity in ("jour", "mois", "annee"):
+        pd.testing.assert_frame_equal(
+            extended.series.query(granularity), full.series.query(granularity)
+        )
+    pd.testing.assert_frame_equal(
+        extended.time_index.window_sums("2009-06-01", "2009-12-31", by="theme"),
+        full.time_index.window_sums("2009-06-01", "2009-12-31", by="theme"),
+    )
+
+
+def test_append_changes_only_touched_years(appended):
+    extended, full, _ = appended
+    assert extended.year_versions[2009] == full.version
+    assert extended.year_versions[2007] == extended.year_versions[2008]
+    assert extended.year_versions[2008] != full.version
+
+
+@pytest.mark.skipif(not store.enabled(), reason="cache colonnaire sans pyarrow")
+def test_append_chains_columnar_deltas(appended):
+    extended, _, directory = appended
+    deltas = glob.glob(os.path.join(directory, "ina.*.delta.parquet"))
+    assert len(deltas) == 2
+    # Le cache (base + deltas) relit le même jeu que le CSV
+    cached = store.read_cache(extended.path, extended.sha1)
+    pd.testing.assert_frame_equal(
+        loader.sort_categories(cached)[list(SCHEMA)],
+        loader.read_ina_csv(extended.path),
+    )
+
+
+def test_shared_frames_are_read_only(dataset):
+    with pytest.raises(TypeError):
+        dataset.frame["x"] = 1
+    with pytest.raises(TypeError):
+        dataset.time_index.by_pair.loc[0, "duree"] = 0
+    with pytest.raises(TypeError):
+        dataset.cube.frame.drop(columns="duree", inplace=True)
+
+
+def test_filtered_shares_the_dataset(dataset):
+    by_date, by_pair = dataset.time_index.by_date, dataset.time_index.by_pair
+    filtered = dataset.filtered(chaines=["TF1", "Inconnue"], themes=["Sport"])
+    assert filtered.filters == {"chaine": ("TF1",), "theme": ("Sport",)}
+    assert filtered.frame is dataset.frame
+    assert dataset.time_index.by_date is by_date
+    assert dataset.time_index.by_pair is by_pair
+    assert filtered.labels("chaine") == ["TF1"]
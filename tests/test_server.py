@@ -0,0 +1,106 @@
+import http.client
+import json
+import threading
+
+import pytest
+
+from ina.server import QueryServer, etag_matches
+
+
+@pytest.fixture(scope="module")
+def server(dataset):
+    server = QueryServer(("127.0.0.1", 0), dataset.path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def get(server, path, headers=None):
+    connection = http.client.HTTPConnection(*server.server_address, timeout=30)
+    try:
+        connection.request("GET", path, headers=headers or {})
+        response = connection.getresponse()
+        return response.status, response.getheader("ETag"), response.read()
+    finally:
+        connection.close()
+
+
+def test_catalogue(server, dataset):
+    status, _, body = get(server, "/")
+    assert status == 200
+    body = json.loads(body)
+    assert body["version"] == dataset.version
+    assert body["requetes"]["serie"]["parametres"]["points"] == "positive_int"
+
+
+def test_etag_and_not_modified(server):
+    status, etag, body = get(server, "/par_annee?theme=Sport")
+    assert status == 200 and etag and json.loads(body)
+
+    for header in (etag, f"W/{etag}", f'"autre", {etag}', "*"):
+        status, same, body = get(
+            server, "/par_annee?theme=Sport", {"If-None-Match": header}
+        )
+        assert (status, same, body) == (304, etag, b"")
+
+    # Une autre requête, un autre format ou un ETag voisin ne valident pas le cache
+    for path in (
+        "/par_annee?theme=Culture-loisirs",
+        "/par_annee?theme=Sport&format=arrow",
+    ):
+        status, other, _ = get(server, path, {"If-None-Match": etag})
+        assert status == 200 and other != etag
+    status, _, _ = get(
+        server, "/par_annee?theme=Sport", {"If-None-Match": etag[:-2] + '"'}
+    )
+    assert status == 200
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "/par_annee?inconnu=1",
+        "/par_annee?format=xml",
+        "/evenement_par_chaine?date=2008-09-15&theme=Sport&mois_avant=-400",
+        "/evenement_par_theme?date=2008-09-15&mois_avant=-3&mois_apres=-3",
+        "/evenement_periodes?date=2008-09-15&chaine=TF1&mois_avant=1&mois_apres=1"
+        "&jours_pendant=60",
+        "/evenement_periodes?date=pas-une-date&chaine=TF1",
+        "/serie?points=-5",
+        "/serie?points=abc",
+        "/evenements_detectes?nombre=0",
+    ],
+)
+def test_invalid_parameters(server, path):
+    status, _, body = get(server, path)
+    assert status == 400
+    assert "erreur" in json.loads(body)
+
+
+def test_invalid_parameters_ignore_if_none_match(server):
+    # La validation passe avant la comparaison d'ETag
+    status, _, _ = get(server, "/serie?points=-5", {"If-None-Match": "*"})
+    assert status == 400
+
+
+def test_unknown_query(server):
+    status, _, _ = get(server, "/inconnue")
+    assert status == 404
+
+
+def test_event_aggregates_are_positive(server):
+    status, _, body = get(
+        server, "/evenement_periodes?date=2008-09-15&chaine=TF1&jours_pendant=10"
+    )
+    assert status == 200
+    rows = json.loads(body)
+    assert {row["periode"] for row in rows} == {"Avant", "Pendant", "Après"}
+    assert all(row["duree"] > 0 and row["nb_lignes"] > 0 for row in rows)
+
+
+def test_etag_matches():
+    assert not etag_matches("", '"abc"')
+    assert not etag_matches('"abcd", "xabc"', '"abc"')
+    assert etag_matches(' W/"abc" ', '"abc"')
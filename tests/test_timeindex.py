@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import sums
+from ina import queries
+from ina.timeindex import event_periods
+
+EVENT = "2008-09-15"
+
+
+def _indexed(result, by):
+    columns = ["duree", "nb_lignes", "nombre_sujets"]
+    return result.set_index(by)[columns].astype(np.int64).sort_index()
+
+
+def _periods(df, boundaries, labels):
+    """Étiquette de période de chaque ligne de `df`, ou NaN hors des bornes."""
+    days = df["date"].dt.normalize()
+    periode = pd.Series(pd.NA, index=df.index, dtype=object)
+    for i, label in enumerate(labels):
+        lo, hi = pd.Timestamp(boundaries[i]), pd.Timestamp(boundaries[i + 1])
+        inside = (days >= lo) & ((days <= hi) if i == len(labels) - 1 else (days < hi))
+        periode[inside] = label
+    return periode
+
+
+@pytest.mark.parametrize(
+    "where",
+    [{}, {"chaine": "TF1"}, {"chaine": ["TF1", "Arte"], "theme": ["Sport", "Santé"]}],
+)
+@pytest.mark.parametrize("days_during", [0, 10])
+def test_compare_periods_matches_groupby(dataset, where, days_during):
+    boundaries, labels = event_periods(EVENT, 3, 2, days_during)
+    result = dataset.time_index.compare_periods(boundaries, labels, by="theme", **where)
+
+    df = dataset.frame
+    for dim, value in where.items():
+        df = df[df[dim].isin([value] if isinstance(value, str) else value)]
+    df = df.assign(periode=_periods(df, boundaries, labels)).dropna(subset=["periode"])
+    expected = sums(df, ["periode", "theme"])
+    actual = _indexed(result.astype({"periode": str}), ["periode", "theme"])
+    pd.testing.assert_frame_equal(
+        actual, expected, check_index_type=False, check_names=False
+    )
+
+
+def test_window_sums_matches_groupby(dataset):
+    result = dataset.time_index.window_sums(
+        "2008-03-01", "2008-08-31", by="chaine", theme="Sport"
+    )
+    df = dataset.frame
+    df = df[
+        (df["date"] >= "2008-03-01")
+        & (df["date"] <= "2008-08-31")
+        & (df["theme"] == "Sport")
+    ]
+    pd.testing.assert_frame_equal(
+        _indexed(result, "chaine"),
+        sums(df, "chaine"),
+        check_index_type=False,
+        check_names=False,
+    )
+
+
+def test_inverted_window_is_empty(dataset):
+    result = dataset.time_index.window_sums("2008-12-15", "2008-06-15", by="theme")
+    assert result.empty
+    result = queries.evenement_par_theme(dataset, EVENT, mois_avant=0, mois_apres=0)
+    assert (result["nb_lignes"] > 0).all()
+
+
+def test_compare_periods_rejects_decreasing_boundaries(dataset):
+    with pytest.raises(ValueError):
+        dataset.time_index.compare_periods(
+            ["2008-06-01", "2008-03-01", "2008-09-01"], ["a", "b"], by="theme"
+        )
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"mois_avant": -1},
+        {"mois_apres": -3},
+        {"jours_pendant": -2},
+        # « Pendant » (± 60 jours) plus large que la fenêtre (± 1 mois)
+        {"mois_avant": 1, "mois_apres": 1, "jours_pendant": 60},
+    ],
+)
+def test_event_periods_rejects_invalid_windows(dataset, params):
+    with pytest.raises(ValueError):
+        queries.evenement_periodes(dataset, EVENT, "TF1", **params)
+
+
+def test_event_periods_without_before_period(dataset):
+    result = queries.evenement_periodes(dataset, EVENT, "TF1", mois_avant=0)
+    assert set(result["periode"]) == {"Après"}
+    assert (result[["duree", "nb_lignes", "nombre_sujets"]] > 0).all().all()
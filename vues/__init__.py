@@ -0,0 +1,79 @@
+"""Pages du dashboard, un module par page importé seulement quand elle est affichée.
+
+Les dépendances lourdes (pandas, Plotly, couche `ina`) sont importées par les
+modules de page : la page de présentation s'affiche sans les charger.
+
+Les pages de graphiques (celles qui déclarent `charts`) partagent les filtres
+globaux chaînes × thèmes de la barre latérale (`vues.commun.filtres_globaux`).
+
+Avec la variable d'environnement `INA_PROFILE=1`, ou `?profile=1` dans l'URL
+quand le serveur est lancé avec `INA_PROFILE=allow`, chaque exécution est
+profilée (`ina.profiling`) et son relevé affiché dans la barre latérale.
+
+La mémoire propre à chaque session (`vues.sessions`) est relevée à chaque
+exécution.
+"""
+
+import importlib
+import os
+import sys
+
+import streamlit as st
+
+from vues import sessions
+
+# Libellé affiché dans la navigation -> module de la page
+PAGES = {
+    "Présentation du Projet": "vues.presentation",
+    "Analyse Thématique": "vues.thematique",
+    "Sciences": "vues.sciences",
+    "Économie": "vues.economie",
+    "TF1": "vues.tf1",
+    "Analyse Médias": "vues.medias",
+    "Comparaison Thèmes": "vues.comparaison",
+}
+
+
+def profiling_requested():
+    value = os.environ.get("INA_PROFILE", "")
+    if value == "allow":
+        # Le paramètre d'URL n'est lu que si le serveur l'autorise
+        value = st.query_params.get("profile")
+    return value not in (None, "", "0")
+
+
+def render(page):
+    if not profiling_requested():
+        _render(page)
+        return
+
+    from ina import profiling
+    from vues.commun import afficher_profil
+
+    profile = profiling.start(page=page)
+    try:
+        _render(page)
+    finally:
+        record = profiling.finish(profile)
+    afficher_profil(record)
+
+
+def _render(page):
+    module = importlib.import_module(PAGES[page])
+    with sessions.suivi(page):
+        if hasattr(module, "charts"):
+            # Pages de graphiques : filtres globaux chaînes × thèmes
+            from vues.commun import filtres_globaux
+
+            with filtres_globaux():
+                module.render()
+        else:
+            module.render()
+
+    # Les compteurs des caches ne sont affichés qu'une fois la couche données
+    # chargée, pour ne pas l'importer depuis la page de présentation.
+    if "ina.loader" in sys.modules:
+        from vues.commun import afficher_caches
+
+        afficher_caches()
+        sessions.afficher_sessions()
@@ -0,0 +1,335 @@
+"""Outils partagés par les pages qui affichent des graphiques."""
+
+import contextlib
+import contextvars
+import logging
+import os
+import threading
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+
+import streamlit as st
+
+from ina import load_dataset, loader_stats, profiling
+from ina.figure_cache import FigureCache, figure_cache
+from ina.figure_payload import payload_size, slim
+
+logger = logging.getLogger(__name__)
+
+# (page, version du jeu de données) déjà précalculées ou en cours
+_precalculs = set()
+_precalculs_lock = threading.Lock()
+
+# id(figure du cache) -> (référence faible, figure allégée, octets bruts, octets envoyés)
+_allegees = {}
+_allegees_lock = threading.Lock()
+
+# Versions du jeu de données pour lesquelles le cache disque a été purgé
+_purges = set()
+_purges_lock = threading.Lock()
+
+# Threads qui construisent les figures des pages (`Graphiques`), communs à toutes
+# les sessions ; 0 : construction dans le thread du script, l'une après l'autre.
+# Au plus 4 par défaut : au-delà, les threads se disputent surtout le GIL
+CHART_WORKERS = int(os.environ.get("INA_CHART_WORKERS", min(4, os.cpu_count() or 1)))
+_pool = None
+_pool_lock = threading.Lock()
+
+# Filtres globaux de la session (`filtres_globaux`) : lus par `donnees` et `figure`,
+# y compris dans les threads de `Graphiques`, qui copient le contexte
+_filtres = contextvars.ContextVar("ina_filtres", default={})
+
+
+def donnees():
+    """Jeu de données partagé, ses requêtes restreintes aux filtres globaux de la session."""
+    dataset = load_dataset()
+    filtres = _filtres.get()
+    return dataset.filtered(**filtres) if filtres else dataset
+
+
+def garder_options(key, options):
+    """Retire de la sélection du widget `key` les valeurs qui ne sont plus dans `options`.
+
+    Une sélection qui devient vide est oubliée : le widget reprend sa valeur initiale.
+    """
+    selection = st.session_state.get(key)
+    if selection:
+        kept = [value for value in selection if value in options]
+        if not kept:
+            del st.session_state[key]
+        elif len(kept) != len(selection):
+            st.session_state[key] = kept
+
+
+def _choix_filtre(label, dimension, recherche, key):
+    garder_options(key, dimension.labels)
+    # Valeurs trouvées, plus celles déjà choisies : une recherche ne retire pas un choix
+    codes = set(dimension.search(recherche))
+    codes.update(dimension.codes(st.session_state.get(key, [])))
+    return st.multiselect(
+        label, dimension.decode(sorted(codes)), key=key, placeholder="Toutes"
+    )
+
+
+@contextlib.contextmanager
+def filtres_globaux():
+    """Filtres chaînes × thèmes de la barre latérale, appliqués à tous les graphiques de la page.
+
+    La recherche (début des mots, sans accents ni majuscules) réduit les choix
+    proposés ; une liste vide ne filtre pas la dimension.
+    """
+    dimensions = load_dataset().dimensions
+    with st.sidebar.expander("🎚️ Filtres (chaînes × thèmes)"):
+        recherche = st.text_input(
+            "🔎 Rechercher",
+            key="filtre_recherche",
+            placeholder="ex. : sci tech, fran",
+        )
+        chaines = _choix_filtre(
+            "📺 Chaînes", dimensions.chaine, recherche, "filtre_chaines"
+        )
+        themes = _choix_filtre(
+            "🏷️ Thèmes", dimensions.theme, recherche, "filtre_themes"
+        )
+        if chaines or themes:
+            st.caption(
+                "Une page consacrée à une chaîne ou à un thème garde "
+                "sa chaîne ou son thème."
+            )
+    filtres = {"chaines": chaines, "themes": themes} if chaines or themes else {}
+    token = _filtres.set(filtres)
+    try:
+        yield
+    finally:
+        _filtres.reset(token)
+
+
+def _purger(dataset):
+    """Supprime du cache disque, une fois par version, les figures des versions remplacées."""
+    store = figure_cache.store
+    if store is None:
+        return
+    with _purges_lock:
+        if dataset.version in _purges:
+            return
+        _purges.add(dataset.version)
+        removed = store.prune({dataset.version, *dataset.year_versions.values()})
+    if removed:
+        logger.info("%d figure(s) d'anciennes versions supprimée(s)", removed)
+
+
+def figure(page, chart_id, build, years=None, **params):
+    """Figure `build(dataset, **params)`, mise en cache selon la page, le graphique et les widgets.
+
+    `years` (non transmis à `build`) restreint la clé aux versions de ces années :
+    un ajout de lignes d'autres années ne reconstruit pas la figure. `build`
+    reçoit le jeu restreint aux filtres globaux de la session (`donnees`).
+    """
+    with profiling.section(f"figure {chart_id}"):
+        dataset = donnees()
+        _purger(dataset)
+        if years is None:
+            version = dataset.version
+        else:
+            version = dataset.years_version(years)
+        key_params = params
+        if dataset.filters:
+            key_params = dict(params, filtres=tuple(dataset.filters.items()))
+        key = FigureCache.make_key(page, chart_id, key_params, version)
+        return figure_cache.get_or_build(key, lambda: build(dataset, **params))
+
+
+def precalculer(page, states):
+    """Construit en arrière-plan les figures de tous les états des sélecteurs de la page.
+
+    `states(dataset)` renvoie des (id, builder, years, paramètres) comme les
+    arguments de `figure` : une fois le thread terminé, bouger un sélecteur ne
+    fait plus qu'une lecture du cache de figures. Un seul précalcul par page et
+    par version du jeu de données, pour tout le processus.
+    """
+    dataset = load_dataset()
+    with _precalculs_lock:
+        if (page, dataset.version) in _precalculs:
+            return
+        _precalculs.add((page, dataset.version))
+
+    def run():
+        try:
+            for chart_id, build, years, params in states(dataset):
+                figure(page, chart_id, build, years=years, **params)
+        except Exception:
+            logger.exception("Précalcul des figures de %s interrompu", page)
+        else:
+            logger.info("Figures de %s précalculées", page)
+
+    threading.Thread(target=run, name=f"precalcul-{page}", daemon=True).start()
+
+
+def allegee(fig):
+    """(figure allégée, octets bruts, octets envoyés) de `fig`, calculés une fois par figure.
+
+    Les figures du cache sont partagées et jamais modifiées : la version allégée
+    (`ina.figure_payload.slim`) est gardée tant que la figure d'origine existe.
+    Les octets bruts sont ceux mesurés par le cache de figures, sans nouvelle
+    sérialisation quand la figure y est encore.
+    """
+    with _allegees_lock:
+        entry = _allegees.get(id(fig))
+    if entry is not None and entry[0]() is fig:
+        return entry[1:]
+
+    light = slim(fig)
+    key = id(fig)
+
+    def forget(ref):
+        with _allegees_lock:
+            if key in _allegees and _allegees[key][0] is ref:
+                del _allegees[key]
+
+    brut = figure_cache.json_size(fig)
+    if brut is None:
+        brut = payload_size(fig)
+    entry = (weakref.ref(fig, forget), light, brut, payload_size(light))
+    with _allegees_lock:
+        _allegees[key] = entry
+    return entry[1:]
+
+
+def _executor():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(CHART_WORKERS, thread_name_prefix="figures")
+        return _pool
+
+
+def _preparer(page, chart_id, build, years, params):
+    fig = figure(page, chart_id, build, years=years, **params)
+    if fig is not None:
+        # Allégée dans le même thread : l'affichage ne fait plus que l'envoyer
+        allegee(fig)
+    return fig
+
+
+class Graphiques:
+    """Figures d'une page construites en parallèle et affichées dès qu'elles sont prêtes.
+
+    Chaque `soumettre` confie la figure (agrégats, construction, allègement) au
+    pool de threads ; `emplacement` réserve sa place dans la mise en page ;
+    `afficher` remplit les emplacements dans l'ordre où les figures se terminent,
+    au lieu d'attendre chacune à son tour. Une figure en erreur affiche son
+    exception à sa place, sans empêcher les autres. Les builders ne doivent pas
+    appeler Streamlit : ils tournent hors du thread du script.
+    """
+
+    def __init__(self, page, states=()):
+        self.page = page
+        self._futures = {}
+        self._places = {}
+        for chart_id, build, years, params in states:
+            self.soumettre(chart_id, build, years, **params)
+
+    def soumettre(self, chart_id, build, years=None, **params):
+        """Lance la construction de la figure `chart_id` (mêmes arguments que `figure`)."""
+        args = (self.page, chart_id, build, years, params)
+        if CHART_WORKERS <= 0:
+            future = Future()
+            try:
+                future.set_result(_preparer(*args))
+            except Exception as exc:
+                future.set_exception(exc)
+        else:
+            # Copie du contexte : les sections du profilage restent dans le relevé
+            context = contextvars.copy_context()
+            future = _executor().submit(context.run, _preparer, *args)
+        self._futures[chart_id] = future
+
+    def emplacement(self, chart_id):
+        """Réserve, à cet endroit de la mise en page, la place du graphique `chart_id`."""
+        self._places[chart_id] = st.empty()
+
+    def afficher(self):
+        """Affiche chaque graphique dans son emplacement, dès que sa figure est prête."""
+        pending = {future: chart_id for chart_id, future in self._futures.items()}
+        for future in as_completed(pending):
+            chart_id = pending[future]
+            try:
+                fig = future.result()
+            except Exception as exc:
+                logger.exception("Graphique %s/%s en erreur", self.page, chart_id)
+                with self._places[chart_id]:
+                    st.exception(exc)
+                continue
+            if fig is not None:
+                with self._places[chart_id]:
+                    plotly_chart(fig)
+
+
+def plotly_chart(fig):
+    """`st.plotly_chart` sur toute la largeur, en JSON allégé, mesuré par le profilage.
+
+    Les octets envoyés (et ceux économisés par l'allègement) sont comptés par
+    graphique pour la session, et affichés dans la barre latérale.
+    """
+    title = fig.layout.title.text or "sans titre"
+    with profiling.section(f"affichage « {title[:40]} »"):
+        light, brut, envoye = allegee(fig)
+        st.plotly_chart(light, use_container_width=True)
+
+    volumes = st.session_state.setdefault("volumes_figures", {})
+    volume = volumes.setdefault(
+        title, {"affichages": 0, "brut_ko": 0.0, "envoye_ko": 0.0}
+    )
+    volume["affichages"] += 1
+    volume["brut_ko"] += brut / 1024
+    volume["envoye_ko"] += envoye / 1024
+
+
+def afficher_caches():
+    """Compteurs des caches et volume des figures de la session dans la barre latérale."""
+    with st.sidebar.expander("⚙️ Caches"):
+        stats = loader_stats()
+        st.caption(
+            f"Jeu de données : {stats['loads']} chargement(s), "
+            f"{stats['appends']} ajout(s), {stats['hits']} hit(s)"
+        )
+        stats = figure_cache.stats()
+        st.caption(
+            f"Figures : {stats['hits']} hit(s), {stats['misses']} miss, "
+            f"{stats['entries']} en cache ({stats['bytes'] / 2**20:.1f} Mo), "
+            f"{stats['evictions']} évincée(s)"
+        )
+        if figure_cache.store is not None:
+            st.caption(f"Figures relues sur disque : {stats['disk_loads']}")
+
+    volumes = st.session_state.get("volumes_figures")
+    if volumes:
+        with st.sidebar.expander("📦 Volume des figures (session)"):
+            brut = sum(v["brut_ko"] for v in volumes.values())
+            envoye = sum(v["envoye_ko"] for v in volumes.values())
+            st.caption(
+                f"{envoye:.0f} Ko envoyés pour {brut:.0f} Ko bruts : "
+                f"{brut - envoye:.0f} Ko économisés ({1 - envoye / brut:.0%})"
+            )
+            st.dataframe(
+                [
+                    {
+                        "graphique": title,
+                        "affichages": v["affichages"],
+                        "envoye_ko": round(v["envoye_ko"], 1),
+                        "economise_ko": round(v["brut_ko"] - v["envoye_ko"], 1),
+                    }
+                    for title, v in volumes.items()
+                ],
+                hide_index=True,
+            )
+
+
+def afficher_profil(record):
+    """Relevé de `ina.profiling` pour l'exécution qui vient de se terminer."""
+    with st.sidebar.expander("⏱️ Profil de l'exécution", expanded=True):
+        st.caption(
+            f"{record['total_ms']:.0f} ms, pic mémoire {record['pic_memoire_mo']:.1f} Mo "
+            f"— journal : {profiling.LOG_PATH}"
+        )
+        st.dataframe(record["sections"], hide_index=True)
@@ -0,0 +1,148 @@
+"""Page « Comparaison Thèmes » : évolution comparée de plusieurs thèmes."""
+
+import streamlit as st
+import plotly.express as px
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+from ina import queries
+from vues.commun import Graphiques, donnees, garder_options
+
+PAGE = "Comparaison Thèmes"
+
+
+def fig_comparaison_duree(data, themes):
+    df_duree = queries.par_annee_et_theme(data, themes=themes)
+
+    fig_duree = px.line(
+        df_duree,
+        x="Année",
+        y="duree_heures",
+        color="theme",
+        markers=True,
+        title="Évolution de la durée d’antenne",
+        labels={
+            "duree_heures": "Durée totale (en heures)",
+            "Année": "Année",
+            "theme": "Thème",
+        },
+    )
+    fig_duree.update_layout(template="plotly_white", hovermode="x unified")
+    return fig_duree
+
+
+def fig_comparaison_sujets(data, themes):
+    df_count = queries.par_annee_et_theme(data, themes=themes).rename(
+        columns={"nombre_sujets": "total_sujets", "nb_lignes": "nombre_sujets"}
+    )
+
+    fig_count = px.bar(
+        df_count,
+        x="Année",
+        y="nombre_sujets",
+        color="theme",
+        barmode="group",
+        title="Nombre de sujets par année",
+        labels={
+            "nombre_sujets": "Nombre de sujets",
+            "Année": "Année",
+            "theme": "Thème",
+        },
+    )
+    fig_count.update_layout(template="plotly_white")
+    return fig_count
+
+
+def fig_comparaison_top_chaines(data, themes):
+    # Une seule requête pour tous les thèmes, puis les 5 premières chaînes de chacun
+    top_chaines = (
+        queries.par_theme_et_chaine(data, themes=themes)
+        .sort_values(by=["theme", "duree_heures"], ascending=[True, False])
+        .groupby("theme", observed=True)
+        .head(5)
+    )
+    # Une trace par thème (et non par chaîne) : la figure reste légère avec 10+ thèmes
+    palette = px.colors.qualitative.Plotly
+    couleurs = {
+        chaine: palette[i % len(palette)]
+        for i, chaine in enumerate(data.cube.values("chaine"))
+    }
+    rows = -(-len(themes) // 2)
+    fig = make_subplots(
+        rows=rows,
+        cols=2 if len(themes) > 1 else 1,
+        subplot_titles=themes,
+        vertical_spacing=0.4 / rows,
+    )
+    for i, theme in enumerate(themes):
+        top = top_chaines[top_chaines["theme"] == theme]
+        fig.add_trace(
+            go.Bar(
+                x=top["chaine"].astype(str),
+                y=top["duree_heures"],
+                marker_color=[couleurs[c] for c in top["chaine"]],
+                name=theme,
+                hovertemplate="%{x} : %{y:.1f} h<extra>" + theme + "</extra>",
+            ),
+            row=i // 2 + 1,
+            col=i % 2 + 1,
+        )
+    fig.update_layout(
+        title="🏆 Top chaînes par thème",
+        showlegend=False,
+        height=150 + 300 * rows,
+    )
+    fig.update_yaxes(title_text="Durée totale (en heures)", col=1)
+    return fig
+
+
+def charts(data):
+    """Graphiques de la page aux valeurs par défaut des widgets : (id, builder, années, paramètres)."""
+    themes = data.labels("theme")[:2]
+    return [
+        ("duree", fig_comparaison_duree, None, {"themes": themes}),
+        ("sujets", fig_comparaison_sujets, None, {"themes": themes}),
+        ("top_chaines", fig_comparaison_top_chaines, None, {"themes": themes}),
+    ]
+
+
+def render():
+    st.title("🔍 Dashboard : Comparaison entre thèmes télévisés")
+
+    # 🎛️ Sélection des thèmes
+    all_themes = donnees().labels("theme")
+    garder_options("themes_compares", all_themes)
+    if "themes_compares" not in st.session_state:
+        st.session_state.themes_compares = all_themes[:2]
+    selected = st.multiselect(
+        "📌 Choisissez les thèmes à comparer",
+        all_themes,
+        key="themes_compares",
+    )
+    if not selected:
+        st.info("Choisissez au moins un thème.")
+        return
+    # Même clé de cache quel que soit l'ordre de sélection
+    themes = sorted(selected)
+
+    # Les trois graphiques sont construits en parallèle, puis affichés dès que prêts
+    graphiques = Graphiques(PAGE)
+    graphiques.soumettre("duree", fig_comparaison_duree, themes=themes)
+    graphiques.soumettre("sujets", fig_comparaison_sujets, themes=themes)
+    graphiques.soumettre("top_chaines", fig_comparaison_top_chaines, themes=themes)
+
+    # --------- Affichage côte à côte ---------
+    col_g1, col_g2 = st.columns(2)
+    with col_g1:
+        graphiques.emplacement("duree")
+    with col_g2:
+        graphiques.emplacement("sujets")
+
+    st.markdown("---")
+
+    # ---------- GRAPHIQUE 3 : Classement des chaînes ----------
+    st.subheader("📺 Classement des chaînes par durée pour chaque thème")
+
+    graphiques.emplacement("top_chaines")
+
+    graphiques.afficher()
@@ -0,0 +1,135 @@
+"""Page « Économie » : focus sur le thème Économie."""
+
+import streamlit as st
+import plotly.express as px
+
+from ina import queries
+from vues.commun import Graphiques, donnees
+
+PAGE = "Économie"
+
+
+def fig_economie_scatter(data):
+    df_scatter = queries.par_chaine(data, theme="Economie").rename(
+        columns={"duree_heures": "total_duree", "nombre_sujets": "nb_sujets"}
+    )
+
+    fig1 = px.scatter(
+        df_scatter,
+        x="nb_sujets",
+        y="total_duree",
+        text="chaine",
+        size="total_duree",
+        color="chaine",
+        labels={
+            "nb_sujets": "Nombre de sujets",
+            "total_duree": "Durée totale (en heures)",
+            "chaine": "Chaîne",
+        },
+        title="Nombre de sujets vs Durée totale par chaîne (Économie)",
+    )
+    fig1.update_traces(textposition="top center")
+    fig1.update_layout(template="plotly_white", hovermode="closest")
+    return fig1
+
+
+def fig_economie_duree_moyenne(data):
+    df2 = queries.par_annee(data, theme="Economie").rename(
+        columns={"duree": "duree_totale", "duree_moyenne": "duree"}
+    )
+    return px.bar(
+        df2,
+        x="Année",
+        y="duree",
+        title="Durée moyenne par sujet économique",
+        labels={"duree": "Durée moyenne (s)", "Année": "Année"},
+    )
+
+
+def fig_economie_repartition(data):
+    df3 = queries.par_chaine(data, theme="Economie")
+    return px.pie(
+        df3,
+        names="chaine",
+        values="duree",
+        title="Répartition des sujets économiques par chaîne",
+    )
+
+
+def fig_economie_classement(data):
+    df4 = queries.par_chaine(data, theme="Economie").sort_values(
+        by="duree_heures", ascending=True
+    )
+    return px.bar(
+        df4,
+        x="duree_heures",
+        y="chaine",
+        orientation="h",
+        title="Durée totale d'antenne par chaîne (Économie)",
+        labels={"duree_heures": "Durée totale (en heures)", "chaine": "Chaîne"},
+        color="duree_heures",
+        color_continuous_scale="Viridis",
+    )
+
+
+def fig_economie_top_chaines(data):
+    df4 = queries.par_chaine(data, theme="Economie").sort_values(
+        by="duree_heures", ascending=True
+    )
+    df5 = queries.par_chaine_et_annee(data, theme="Economie")
+    top_chaines = df4["chaine"].tail(5).tolist()
+    df_top = df5[df5["chaine"].isin(top_chaines)]
+
+    fig5 = px.line(
+        df_top,
+        x="Année",
+        y="duree_heures",
+        color="chaine",
+        markers=True,
+        title="Évolution annuelle des chaînes les plus actives (Économie)",
+        labels={
+            "duree_heures": "Durée totale (en heures)",
+            "Année": "Année",
+            "chaine": "Chaîne",
+        },
+    )
+    fig5.update_layout(template="plotly_white", hovermode="x unified")
+    return fig5
+
+
+def charts(data):
+    """Graphiques de la page aux valeurs par défaut des widgets : (id, builder, années, paramètres)."""
+    return [
+        ("scatter", fig_economie_scatter, None, {}),
+        ("duree_moyenne", fig_economie_duree_moyenne, None, {}),
+        ("repartition", fig_economie_repartition, None, {}),
+        ("classement", fig_economie_classement, None, {}),
+        ("top_chaines", fig_economie_top_chaines, None, {}),
+    ]
+
+
+def render():
+    st.title("💼 Dashboard : Couverture du thème Économie")
+
+    # Les cinq graphiques sont construits en parallèle, puis affichés dès que prêts
+    graphiques = Graphiques(PAGE, charts(donnees()))
+
+    # --------- Affichage ligne 1 ---------
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        graphiques.emplacement("scatter")
+    with col2:
+        graphiques.emplacement("duree_moyenne")
+    with col3:
+        graphiques.emplacement("repartition")
+
+    st.markdown("---")
+
+    # --------- Affichage ligne 2 ---------
+    col4, col5 = st.columns(2)
+    with col4:
+        graphiques.emplacement("classement")
+    with col5:
+        graphiques.emplacement("top_chaines")
+
+    graphiques.afficher()
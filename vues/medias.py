@@ -0,0 +1,267 @@
+"""Page « Analyse Médias » : couverture des événements majeurs par média.
+
+Aux événements majeurs s'ajoutent les pics de couverture détectés dans
+l'historique quotidien (`ina.spikes`) : un même thème en forte hausse sur
+plusieurs chaînes à quelques jours d'intervalle.
+"""
+
+import streamlit as st
+import plotly.express as px
+
+from ina import queries
+from ina.timeindex import event_periods
+from vues.commun import Graphiques, donnees
+
+PAGE = "Analyse Médias"
+
+# 📅 Dictionnaire des événements majeurs
+EVENEMENTS_MAJEURS = {
+    "Attentats du 11 septembre": "2001-09-11",
+    "Crise financière de 2008": "2008-09-15",
+    "Élection présidentielle France 2017": "2017-05-07",
+    "Covid-19 (début OMS)": "2020-03-11",
+    "Gilets Jaunes France": "2018-11-17",
+    "COP21 (Accord de Paris)": "2015-12-12",
+}
+
+#  Associer chaque événement à une thématique clé
+THEME_EVENEMENT = {
+    "Attentats du 11 septembre": "International",
+    "Crise financière de 2008": "Économie",
+    "Élection présidentielle France 2017": "Politique France",
+    "Covid-19 (début OMS)": "Santé",
+    "Gilets Jaunes France": "Société",
+    "COP21 (Accord de Paris)": "Environnement",
+}
+
+
+def evenements(data):
+    """Événements proposés : nom -> (date, thématique associée).
+
+    Les événements majeurs d'abord, puis les pics détectés, du plus marqué au
+    moins marqué.
+    """
+    liste = {
+        event: (date, THEME_EVENEMENT[event])
+        for event, date in EVENEMENTS_MAJEURS.items()
+    }
+    for pic in queries.evenements_detectes(data).itertuples():
+        nom = f"📈 Pic « {pic.theme} » du {pic.date:%d/%m/%Y} ({pic.chaines} chaînes)"
+        liste[nom] = (f"{pic.date:%Y-%m-%d}", pic.theme)
+    return liste
+
+
+def fig_evenement_media(data, event, media, mois_avant, mois_apres, jours_pendant):
+    date, _ = evenements(data)[event]
+
+    # Durée par période (avant / [pendant] / après) et par thème pour le média
+    df_event_time = queries.evenement_periodes(
+        data, date, media, mois_avant, mois_apres, jours_pendant
+    )
+
+    # Graphique
+    fig_event = px.bar(
+        df_event_time,
+        x="periode",
+        y="duree_heures",
+        color="theme",
+        title=f"Couverture de '{event}' sur {media}",
+        labels={
+            "periode": "Période",
+            "duree": "Durée totale (s)",
+            "theme": "Thème",
+        },
+        text_auto=".2s",
+        barmode="stack",
+    )
+
+    fig_event.update_layout(
+        template="plotly_white",
+        xaxis_title="Période",
+        yaxis_title="Durée totale (en heures)",
+        yaxis=dict(gridcolor="lightgrey"),
+        legend_title="Thème",
+    )
+    return fig_event
+
+
+def fig_evenement_theme_chaines(data, event, mois_avant, mois_apres):
+    date, theme_associe = evenements(data)[event]
+
+    # Durée par chaîne sur la période, pour la thématique associée
+    df_theme_par_chaine = queries.evenement_par_chaine(
+        data, date, theme_associe, mois_avant, mois_apres
+    )
+    df_theme_par_chaine = df_theme_par_chaine.sort_values(
+        by="duree_heures", ascending=False
+    )
+
+    # Graphe
+    fig_theme_chaine = px.bar(
+        df_theme_par_chaine,
+        x="chaine",
+        y="duree_heures",
+        title=f"Durée d’exposition au thème '{theme_associe}' autour de l’événement '{event}'",
+        labels={"chaine": "Chaîne", "duree": "Durée totale (en heures)"},
+        color="chaine",
+        color_discrete_sequence=px.colors.qualitative.Set2,
+    )
+
+    fig_theme_chaine.update_layout(
+        template="plotly_white",
+        yaxis_title="Durée totale (en heures)",
+        xaxis_title="Chaîne TV",
+        yaxis=dict(gridcolor="lightgrey"),
+        showlegend=False,
+    )
+    return fig_theme_chaine
+
+
+def fig_evenement_themes_dominants(data, event, mois_avant, mois_apres):
+    date, _ = evenements(data)[event]
+
+    # Durée par thème sur la même période que les autres graphiques
+    df_theme_duree = queries.evenement_par_theme(data, date, mois_avant, mois_apres)
+    df_theme_duree = df_theme_duree.sort_values(by="duree_heures", ascending=False)
+
+    # Graphique à barres (top 10)
+    fig_theme_bar = px.bar(
+        df_theme_duree.head(10),
+        x="theme",
+        y="duree_heures",
+        title=f"Thèmes dominants autour de '{event}' (toutes chaînes)",
+        labels={"theme": "Thème", "duree_heures": "Durée totale (en heures)"},
+        color="theme",
+        color_discrete_sequence=px.colors.qualitative.Set3,
+    )
+
+    fig_theme_bar.update_layout(
+        template="plotly_white",
+        xaxis_title="Thème",
+        yaxis_title="Durée totale d’antenne (en heures)",
+        yaxis=dict(gridcolor="lightgrey"),
+        xaxis=dict(tickangle=30),
+        showlegend=False,
+    )
+    return fig_theme_bar
+
+
+def annees_fenetre(date, mois_avant, mois_apres):
+    """Années couvertes par les fenêtres autour de l'événement du `date`.
+
+    Les graphiques n'en dépendent pas d'autres : un ajout de lignes d'autres
+    années ne les reconstruit pas.
+    """
+    bornes, _ = event_periods(date, mois_avant, mois_apres)
+    return range(bornes[0].year, bornes[-1].year + 1)
+
+
+def _states(event, date, medias):
+    fenetres = {"event": event, "mois_avant": 6, "mois_apres": 6}
+    annees = annees_fenetre(date, 6, 6)
+    states = [
+        (
+            "evenement_media",
+            fig_evenement_media,
+            annees,
+            dict(fenetres, media=media, jours_pendant=0),
+        )
+        for media in medias
+    ]
+    states.append(("theme_chaines", fig_evenement_theme_chaines, annees, fenetres))
+    states.append(
+        ("themes_dominants", fig_evenement_themes_dominants, annees, fenetres)
+    )
+    return states
+
+
+def charts(data):
+    """Graphiques de la page aux valeurs par défaut des widgets : (id, builder, années, paramètres)."""
+    event, date = next(iter(EVENEMENTS_MAJEURS.items()))
+    return _states(event, date, data.values("chaine")[:1])
+
+
+def selector_states(data):
+    """Chaque événement (pics détectés compris) × chaque média, fenêtres par défaut."""
+    states = []
+    for event, (date, _) in evenements(data).items():
+        states.extend(_states(event, date, data.values("chaine")))
+    return states
+
+
+def render():
+    st.title("🎬 Dashboard : Analyse par Média")
+
+    data = donnees()
+    liste = evenements(data)
+
+    # Sélection des filtres (affichés en bas mais déclarés ici)
+    col_ev, col_med = st.columns([2, 1])
+
+    with col_ev:
+        selected_event = st.selectbox(
+            "🗓️ Sélectionnez un événement :",
+            list(liste.keys()),
+            key="event_selector",
+            help="Les événements 📈 sont des pics de couverture détectés "
+            "sur plusieurs chaînes dans les données quotidiennes.",
+        )
+
+    with col_med:
+        selected_media = st.selectbox(
+            "📺 Sélectionnez un média :",
+            data.values("chaine"),
+            key="media_selector",
+        )
+
+    # Fenêtres de comparaison autour de l'événement
+    with st.expander("⚙️ Fenêtres de comparaison"):
+        col_av, col_pe, col_ap = st.columns(3)
+        with col_av:
+            mois_avant = st.slider("Mois avant", 1, 24, 6, key="mois_avant")
+        with col_pe:
+            jours_pendant = st.slider(
+                "Période « Pendant » (± jours, 0 = aucune)",
+                0,
+                15,
+                0,
+                key="jours_pendant",
+            )
+        with col_ap:
+            mois_apres = st.slider("Mois après", 1, 24, 6, key="mois_apres")
+
+    annees = annees_fenetre(liste[selected_event][0], mois_avant, mois_apres)
+
+    # Les trois graphiques sont construits en parallèle, puis affichés dès que prêts
+    graphiques = Graphiques(PAGE)
+    fenetre = dict(event=selected_event, mois_avant=mois_avant, mois_apres=mois_apres)
+    graphiques.soumettre(
+        "evenement_media",
+        fig_evenement_media,
+        years=annees,
+        media=selected_media,
+        jours_pendant=jours_pendant,
+        **fenetre,
+    )
+    graphiques.soumettre(
+        "theme_chaines", fig_evenement_theme_chaines, years=annees, **fenetre
+    )
+    graphiques.soumettre(
+        "themes_dominants", fig_evenement_themes_dominants, years=annees, **fenetre
+    )
+
+    # Création des colonnes de visualisation
+    col1, col2 = st.columns(2)
+
+    with col1:
+        graphiques.emplacement("evenement_media")
+
+    with col2:
+        graphiques.emplacement("theme_chaines")
+
+        col3, col4 = st.columns(2)
+
+        with col3:
+            graphiques.emplacement("themes_dominants")
+
+    graphiques.afficher()
@@ -0,0 +1,111 @@
+"""Préchauffe les figures de toutes les pages avant l'arrivée des visiteurs.
+
+Charge le jeu de données, puis construit en parallèle (pool de processus) les
+figures de chaque page aux valeurs par défaut des widgets (`charts`) et, quand
+la page les déclare, pour tous les états de ses sélecteurs (`selector_states` :
+chaque année, chaque thème et chaque granularité de l'Analyse Thématique, chaque
+événement (pics détectés compris) × chaque média de l'Analyse Médias). Les
+figures sont écrites dans le cache disque (`ina.figure_cache.FigureStore`) que
+relisent les processus Streamlit lancés avec le même `INA_FIGURE_DIR` ; celles
+des versions précédentes du CSV en sont d'abord supprimées (`--clean` : toutes).
+
+À lancer depuis le répertoire du dashboard, après un déploiement ou une mise à
+jour du CSV. Affiche la durée totale et le coût de chaque page.
+
+Usage : python -m vues.prechauffage [--dir DOSSIER] [--workers N] [--clean]
+"""
+
+import argparse
+import glob
+import importlib
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import vues
+from ina import load_dataset
+from ina.figure_cache import FigureCache, FigureStore, figure_cache
+from vues.commun import figure
+
+# Nombre de figures par tâche : les grosses pages sont réparties entre processus
+TASK_SIZE = 8
+
+
+def page_states(module, data):
+    """États à préchauffer d'une page, sans doublon : (id, builder, années, paramètres)."""
+    states = list(module.charts(data))
+    if hasattr(module, "selector_states"):
+        states.extend(module.selector_states(data))
+    unique = {}
+    for chart_id, build, years, params in states:
+        key = FigureCache.make_key(chart_id, build.__name__, params, None)
+        unique.setdefault((key, tuple(years or ())), (chart_id, build, years, params))
+    return list(unique.values())
+
+
+def _init(directory):
+    figure_cache.store = FigureStore(directory)
+
+
+def _prewarm(label, part, parts):
+    module = importlib.import_module(vues.PAGES[label])
+    data = load_dataset()
+    states = page_states(module, data)[part::parts]
+    start = time.perf_counter()
+    for chart_id, build, years, params in states:
+        figure(module.PAGE, chart_id, build, years=years, **params)
+    return label, len(states), time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dir", default=os.environ.get("INA_FIGURE_DIR"))
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument(
+        "--clean", action="store_true", help="vider le cache disque avant de commencer"
+    )
+    args = parser.parse_args()
+    if not args.dir:
+        parser.error("--dir ou INA_FIGURE_DIR est requis")
+
+    start = time.perf_counter()
+    # Chargé avant de créer le pool : les processus fils en héritent
+    data = load_dataset()
+    load_seconds = time.perf_counter() - start
+    store = FigureStore(args.dir)
+    if args.clean:
+        for path in glob.glob(os.path.join(args.dir, "*.json")):
+            os.remove(path)
+    else:
+        removed = store.prune({data.version, *data.year_versions.values()})
+        print(f"Figures d'anciennes versions supprimées : {removed}")
+
+    tasks = []
+    for label, module_name in vues.PAGES.items():
+        module = importlib.import_module(module_name)
+        if hasattr(module, "charts"):
+            parts = -(-len(page_states(module, data)) // TASK_SIZE)
+            tasks.extend((label, part, parts) for part in range(parts))
+
+    costs = {}
+    with ProcessPoolExecutor(
+        max_workers=args.workers, initializer=_init, initargs=(args.dir,)
+    ) as pool:
+        futures = [pool.submit(_prewarm, *task) for task in tasks]
+        for future in futures:
+            label, count, seconds = future.result()
+            total = costs.setdefault(label, [0, 0.0])
+            total[0] += count
+            total[1] += seconds
+
+    print(f"Chargement du jeu de données : {load_seconds:.2f} s")
+    for label, (count, seconds) in costs.items():
+        print(f"{label:<25} {count:>4} figure(s) {seconds:>8.2f} s")
+    print(
+        f"Total : {sum(c for c, _ in costs.values())} figure(s) en "
+        f"{time.perf_counter() - start:.2f} s avec {args.workers} processus"
+    )
+
+
+if __name__ == "__main__":
+    main()
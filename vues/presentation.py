@@ -0,0 +1,18 @@
+"""Page « Présentation du Projet » : texte seul, sans accès au jeu de données."""
+
+import streamlit as st
+
+
+def render():
+    st.markdown(
+        "Bienvenue sur notre projet, réalisé dans le cadre de l'initiative Open Data University, un programme porté par l'association Latitudes pour encourager l'utilisation des données ouvertes au service de la société. \n\n"
+        "Notre travail s'inscrit dans le défi *Les Françaises et Français et l audiovisuel*, avec pour objectif d’analyser l’évolution des thématiques abordées à la télévision au fil du temps. \n\n"
+        "Vous pouvez en apprendre plus sur Open Data University [**ici**](https://defis.data.gouv.fr/opendatauniversity). \n\n"
+        "Vous pouvez retrouver différents dashboards dans ce projet : \n\n"
+        "- Analyse thématique : Permet d'avoir une vue d'ensemble afin d'analyser les thèmes avec possibilité de filtre un thème spécifique \n\n"
+        "- Sciences : Focus sur le thème Sciences et techniques \n\n"
+        "- Économie : Focus sur le thème Économie \n\n"
+        "- TF1 : Focus sur la chaîne de télévision TF1 \n\n"
+        "- Analyse Médias : Focus sur des évènements majeurs et leur impact sur la diffusion de leur thème \n\n"
+        "- Comparaison thèmes : Permet de comparer plusieurs thèmes afin de voir leurs différentes évolutions"
+    )
@@ -0,0 +1,168 @@
+"""Page « Sciences » : focus sur le thème Sciences et techniques."""
+
+import streamlit as st
+import plotly.express as px
+
+from ina import queries
+from vues.commun import Graphiques, donnees
+
+PAGE = "Sciences"
+
+
+def fig_sciences_duree_moyenne(data):
+    df_sciences_avg_duration = queries.par_annee(
+        data, theme="Sciences et techniques"
+    ).rename(columns={"duree_moyenne": "duree_moyenne_secondes"})
+
+    fig = px.bar(
+        df_sciences_avg_duration,
+        x="Année",
+        y="duree_moyenne_secondes",
+        title="Durée moyenne des reportages sur le theme 'Sciences'",
+    )
+
+    fig.update_layout(
+        xaxis_title="Année",
+        yaxis_title="Durée moyenne (en secondes)",
+        template="plotly_white",
+    )
+    return fig
+
+
+def fig_sciences_2000_2020(data):
+    df_st_grouped = queries.par_chaine_et_annee(
+        data, theme="Sciences et techniques", annees=[2000, 2020]
+    ).rename(columns={"duree_heures": "duree_totale_heures"})
+
+    df_st_grouped["Année"] = df_st_grouped["Année"].astype(
+        str
+    )  ## Passer en str pour ne plus avoir la légende en dégradé et les barres cote à cote
+
+    fig = px.bar(
+        df_st_grouped,
+        x="chaine",
+        y="duree_totale_heures",
+        color="Année",
+        barmode="group",
+        title="Comparaison du temps d'antenne du thème 'Sciences' en 2000 et 2020",
+        color_discrete_map={
+            "2000": "blue",
+            "2020": "red",
+        },
+    )
+
+    fig.update_layout(
+        xaxis_title="Chaîne TV",
+        yaxis_title="Durée totale des reportages (en heures)",
+        template="plotly_white",
+        xaxis=dict(tickangle=45),
+        legend_title="Année",  # Titre de la légende
+    )
+    return fig
+
+
+def fig_sciences_chaines(data):
+    df_sciences_chaines = queries.par_chaine(
+        data, theme="Sciences et techniques"
+    ).rename(columns={"duree": "duree_totale"})
+
+    return px.pie(
+        df_sciences_chaines,
+        names="chaine",
+        values="duree_totale",
+        title="Répartition du temps d'antenne du theme 'Sciences' par chaine",
+        color_discrete_sequence=px.colors.qualitative.Set3,
+    )
+
+
+def fig_sciences_duree_totale(data):
+    df_sciences_grouped = queries.par_annee(
+        data, theme="Sciences et techniques"
+    ).rename(columns={"duree_heures": "duree_totale_heures"})
+
+    # Création du graphique interactif avec Plotly Express
+    fig = px.line(
+        df_sciences_grouped,
+        x="Année",
+        y="duree_totale_heures",
+        markers=True,  # Ajoute des marqueurs sur la ligne
+        line_shape="linear",
+        title="Évolution de la durée d'apparition du theme Sciences",
+    )
+
+    # Personnalisation du style
+    fig.update_traces(line=dict(color="blue"))  # Définir la couleur de la ligne
+    fig.update_layout(
+        xaxis_title="Année",
+        yaxis_title="Durée totale des reportages (en heures)",
+        xaxis=dict(dtick=2),  # Un tick tous les 2 ans
+        template="plotly_white",  # Fond blanc plus moderne
+    )
+    return fig
+
+
+def fig_sciences_reportages(data):
+    df_sciences_count = queries.par_annee(data, theme="Sciences et techniques").rename(
+        columns={"nb_lignes": "Nombre de reportages"}
+    )
+
+    # Création du graphique interactif avec Plotly Express
+    fig = px.line(
+        df_sciences_count,
+        x="Année",
+        y="Nombre de reportages",
+        markers=True,  # Ajoute des marqueurs sur la ligne
+        line_shape="linear",
+        title="Évolution du nombre de reportages sur le theme Sciences",
+    )
+
+    # Personnalisation du style
+    fig.update_traces(line=dict(color="green"))  # Définir la couleur de la ligne
+    fig.update_layout(
+        xaxis_title="Année",
+        yaxis_title="Nombre de reportages",
+        xaxis=dict(dtick=2),  # Un tick tous les 2 ans
+        template="plotly_white",  # Fond blanc plus moderne
+    )
+    return fig
+
+
+def charts(data):
+    """Graphiques de la page aux valeurs par défaut des widgets : (id, builder, années, paramètres)."""
+    return [
+        ("duree_moyenne", fig_sciences_duree_moyenne, None, {}),
+        ("2000_2020", fig_sciences_2000_2020, [2000, 2020], {}),
+        ("chaines", fig_sciences_chaines, None, {}),
+        ("duree_totale", fig_sciences_duree_totale, None, {}),
+        ("reportages", fig_sciences_reportages, None, {}),
+    ]
+
+
+def render():
+    st.title("Dashboard : Analyse de l'évolution du thème Sciences à la télévision")
+
+    # Les cinq graphiques sont construits en parallèle, puis affichés dès que prêts
+    graphiques = Graphiques(PAGE, charts(donnees()))
+
+    col11, col12, col13 = st.columns(3)
+
+    with col11:
+        graphiques.emplacement("duree_moyenne")
+
+    with col12:
+        graphiques.emplacement("2000_2020")
+
+    with col13:
+        graphiques.emplacement("chaines")
+
+    st.markdown("---")
+
+    col21, col22 = st.columns(2)
+
+    with col21:
+        graphiques.emplacement("duree_totale")
+
+    with col22:
+        graphiques.emplacement("reportages")
+
+    graphiques.afficher()
@@ -0,0 +1,204 @@
+"""Mémoire par session Streamlit, pour repérer les sessions et les pages gourmandes.
+
+Le jeu de données et les caches de figures sont communs au processus ; ce qui
+reste propre à une session est relevé à chaque exécution de sa page (`suivi`) :
+
+- `etat_ko` : taille estimée de son `st.session_state` (widgets, volumes des
+  figures...), qui vit aussi longtemps que la session ;
+- `pic_processus_mo` : pic des allocations du processus pendant l'exécution,
+  au-dessus de la mémoire de départ, quand `tracemalloc` est actif (profilage,
+  ou `INA_MEMOIRE_SESSIONS=1` qui ralentit les allocations). `tracemalloc` ne
+  distingue pas les threads : le pic n'est retenu que pour une exécution qui a
+  tourné seule, et n'est jamais remis à zéro pendant qu'une exécution profilée
+  d'une autre session (`ina.profiling`) le mesure ;
+- `gc_ms` : temps passé par le ramasse-miettes dans les collectes déclenchées
+  par les threads de la session (ceux de `vues.commun.Graphiques` compris).
+
+Les sessions fermées sont oubliées ; `afficher_sessions` montre toutes les
+sessions ouvertes du processus, les plus gourmandes en tête.
+"""
+
+import contextlib
+import contextvars
+import gc
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+import streamlit as st
+from streamlit import runtime
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+TRACE = os.environ.get("INA_MEMOIRE_SESSIONS") not in (None, "", "0")
+# Sans runtime Streamlit (tests), une session sans exécution depuis une heure est oubliée
+RETENTION = 3600
+
+_sessions = {}
+# Réentrant : une collecte (`_gc`) peut survenir pendant que le thread le détient
+_lock = threading.RLock()
+# Relevé de la session dont le thread courant exécute le code
+_current = contextvars.ContextVar("ina_session", default=None)
+_gc_start = threading.local()
+# Exécutions suivies en cours : {id: vrai tant qu'aucune autre n'a démarré}
+_en_cours = {}
+
+
+def taille(value, seen=None):
+    """Octets estimés de `value` et de son contenu (un objet vu deux fois compte une fois)."""
+    seen = set() if seen is None else seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    if hasattr(value, "memory_usage"):
+        # DataFrame (une valeur par colonne) ou Series
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum() if hasattr(usage, "sum") else usage)
+    if hasattr(value, "nbytes"):
+        return int(value.nbytes)
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(taille(k, seen) + taille(v, seen) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(taille(v, seen) for v in value)
+    return size
+
+
+def _profils():
+    """(exécutions profilées en cours, dont celle du thread courant) selon `ina.profiling`.
+
+    Lu dans `sys.modules` : la page de présentation n'importe pas la couche `ina`.
+    """
+    profiling = sys.modules.get("ina.profiling")
+    if profiling is None:
+        return 0, 0
+    return profiling.running(), 1 if profiling.enabled() else 0
+
+
+def _gc(phase, info):
+    if phase == "start":
+        _gc_start.value = time.perf_counter()
+        return
+    record = _current.get()
+    start = getattr(_gc_start, "value", None)
+    if record is None or start is None:
+        return
+    with _lock:
+        record["gc_ms"] += (time.perf_counter() - start) * 1000
+
+
+gc.callbacks.append(_gc)
+
+
+@contextlib.contextmanager
+def suivi(page):
+    """Relève la mémoire de la session courante pendant l'exécution de `page`."""
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        yield
+        return
+    if TRACE and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    with _lock:
+        record = _sessions.setdefault(
+            ctx.session_id,
+            {
+                "page": page,
+                "executions": 0,
+                "etat_ko": 0.0,
+                "pic_mo": None,
+                "pic_max_mo": None,
+                "gc_ms": 0.0,
+                "derniere": time.time(),
+            },
+        )
+    token = _current.set(record)
+    # L'exécution profilée de cette session, s'il y en a une, a déjà remis le pic à zéro
+    run = object()
+    with _lock:
+        tracing = tracemalloc.is_tracing()
+        profils, propre = _profils()
+        seule = not _en_cours and profils == propre
+        for other in _en_cours:
+            _en_cours[other] = False
+        _en_cours[run] = seule
+        if tracing:
+            if seule and not propre:
+                tracemalloc.reset_peak()
+            memory = tracemalloc.get_traced_memory()[0]
+    try:
+        yield
+    finally:
+        _current.reset(token)
+        with _lock:
+            seule = _en_cours.pop(run) and _profils()[0] == propre
+            peak = None
+            if seule and tracing and tracemalloc.is_tracing():
+                peak = (tracemalloc.get_traced_memory()[1] - memory) / 2**20
+        state = taille(st.session_state.to_dict()) / 1024
+        with _lock:
+            record["page"] = page
+            record["executions"] += 1
+            record["etat_ko"] = state
+            record["derniere"] = time.time()
+            if peak is not None:
+                record["pic_mo"] = peak
+                record["pic_max_mo"] = max(peak, record["pic_max_mo"] or 0)
+
+
+def sessions():
+    """Relevés des sessions ouvertes : {identifiant de session: relevé}."""
+    now = time.time()
+    with _lock:
+        for session_id in list(_sessions):
+            if runtime.exists():
+                closed = not runtime.get_instance().is_active_session(session_id)
+            else:
+                closed = now - _sessions[session_id]["derniere"] > RETENTION
+            if closed:
+                del _sessions[session_id]
+        return {session_id: dict(record) for session_id, record in _sessions.items()}
+
+
+def afficher_sessions():
+    """Mémoire des sessions ouvertes du processus dans la barre latérale."""
+    releves = sessions()
+    if not releves:
+        return
+    ctx = get_script_run_ctx()
+    courante = ctx.session_id if ctx is not None else None
+    lignes = sorted(
+        releves.items(),
+        key=lambda item: (item[1]["pic_max_mo"] or 0, item[1]["etat_ko"]),
+        reverse=True,
+    )
+    with st.sidebar.expander(f"🧠 Mémoire par session ({len(lignes)})"):
+        if not any(r["pic_max_mo"] is not None for r in releves.values()):
+            st.caption(
+                "Pics d'allocation non mesurés : profilage ou INA_MEMOIRE_SESSIONS=1,"
+                " et seulement pour les exécutions sans concurrence"
+            )
+        st.dataframe(
+            [
+                {
+                    "session": session_id[:8]
+                    + (" (vous)" if session_id == courante else ""),
+                    "page": r["page"],
+                    "executions": r["executions"],
+                    "etat_ko": round(r["etat_ko"], 1),
+                    "pic_processus_mo": (
+                        None if r["pic_mo"] is None else round(r["pic_mo"], 1)
+                    ),
+                    "pic_processus_max_mo": (
+                        None if r["pic_max_mo"] is None else round(r["pic_max_mo"], 1)
+                    ),
+                    "gc_ms": round(r["gc_ms"], 1),
+                    "derniere": time.strftime(
+                        "%H:%M:%S", time.localtime(r["derniere"])
+                    ),
+                }
+                for session_id, r in lignes
+            ],
+            hide_index=True,
+        )
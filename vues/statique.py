@@ -0,0 +1,349 @@
+"""Export statique du dashboard : pages HTML et figures JSON, sans Python à la consultation.
+
+Construit une fois, avec la logique des pages (`charts` et `selector_states`,
+voir `vues.prechauffage`), toutes les figures des pages qui en déclarent, puis
+écrit dans --out :
+
+- `figures/<empreinte>.json` : le JSON Plotly allégé de chaque figure
+  (`ina.figure_payload`), nommé d'après son contenu (cacheable indéfiniment par
+  un CDN) ; son modèle (`layout.template`), commun à la plupart des figures,
+  est écrit une seule fois dans `modeles/` et intégré aux pages ;
+- `<page>.html` : une page autonome par page du dashboard, avec ses figures par
+  défaut intégrées ; chaque sélecteur (année, thème, événement, média...)
+  charge la variante précalculée correspondante depuis `figures/` ;
+- `index.json` : pages, graphiques, sélecteurs et fichier de chaque variante ;
+- `index.html` : la liste des pages, et `plotly.min.js`, servi localement.
+
+Les sélecteurs sont ceux des paramètres qui varient entre les états d'un
+graphique ; un paramètre qui prend les mêmes valeurs pour plusieurs graphiques
+de la page (l'événement de l'Analyse Médias) n'a qu'un sélecteur, en tête de
+page. Les états non précalculés (fenêtres d'un événement, combinaisons de la
+Comparaison Thèmes) restent ceux par défaut.
+
+Avec `INA_FIGURE_DIR`, les figures déjà préchauffées sont relues du disque.
+Tout serveur de fichiers statiques convient ; seul `index.html` et les pages
+changent d'une exportation à l'autre.
+
+Usage : python -m vues.statique --out DOSSIER [--clean]
+"""
+
+import argparse
+import glob
+import hashlib
+import html
+import importlib
+import json
+import os
+import time
+import unicodedata
+from string import Template
+
+import vues
+from ina import load_dataset
+from ina.figure_payload import slim, split_template
+from vues.commun import figure
+from vues.prechauffage import page_states
+
+# Libellés des sélecteurs, d'après le nom du paramètre des builders
+PARAMETRES = {
+    "selected_year": "📅 Année",
+    "theme": "🎯 Thème",
+    "granularite": "🔎 Granularité",
+    "event": "🗓️ Événement",
+    "media": "📺 Média",
+}
+
+PAGE_HTML = Template("""<!DOCTYPE html>
+<html lang="fr">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>$titre</title>
+<style>
+body { font-family: sans-serif; margin: 0 auto; max-width: 1400px; padding: 1rem 2rem; }
+nav a { margin-right: 1rem; }
+.grille { display: grid; gap: 1rem; grid-template-columns: repeat(auto-fit, minmax(480px, 1fr)); }
+.graphique { min-height: 450px; }
+label { display: inline-block; margin: 0.5rem 1rem 0.5rem 0; }
+.vide { color: #888; padding: 2rem; }
+</style>
+<script src="plotly.min.js"></script>
+</head>
+<body>
+<nav>$navigation</nav>
+<h1>$titre</h1>
+<div id="selecteurs"></div>
+<div class="grille" id="graphiques"></div>
+<p><small>Données version $version, exportées le $date.</small></p>
+<script id="manifeste" type="application/json">$manifeste</script>
+<script>
+const page = JSON.parse(document.getElementById("manifeste").textContent);
+const valeurs = {};
+
+function selecteur(control, parent) {
+  const label = document.createElement("label");
+  label.textContent = control.label + " ";
+  const select = document.createElement("select");
+  for (const option of control.options) {
+    select.add(new Option(option, option, false, option === control.default));
+  }
+  valeurs[control.id] = control.default;
+  select.onchange = () => {
+    valeurs[control.id] = select.value;
+    page.charts.forEach((chart, i) => {
+      if (chart.controls.includes(control.id)) afficher(chart, i);
+    });
+  };
+  label.appendChild(select);
+  parent.appendChild(label);
+}
+
+async function afficher(chart, i) {
+  const cle = chart.controls.map((id) => valeurs[id]).join("\\u001f");
+  const div = document.getElementById("graphique-" + i);
+  let fig = page.figures[cle + "\\u001e" + i];
+  if (fig === undefined) {
+    const fichier = chart.variants[cle];
+    fig = fichier ? await (await fetch(fichier)).json() : null;
+  }
+  if (fig === null) {
+    Plotly.purge(div);
+    div.innerHTML = '<p class="vide">Aucune donnée pour cette sélection.</p>';
+    return;
+  }
+  div.innerHTML = "";
+  const layout = Object.assign({}, fig.layout, { template: page.modeles[fig.modele] });
+  Plotly.react(div, fig.data, layout, { responsive: true });
+}
+
+const partages = new Set(page.shared);
+for (const control of page.controls) {
+  if (partages.has(control.id)) selecteur(control, document.getElementById("selecteurs"));
+}
+page.charts.forEach((chart, i) => {
+  const carte = document.createElement("div");
+  const div = document.createElement("div");
+  div.id = "graphique-" + i;
+  div.className = "graphique";
+  carte.appendChild(div);
+  for (const id of chart.controls) {
+    if (!partages.has(id)) selecteur(page.controls.find((c) => c.id === id), carte);
+  }
+  document.getElementById("graphiques").appendChild(carte);
+  afficher(chart, i);
+});
+</script>
+</body>
+</html>
+""")
+
+INDEX_HTML = Template("""<!DOCTYPE html>
+<html lang="fr">
+<head>
+<meta charset="utf-8">
+<title>Baromètre JT de l'INA</title>
+<style>body { font-family: sans-serif; margin: 2rem; }</style>
+</head>
+<body>
+<h1>📺 Baromètre des JT de l'INA</h1>
+<ul>$liens</ul>
+<p><small>Données version $version, exportées le $date.</small></p>
+</body>
+</html>
+""")
+
+
+def slug(label):
+    """Nom de fichier ASCII d'une page : « Économie » -> economie."""
+    ascii_label = unicodedata.normalize("NFKD", label).encode("ascii", "ignore")
+    return "-".join(ascii_label.decode().lower().split())
+
+
+def _write(out, folder, text):
+    """Écrit `text` dans `folder` sous son empreinte ; renvoie le chemin relatif."""
+    relative = f"{folder}/{hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]}.json"
+    path = os.path.join(out, relative)
+    if not os.path.exists(path):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+    return relative
+
+
+def write_figure(out, fig):
+    """Écrit le JSON allégé de `fig`, son modèle à part ; renvoie (chemin, figure).
+
+    Le modèle (`layout.template`), commun à la plupart des figures, est écrit une
+    fois dans `modeles/` ; la figure n'en garde que le chemin (`modele`).
+    """
+    if fig is None:
+        return _write(out, "figures", "null"), None
+    text, template = split_template(slim(fig).to_json())
+    spec = json.loads(text)
+    if template is not None:
+        spec["modele"] = _write(out, "modeles", template)
+        text = json.dumps(spec, separators=(",", ":"))
+    return _write(out, "figures", text), spec
+
+
+def page_manifest(module, data, out):
+    """Graphiques, sélecteurs et variantes d'une page, et JSON de ses figures par défaut."""
+    states = page_states(module, data)
+    # Valeurs par défaut des widgets : le premier état de chaque graphique dans `charts`
+    defaults = {}
+    for chart_id, _, _, params in module.charts(data):
+        defaults.setdefault(chart_id, params)
+
+    # Options des sélecteurs dans l'ordre de `selector_states` (années croissantes...)
+    ordered = list(getattr(module, "selector_states", lambda _: [])(data))
+    ordered += module.charts(data)
+    rank = {}
+    for position, (chart_id, _, _, params) in enumerate(ordered):
+        rank.setdefault((chart_id, repr(sorted(params.items()))), position)
+
+    charts = {}
+    for chart_id, build, years, params in states:
+        fig = figure(module.PAGE, chart_id, build, years=years, **params)
+        charts.setdefault(chart_id, []).append((params, fig))
+    for chart_id, variants in charts.items():
+        variants.sort(key=lambda v: rank[(chart_id, repr(sorted(v[0].items())))])
+
+    controls, manifest_charts, embedded, templates = {}, [], {}, {}
+    for i, (chart_id, variants) in enumerate(charts.items()):
+        # Paramètres qui varient entre les états du graphique : un sélecteur chacun
+        names = [
+            name
+            for name in variants[0][0]
+            if len({str(params.get(name)) for params, _ in variants}) > 1
+        ]
+        ids = []
+        for name in names:
+            options = list(dict.fromkeys(str(params[name]) for params, _ in variants))
+            # Un sélecteur par paramètre et par liste de valeurs
+            control_id = (
+                f"{name}:{hashlib.sha1(repr(options).encode()).hexdigest()[:8]}"
+            )
+            controls.setdefault(
+                control_id,
+                {
+                    "id": control_id,
+                    "label": PARAMETRES.get(name, name),
+                    "options": options,
+                    "default": str(defaults.get(chart_id, variants[0][0])[name]),
+                    "charts": 0,
+                },
+            )
+            controls[control_id]["charts"] += 1
+            ids.append(control_id)
+
+        files = {}
+        default_key = "\x1f".join(
+            str(defaults.get(chart_id, variants[0][0])[name]) for name in names
+        )
+        for params, fig in variants:
+            key = "\x1f".join(str(params[name]) for name in names)
+            files[key], spec = write_figure(out, fig)
+            modele = spec and spec.get("modele")
+            if modele and modele not in templates:
+                with open(os.path.join(out, modele), encoding="utf-8") as f:
+                    templates[modele] = json.load(f)
+            if key == default_key:
+                embedded[f"{key}\x1e{i}"] = spec
+        manifest_charts.append({"id": chart_id, "controls": ids, "variants": files})
+
+    return {
+        "controls": [
+            {k: v for k, v in c.items() if k != "charts"} for c in controls.values()
+        ],
+        "shared": [c["id"] for c in controls.values() if c["charts"] > 1],
+        "charts": manifest_charts,
+        "figures": embedded,
+        "modeles": templates,
+    }
+
+
+def export(out, clean=False):
+    """Exporte toutes les pages à graphiques dans `out` ; renvoie l'index écrit."""
+    import plotly.offline
+
+    data = load_dataset()
+    for folder in ("figures", "modeles"):
+        os.makedirs(os.path.join(out, folder), exist_ok=True)
+        if clean:
+            for path in glob.glob(os.path.join(out, folder, "*.json")):
+                os.remove(path)
+    with open(os.path.join(out, "plotly.min.js"), "w", encoding="utf-8") as f:
+        f.write(plotly.offline.get_plotlyjs())
+
+    pages = {}
+    for label, module_name in vues.PAGES.items():
+        module = importlib.import_module(module_name)
+        if hasattr(module, "charts"):
+            start = time.perf_counter()
+            pages[label] = page_manifest(module, data, out)
+            print(
+                f"{label:<25} {sum(len(c['variants']) for c in pages[label]['charts']):>4}"
+                f" figure(s) {time.perf_counter() - start:>8.2f} s"
+            )
+
+    date = time.strftime("%d/%m/%Y %H:%M")
+    navigation = " ".join(
+        f'<a href="{slug(label)}.html">{html.escape(label)}</a>' for label in pages
+    )
+    for label, manifest in pages.items():
+        # « </ » fermerait la balise <script> qui contient le manifeste
+        text = json.dumps(manifest, ensure_ascii=False).replace("</", "<\\/")
+        with open(os.path.join(out, f"{slug(label)}.html"), "w", encoding="utf-8") as f:
+            f.write(
+                PAGE_HTML.substitute(
+                    titre=html.escape(label),
+                    navigation=navigation,
+                    version=data.version,
+                    date=date,
+                    manifeste=text,
+                )
+            )
+    with open(os.path.join(out, "index.html"), "w", encoding="utf-8") as f:
+        f.write(
+            INDEX_HTML.substitute(
+                liens="".join(
+                    f'<li><a href="{slug(label)}.html">{html.escape(label)}</a></li>'
+                    for label in pages
+                ),
+                version=data.version,
+                date=date,
+            )
+        )
+
+    index = {
+        "version": data.version,
+        "pages": {
+            label: {
+                "fichier": f"{slug(label)}.html",
+                "controls": manifest["controls"],
+                "charts": manifest["charts"],
+            }
+            for label, manifest in pages.items()
+        },
+    }
+    with open(os.path.join(out, "index.json"), "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, indent=1)
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", required=True)
+    parser.add_argument(
+        "--clean",
+        action="store_true",
+        help="supprimer les figures d'un export précédent",
+    )
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    export(args.out, clean=args.clean)
+    print(f"Export écrit dans {args.out} en {time.perf_counter() - start:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Page « TF1 » : focus sur la chaîne TF1."""
+
+import streamlit as st
+import plotly.express as px
+
+from ina import queries
+from vues.commun import Graphiques, donnees
+
+PAGE = "TF1"
+
+
+def fig_tf1_themes(data):
+    df_tf1_duree_theme = queries.par_theme(data, chaine="TF1")
+    df_tf1_duree_theme = df_tf1_duree_theme.sort_values(
+        by="duree_heures", ascending=False
+    )
+
+    # Création du barplot avec Plotly Express
+    fig = px.bar(
+        df_tf1_duree_theme,
+        x="theme",
+        y="duree_heures",
+        title="Temps total d'apparition des thèmes sur TF1",
+        labels={"Durée (en heures)": "Durée totale (en heures)"},
+        color_discrete_sequence=["#1f77b4"],
+        text_auto=True,  # Afficher les valeurs sur les barres
+    )
+
+    # Personnalisation du layout
+    fig.update_layout(
+        xaxis_title="Thème",
+        yaxis_title="Durée totale (en heures)",
+        xaxis=dict(tickangle=45),  # Rotation des labels pour lisibilité
+        template="plotly_white",
+    )
+    return fig
+
+
+def fig_tf1_duree_moyenne(data):
+    df_tf1_duree_moy = queries.par_annee(data, chaine="TF1").rename(
+        columns={"duree": "duree_totale", "duree_moyenne": "duree"}
+    )
+
+    # Création du graphique
+    fig = px.line(
+        df_tf1_duree_moy,
+        x="Année",
+        y="duree",
+        markers=True,
+        title="Evolution du temps d'exposition moyen d'un sujet sur TF1",
+        line_shape="linear",
+    )
+
+    # Mise en forme
+    fig.update_traces(line=dict(color="red"), marker=dict(size=6))
+    fig.update_layout(
+        xaxis_title="Année",
+        yaxis_title="Durée moyenne des reportages (en secondes)",
+        template="plotly_white",
+        xaxis=dict(tickmode="linear", dtick=2),  # Un tick tous les 2 ans
+    )
+    return fig
+
+
+def fig_tf1_reportages(data):
+    df_tf1_count = queries.par_annee(data, chaine="TF1").rename(
+        columns={"nb_lignes": "Nombre de reportages"}
+    )
+
+    # Créer le graphique avec Plotly
+    fig = px.bar(
+        df_tf1_count,
+        x="Année",
+        y="Nombre de reportages",
+        text_auto=True,  # Afficher les valeurs sur les barres
+        title="Évolution du nombre de sujets abordés sur TF1",
+        color_discrete_sequence=["#1f77b4"],  # Bleu TF1
+    )
+
+    # Mise en forme
+    fig.update_layout(
+        xaxis_title="Année",
+        yaxis_title="Nombre de reportages",
+        template="plotly_white",
+        xaxis=dict(tickangle=45),  # Incliner les labels si nécessaire
+    )
+    return fig
+
+
+def fig_tf1_evolution_themes(data):
+    df_tf1_theme = queries.par_annee_et_theme(data, chaine="TF1")
+
+    fig = px.line(
+        df_tf1_theme,
+        x="Année",
+        y="duree_heures",
+        color="theme",
+        title="Évolution du temps d'antenne des thèmes sur TF1",
+        markers=True,
+    )
+
+    fig.update_layout(
+        xaxis_title="Année",
+        yaxis_title="Durée totale (en heures)",
+        template="plotly_white",
+    )
+    return fig
+
+
+def charts(data):
+    """Graphiques de la page aux valeurs par défaut des widgets : (id, builder, années, paramètres)."""
+    return [
+        ("themes", fig_tf1_themes, None, {}),
+        ("duree_moyenne", fig_tf1_duree_moyenne, None, {}),
+        ("reportages", fig_tf1_reportages, None, {}),
+        ("evolution_themes", fig_tf1_evolution_themes, None, {}),
+    ]
+
+
+def render():
+    st.title("Dashboard : Analyse de l'évolution de la chaîne de télévision TF1")
+
+    # Les quatre graphiques sont construits en parallèle, puis affichés dès que prêts
+    graphiques = Graphiques(PAGE, charts(donnees()))
+
+    graphiques.emplacement("themes")
+
+    st.markdown("----")
+
+    col21, col22 = st.columns(2)
+
+    with col21:
+        graphiques.emplacement("duree_moyenne")
+
+    with col22:
+        graphiques.emplacement("reportages")
+
+    graphiques.emplacement("evolution_themes")
+
+    graphiques.afficher()
@@ -0,0 +1,275 @@
+"""Page « Analyse Thématique » : vue d'ensemble des thèmes, avec filtre sur un thème."""
+
+import streamlit as st
+import plotly.express as px
+import plotly.graph_objects as go
+
+from ina import queries
+from vues.commun import donnees, figure, plotly_chart, precalculer
+
+PAGE = "Analyse Thématique"
+
+GRANULARITES = {"Année": "annee", "Mois": "mois", "Semaine": "semaine", "Jour": "jour"}
+TOUS_LES_THEMES = "Tous les thèmes"
+# Points envoyés au navigateur par courbe, de l'ordre de la largeur du graphique en pixels
+POINTS = 600
+
+
+def fig_themes_occurrences(data):
+    df_theme = (
+        queries.par_theme(data)
+        .sort_values(by="nb_lignes", ascending=False)
+        .rename(columns={"nb_lignes": "count"})
+    )
+    return px.bar(
+        df_theme,
+        x="theme",
+        y="count",
+        labels={"count": "Nombre d'occurrences", "theme": "Thème"},
+        title="Nombre total de sujets par thème",
+    )
+
+
+def fig_themes_annee(data, selected_year):
+    df_theme_pie = queries.par_theme(data, annee=selected_year)
+    if df_theme_pie.empty:
+        return None
+
+    return px.pie(
+        df_theme_pie,
+        values="nombre_sujets",
+        names="theme",
+        title=f"Répartition des thèmes en {selected_year}",
+        hole=0.3,
+    )
+
+
+def fig_theme_par_media(data, theme):
+    df_theme_media = queries.par_chaine(data, theme=theme)
+    if df_theme_media.empty:
+        return None
+
+    fig_bar = px.bar(
+        df_theme_media,
+        x="chaine",
+        y="nombre_sujets",
+        title=f"Sujets sur '{theme}' par média (2000–2020)",
+        labels={
+            "chaine": "Chaîne",
+            "nombre_sujets": "Nombre de Sujets",
+        },
+        text="nombre_sujets",
+    )
+    fig_bar.update_traces(textposition="outside")
+    return fig_bar
+
+
+def fig_theme_evolution(data, theme, granularite="annee"):
+    theme_filtre = None if theme == TOUS_LES_THEMES else theme
+    if granularite == "annee":
+        df_theme_time = queries.par_annee(data, theme=theme_filtre)
+        df_theme_time["duree_smoothed"] = (
+            df_theme_time["duree_heures"].rolling(window=3, min_periods=1).mean()
+        )
+        x = df_theme_time["Année"]
+        mode = "lines+markers"
+    else:
+        # Séries pré-agrégées, réduites à POINTS points au plus (LTTB)
+        df_theme_time = queries.serie(
+            data, granularite, theme=theme_filtre, points=POINTS
+        )
+        x = df_theme_time["periode"]
+        mode = "lines+markers" if granularite == "mois" else "lines"
+
+    fig = go.Figure()
+
+    fig.add_trace(
+        go.Scatter(
+            x=x,
+            y=df_theme_time["duree_heures"],
+            mode=mode,
+            marker=dict(size=6, color="red"),
+            line=dict(width=3, color="#1f77b4"),
+            name="Durée totale",
+        )
+    )
+
+    fig.update_layout(
+        title=f"Évolution de la durée d'antenne pour '{theme}' (2000–2020)",
+        xaxis_title=next(k for k, v in GRANULARITES.items() if v == granularite),
+        yaxis_title="Durée totale (en heures)",
+        template="plotly_white",
+        xaxis=dict(showgrid=False),
+        yaxis=dict(showgrid=True, gridcolor="lightgrey"),
+        hovermode="x unified",
+    )
+    return fig
+
+
+def charts(data):
+    """Graphiques de la page aux valeurs par défaut des widgets : (id, builder, années, paramètres)."""
+    theme = data.values("theme")[0]
+    year = int(data.cube.values("Année")[-1])
+    return [
+        ("occurrences", fig_themes_occurrences, None, {}),
+        ("annee", fig_themes_annee, [year], {"selected_year": year}),
+        ("par_media", fig_theme_par_media, None, {"theme": theme}),
+        (
+            "evolution",
+            fig_theme_evolution,
+            None,
+            {"theme": theme, "granularite": "annee"},
+        ),
+    ]
+
+
+def selector_states(data):
+    """Tous les états des sélecteurs de la page : (id, builder, années, paramètres)."""
+    themes = data.values("theme")
+    states = [
+        ("annee", fig_themes_annee, [int(year)], {"selected_year": int(year)})
+        for year in data.cube.values("Année")
+    ]
+    for theme in themes:
+        states.append(("par_media", fig_theme_par_media, None, {"theme": theme}))
+    for theme in [TOUS_LES_THEMES] + themes:
+        for granularite in GRANULARITES.values():
+            params = {"theme": theme, "granularite": granularite}
+            states.append(("evolution", fig_theme_evolution, None, params))
+    return states
+
+
+def render():
+    st.title("Dashboard : Analyse Thématique des Sujets")
+    dataset = donnees()
+    df = dataset.frame
+    themes = dataset.values("theme")
+    years = dataset.cube.values("Année")
+    # Thèmes choisis absents des filtres globaux : retour au premier thème
+    for key in ("theme_duration_selected", "theme_selected_col3"):
+        if st.session_state.get(key) not in [TOUS_LES_THEMES, None] + themes:
+            del st.session_state[key]
+    # Initialisation du thème sélectionné dès le début
+    if "theme_duration_selected" not in st.session_state:
+        st.session_state.theme_duration_selected = themes[0]
+
+    # Première ligne : répartition globale + répartition annuelle
+    col1, col2 = st.columns(2)
+
+    with col1:
+
+        if "theme" in df.columns:
+            fig_bar = figure(PAGE, "occurrences", fig_themes_occurrences)
+            plotly_chart(fig_bar)
+        else:
+            st.error("La colonne 'theme' est manquante dans le dataset.")
+
+    with col2:
+
+        if (
+            "theme" in df.columns
+            and "nombre_sujets" in df.columns
+            and "date" in df.columns
+        ):
+            if "selected_year_state" not in st.session_state:
+                st.session_state.selected_year_state = int(years[-1])
+
+            selected_year = st.session_state.selected_year_state
+            fig_pie = figure(
+                PAGE,
+                "annee",
+                fig_themes_annee,
+                years=[selected_year],
+                selected_year=selected_year,
+            )
+
+            if fig_pie is not None:
+                plotly_chart(fig_pie)
+
+                # Slider en dessous du graphique
+                selected_year = st.slider(
+                    "📅 Choisissez une année :",
+                    min_value=int(years[0]),
+                    max_value=int(years[-1]),
+                    value=selected_year,
+                    key="slider_theme_year",
+                )
+                st.session_state.selected_year_state = selected_year
+            else:
+                st.warning("Aucune donnée disponible pour cette année.")
+        else:
+            st.error("Colonnes manquantes pour l’analyse par année.")
+
+    # Deuxième ligne : Thème par média + Évolution d’un thème
+    col3, col4 = st.columns(2)
+
+    with col3:
+
+        if (
+            "theme" in df.columns
+            and "chaine" in df.columns
+            and "nombre_sujets" in df.columns
+        ):
+            # Initialiser une valeur par défaut dans session_state si nécessaire
+            if "theme_selected_col3" not in st.session_state:
+                st.session_state.theme_selected_col3 = themes[0]
+
+            selected_theme_col3 = st.session_state.theme_selected_col3
+
+            fig_bar = figure(
+                PAGE, "par_media", fig_theme_par_media, theme=selected_theme_col3
+            )
+
+            if fig_bar is not None:
+                plotly_chart(fig_bar)
+            else:
+                st.warning("Aucune donnée disponible pour ce thème.")
+
+            # Selectbox EN BAS après le graphique
+            selected_theme_col3 = st.selectbox(
+                "🎯 Choisissez un thème à analyser :",
+                themes,
+                index=themes.index(selected_theme_col3),
+                key="theme_select_col3",
+            )
+
+            # Met à jour la sélection dans session_state
+            st.session_state.theme_selected_col3 = selected_theme_col3
+
+    with col4:
+
+        if "theme_duration_selected" not in st.session_state:
+            st.session_state.theme_duration_selected = themes[0]
+
+        selected_theme = st.session_state.theme_duration_selected
+        granularite = st.session_state.get("theme_duration_granularite", "Année")
+
+        fig = figure(
+            PAGE,
+            "evolution",
+            fig_theme_evolution,
+            theme=selected_theme,
+            granularite=GRANULARITES[granularite],
+        )
+        plotly_chart(fig)
+
+        # Sélecteurs de granularité et de thème en bas
+        st.radio(
+            "🔎 Granularité :",
+            list(GRANULARITES),
+            horizontal=True,
+            key="theme_duration_granularite",
+        )
+        options = [TOUS_LES_THEMES] + themes
+        selected_theme = st.selectbox(
+            "🎯 Choisissez un thème à analyser :",
+            options,
+            index=options.index(selected_theme),
+            key="theme_duration_bottom",
+        )
+
+        st.session_state.theme_duration_selected = selected_theme
+
+    # Après le premier affichage : les autres années et thèmes sont calculés
+    # pendant que l'utilisateur regarde la page
+    precalculer(PAGE, selector_states)